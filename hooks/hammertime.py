@@ -48,21 +48,106 @@ Pending agent awareness:
 Optional Anthropic verifier (Phase 2 Haiku):
   Used only when score is ambiguous (1..threshold-1) and ANTHROPIC_API_KEY
   is set. Debug-logged when invoked. Does NOT recursively launch an
-  advisor/model loop from inside HammerTime.
+  advisor/model loop from inside HammerTime. All ambiguous rules are
+  verified concurrently under one deadline, and verdicts are cached in
+  verdicts.json so a re-fired Stop on identical text makes no API call.
+
+Daemon mode (optional):
+  `hammertime.py --daemon` serves Stop events on daemon.sock in the
+  HammerTime home. While it is listening, the hook only forwards its input
+  and prints the daemon's verdict; otherwise it evaluates in-process.
 
 Block output format (shared Claude + Codex):
   {"decision": "block", "reason": "...", "systemMessage": "..."}
 """
 
-import json
+import marshal
 import os
-import re
-import subprocess
 import sys
+
+# --- Daemon client ---
+# When a daemon (hammertime.py --daemon, see serve_daemon) is listening, the
+# hook process only forwards its stdin, cwd and environment over a Unix
+# socket and prints the verdict. This runs before the imports below, using
+# builtin modules only, so a forwarded Stop never pays for them. If the
+# daemon is down or fails to answer, evaluation continues in-process.
+DAEMON_SOCKET_NAME = "daemon.sock"
+DAEMON_CLIENT_TIMEOUT = 30.0  # Covers the Phase 2 verifier deadline
+
+
+def daemon_socket_path():
+    """Mirror of hammertime_paths()["daemon_socket"] without importing pathlib."""
+    home = os.environ.get("BOPEN_HAMMERTIME_HOME", "").strip()
+    if home:
+        home = os.path.expanduser(home)
+    else:
+        home = os.path.expanduser("~/.claude/hammertime")
+        if not os.path.isdir(home):
+            home = os.path.expanduser("~/.core/hammertime")
+    return os.path.join(home, DAEMON_SOCKET_NAME)
+
+
+def daemon_client_enabled():
+    return os.environ.get("HAMMERTIME_DAEMON", "").lower() not in ("0", "false", "off")
+
+
+def run_via_daemon(raw, socket_path):
+    """Send one Stop event to the daemon. Returns (exit_code, stdout, stderr),
+    or None when the daemon is unreachable or its reply is unusable."""
+    import _socket
+
+    request = marshal.dumps({"stdin": raw, "cwd": os.getcwd(), "env": dict(os.environ)})
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(DAEMON_CLIENT_TIMEOUT)
+        sock.connect(socket_path)
+        sock.sendall(request)
+        sock.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        reply = marshal.loads(b"".join(chunks))
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    finally:
+        sock.close()
+    if not (isinstance(reply, tuple) and len(reply) == 3 and isinstance(reply[0], int)):
+        return None
+    return reply
+
+
+if __name__ == "__main__" and len(sys.argv) == 1 and daemon_client_enabled():
+    _socket_path = daemon_socket_path()
+    if os.path.exists(_socket_path):
+        import io
+
+        _raw_stdin = sys.stdin.read()
+        _reply = run_via_daemon(_raw_stdin, _socket_path)
+        if _reply is not None:
+            sys.stdout.write(_reply[1])
+            sys.stderr.write(_reply[2])
+            sys.exit(_reply[0])
+        sys.stdin = io.StringIO(_raw_stdin)  # Daemon down: evaluate in-process
+
+# Only what every run needs is imported here. subprocess (git checks, alert
+# sound), urllib.request (verifier), threading, datetime (timers) and the
+# native JSON decoders are imported where they are used, so the common exits
+# (disabled, no message, no rules, no match) never load them.
+# hooks/tests/test_hammertime_startup.py enforces this.
+import atexit
+import bisect
+import hashlib
+import json
+import re
 import time
-import urllib.request
-import urllib.error
-from datetime import datetime
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
 
 _SKILL_SCRIPTS = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -72,7 +157,7 @@ _SKILL_SCRIPTS = os.path.join(
 )
 if _SKILL_SCRIPTS not in sys.path:
     sys.path.insert(0, _SKILL_SCRIPTS)
-from hammertime_paths import hammertime_paths, resolve_hammertime_home
+from hammertime_paths import hammertime_paths, resolve_hammertime_home, session_state_path
 
 _start_time = time.monotonic()
 
@@ -218,24 +303,444 @@ def compile_user_rule(rule):
     return rule
 
 
+def validate_user_rule(rule):
+    """Return a serializable copy of a raw user rule with unusable parts dropped.
+
+    Keywords are lowercased; intent/dismissal/qualifier regex sources that do
+    not compile are removed (and logged) instead of crashing the hook. The
+    result still holds pattern *sources* so it can be cached and recompiled.
+    """
+    clean = dict(rule)
+    name = clean.get("name", "unknown")
+    if "keywords" in clean:
+        clean["keywords"] = [kw.lower() for kw in clean["keywords"] if isinstance(kw, str)]
+    raw = clean.get("intent_patterns")
+    if isinstance(raw, list):
+        valid = []
+        for source in raw:
+            if not isinstance(source, str):
+                continue
+            try:
+                re.compile(source, re.IGNORECASE)
+            except re.error as exc:
+                debug_log(f"RULES: rule '{name}' dropped invalid intent pattern {source!r} ({exc})")
+                continue
+            valid.append(source)
+        clean["intent_patterns"] = valid
+    for field in ("dismissal_verbs", "qualifiers"):
+        if isinstance(clean.get(field), str):
+            try:
+                re.compile(clean[field], re.IGNORECASE)
+            except re.error as exc:
+                debug_log(f"RULES: rule '{name}' dropped invalid {field} ({exc})")
+                del clean[field]
+    return clean
+
+
+def merge_rules(user_rules):
+    """Builtin rules + user rules. User rules with same name override builtin."""
+    rules = list(BUILTIN_RULES)
+    builtin_names = {r["name"] for r in rules}
+    for ur in user_rules:
+        if ur.get("name") in builtin_names:
+            rules = [r for r in rules if r["name"] != ur["name"]]
+        rules.append(ur)
+    return [r for r in rules if r.get("enabled", True)]
+
+
+# Bump when the cache layout or validation rules change.
+RULE_CACHE_VERSION = 2
+
+
+def _builtin_fingerprint():
+    """Hash of the builtin rules so a hook upgrade invalidates the rule cache."""
+    digest = hashlib.sha256()
+    for rule in BUILTIN_RULES:
+        digest.update(rule["name"].encode())
+        digest.update("\0".join(rule.get("keywords", [])).encode())
+        digest.update("\0".join(p.pattern for p in rule.get("intent_patterns", [])).encode())
+    return digest.hexdigest()
+
+
+def _read_rule_cache(cache_path, key):
+    """Return the cached compiled rule set if it was built for key, else None."""
+    try:
+        with open(cache_path, "rb") as f:
+            cache = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(cache, dict) or cache.get("key") != key:
+        return None
+    return cache
+
+
+def _write_rule_cache(cache_path, cache):
+    """Atomically write the compiled rule cache (temp file + os.rename)."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"  # Concurrent Stops never share a temp file
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            marshal.dump(cache, f)
+        os.rename(tmp_path, cache_path)
+    except (OSError, ValueError):
+        pass
+
+
+# rules.json path -> (cache key, rules, automaton). Only a long-lived daemon
+# process ever sees a second load_rule_set() call.
+_RULE_SET_MEMO = {}
+
+
+def load_rule_set():
+    """Load enabled rules plus a KeywordAutomaton covering all of their keywords.
+
+    User rules go through a compiled-rule cache next to rules.json, keyed by
+    the file's mtime and content hash (plus the builtin rules), holding the
+    validated rules (with their prefilter literals) and the serialized
+    keyword automaton. A warm run skips JSON parsing, validation, literal
+    extraction and trie construction; only the regex sources are recompiled.
+    Within one process (the daemon) the compiled rules are also kept in
+    memory under the same key. Returns (rules, automaton); automaton is None
+    when there is no rules.json and the caller should build one on demand.
+    """
+    paths = _hammertime_paths()
+    rules_path = paths["rules"]
+    try:
+        mtime_ns = os.stat(rules_path).st_mtime_ns
+        with open(rules_path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return merge_rules([]), None
+
+    started = time.monotonic()
+    key = (
+        RULE_CACHE_VERSION,
+        tuple(sys.version_info[:2]),
+        mtime_ns,
+        hashlib.sha256(raw).hexdigest(),
+        _builtin_fingerprint(),
+    )
+    memo = _RULE_SET_MEMO.get(rules_path)
+    if memo is not None and memo[0] == key:
+        debug_log(f"RULES: in-memory hit, {len(memo[1])} rules")
+        return list(memo[1]), memo[2]
+    cache = _read_rule_cache(paths["rules_cache"], key)
+    if cache is not None:
+        rules = merge_rules([compile_user_rule(r) for r in cache["rules"]])
+        automaton = KeywordAutomaton.from_state(cache["automaton"])
+        elapsed_ms = (time.monotonic() - started) * 1000
+        debug_log(
+            f"RULES: cache hit, {len(cache['rules'])} user rules in {elapsed_ms:.1f}ms "
+            f"(saved ~{max(0.0, cache['build_ms'] - elapsed_ms):.1f}ms)"
+        )
+        _RULE_SET_MEMO[rules_path] = (key, rules, automaton)
+        return list(rules), automaton
+
+    try:
+        user_rules = json.loads(raw)
+    except ValueError:
+        debug_log("RULES: rules.json is not valid JSON, using builtin rules only")
+        return merge_rules([]), None
+    if not isinstance(user_rules, list):
+        return merge_rules([]), None
+
+    validated = [validate_user_rule(ur) for ur in user_rules if isinstance(ur, dict)]
+    for ur in validated:
+        ur["_prefilter"] = rule_prefilter(ur)  # Parsed once here, reused on every hit
+    rules = merge_rules([compile_user_rule(dict(ur)) for ur in validated])
+    automaton = KeywordAutomaton(kw for rule in rules for kw in rule.get("keywords", []))
+    build_ms = (time.monotonic() - started) * 1000
+    _write_rule_cache(paths["rules_cache"], {
+        "key": key,
+        "rules": validated,
+        "automaton": automaton.to_state(),
+        "build_ms": build_ms,
+    })
+    debug_log(f"RULES: cache miss, compiled {len(validated)} user rules in {build_ms:.1f}ms")
+    _RULE_SET_MEMO[rules_path] = (key, rules, automaton)
+    return list(rules), automaton
+
+
 def load_rules():
     """Load builtin rules + user rules. User rules with same name override builtin."""
-    rules = list(BUILTIN_RULES)
-    rules_path = _hammertime_paths()["rules"]
-    if os.path.exists(rules_path):
+    return load_rule_set()[0]
+
+
+# Trie node key marking "a keyword ends here". Keys are otherwise single
+# characters, so the empty string can never collide with a real edge.
+_TRIE_END = ""
+
+
+def _trie_regex(node):
+    """Render a keyword trie as a regex that matches any keyword at a position."""
+    alts = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch != _TRIE_END]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if _TRIE_END in node:
+        return ("(?:" + body + ")" if len(alts) == 1 else body) + "?"
+    return body
+
+
+class KeywordAutomaton:
+    """Every keyword of every rule in one trie, matched in a single pass.
+
+    The pass is driven by one regex rendered from the trie, so the hot loop
+    over a multi-MB transcript runs inside the regex engine rather than a
+    per-character Python loop. Any keyword occurrence must start inside a span
+    that regex consumed, so the Python trie walk only visits those spans —
+    overlapping keywords ("pre-existing" inside "many pre-existing") are
+    still all reported.
+    """
+
+    def __init__(self, keywords):
+        self.trie = {}
+        self.match_empty = False
+        self.size = 0
+        self.max_len = 0
+        for kw in keywords:
+            if not kw:
+                self.match_empty = True
+                continue
+            node = self.trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            if _TRIE_END not in node:
+                self.size += 1
+            node[_TRIE_END] = kw
+            self.max_len = max(self.max_len, len(kw))
+        self.pattern = re.compile(_trie_regex(self.trie)) if self.trie else None
+
+    def to_state(self):
+        """Plain-data form of the automaton for the compiled-rule cache."""
+        return {
+            "trie": self.trie,
+            "match_empty": self.match_empty,
+            "size": self.size,
+            "max_len": self.max_len,
+            "pattern": self.pattern.pattern if self.pattern else None,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an automaton from to_state() output without re-rendering the trie."""
+        automaton = cls.__new__(cls)
+        automaton.trie = state["trie"]
+        automaton.match_empty = state["match_empty"]
+        automaton.size = state["size"]
+        automaton.max_len = state["max_len"]
+        automaton.pattern = re.compile(state["pattern"]) if state["pattern"] else None
+        return automaton
+
+    def find_all(self, text_lower):
+        """Return the set of keywords occurring anywhere in text_lower."""
+        found = {""} if self.match_empty else set()
+        if self.pattern is None:
+            return found
+        trie = self.trie
+        seen_windows = set()
+        for m in self.pattern.finditer(text_lower):
+            # Keywords found from a span depend only on the span plus the
+            # max_len characters after it; repeated phrases are walked once.
+            window = text_lower[m.start():m.end() + self.max_len]
+            if window in seen_windows:
+                continue
+            seen_windows.add(window)
+            for start in range(m.end() - m.start()):
+                node = trie
+                for ch in window[start:start + self.max_len]:
+                    node = node.get(ch)
+                    if node is None:
+                        break
+                    if _TRIE_END in node:
+                        found.add(node[_TRIE_END])
+            if len(found) - self.match_empty >= self.size:
+                break  # Every keyword already seen; nothing left to learn
+        return found
+
+
+# --- Required-literal prefilter ---
+# A rule can only score if one of its keywords occurs or one of its regexes
+# matches. Each regex gets an any-of set of literals, one of which every match
+# must contain, read off its parse tree. A rule none of whose keywords or
+# literals occur in the text is skipped before any of its regexes run.
+
+# Shorter required literals occur in nearly every text; not worth a check.
+PREFILTER_MIN_LITERAL = 3
+
+# Below this many characters, regexes are cheaper than deriving a prefilter;
+# only rules with a cached one (user rules) are prefiltered.
+PREFILTER_MIN_CHARS = 4096
+
+# The only characters that case-insensitive regex matching equates with an
+# ASCII letter but str.lower() does not; folded before the literal check.
+# Literals themselves are ASCII-only.
+_PREFILTER_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+_REPEATS = tuple(
+    op for op in (
+        _sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT, getattr(_sre_parse, "POSSESSIVE_REPEAT", None)
+    ) if op is not None
+)
+_PATTERN_LITERALS = {}  # (source, flags) -> frozenset of literals, or None
+
+
+def _literal_rank(literals):
+    """Prefer the set whose shortest literal is longest, then the smaller set."""
+    if literals is None:
+        return (-1, 0)
+    return (min(len(lit) for lit in literals), -len(literals))
+
+
+def _required_literals(items):
+    """Any-of literal set for a parsed regex sequence, or None if none is usable."""
+    best = None
+    run = []
+
+    def consider(candidate):
+        nonlocal best
+        if candidate and min(len(lit) for lit in candidate) >= PREFILTER_MIN_LITERAL:
+            if _literal_rank(candidate) > _literal_rank(best):
+                best = candidate
+
+    for op, av in items:
+        if op is _sre_parse.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        if run:
+            consider(frozenset(["".join(run)]))
+            run = []
+        if op is _sre_parse.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op is getattr(_sre_parse, "ATOMIC_GROUP", None):
+            consider(_required_literals(av))
+        elif op is _sre_parse.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                consider(frozenset().union(*branches))
+        elif op in _REPEATS and av[0] >= 1:
+            consider(_required_literals(av[2]))
+        # Anything else (classes, anchors, lookarounds, optional parts) just
+        # ends the current run; dropping a requirement is always safe.
+    if run:
+        consider(frozenset(["".join(run)]))
+    return best
+
+
+def pattern_literals(pattern, flags=re.IGNORECASE):
+    """Lowercase literals one of which every match of pattern (a source
+    string or compiled regex) contains; None when no usable set exists."""
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags
+    key = (pattern, flags)
+    if key not in _PATTERN_LITERALS:
         try:
-            with open(rules_path, "r") as f:
-                user_rules = json.load(f)
-            if isinstance(user_rules, list):
-                builtin_names = {r["name"] for r in rules}
-                for ur in user_rules:
-                    ur = compile_user_rule(ur)
-                    if ur.get("name") in builtin_names:
-                        rules = [r for r in rules if r["name"] != ur["name"]]
-                    rules.append(ur)
-        except (json.JSONDecodeError, OSError):
-            pass
-    return [r for r in rules if r.get("enabled", True)]
+            _PATTERN_LITERALS[key] = _required_literals(_sre_parse.parse(pattern, flags))
+        except (re.error, RecursionError, TypeError, ValueError):
+            _PATTERN_LITERALS[key] = None
+    return _PATTERN_LITERALS[key]
+
+
+def rule_prefilter(rule):
+    """Sorted required literals covering all of rule's regexes, or None when
+    some regex has no usable set (the rule is then always scored).
+
+    Keywords need no literals: a keyword hit already lets the rule through.
+    Layer 3 needs both regexes to match, so either one's set suffices.
+    """
+    literals = set()
+    for pat in rule.get("intent_patterns", []):
+        required = pattern_literals(pat)
+        if required is None:
+            return None
+        literals |= required
+    dismissal_re = rule.get("dismissal_verbs")
+    qualifier_re = rule.get("qualifiers")
+    if dismissal_re and qualifier_re:
+        options = [pattern_literals(dismissal_re), pattern_literals(qualifier_re)]
+        required = max(options, key=_literal_rank)
+        if required is None:
+            return None
+        literals |= required
+    return sorted(literals)
+
+
+def prefilter_text(scored_text, text_lower):
+    """Lowercased text for the literal check (see _PREFILTER_FOLD)."""
+    if "\u0130" in scored_text or "\u0131" in scored_text or "\u017f" in scored_text:
+        return scored_text.translate(_PREFILTER_FOLD).lower()
+    return text_lower
+
+
+class RuleMatcher:
+    """Layer 1 + Layer 2 matcher compiled once for a set of content rules.
+
+    Keywords from all rules share one KeywordAutomaton. Intent patterns are
+    deduplicated by (source, flags) so a pattern shared by several rules is
+    searched at most once per text, and only when a rule using it is scored.
+    keywords may be a prebuilt automaton covering (at least) every rule's
+    keywords, e.g. the one restored from the compiled-rule cache.
+
+    prefilter=False turns the required-literal prefilter off (see prefilter).
+    """
+
+    def __init__(self, rules, keywords=None, prefilter=True):
+        self.rules = tuple(rules)
+        all_keywords = []
+        self.patterns = []
+        self.rule_patterns = {}
+        self.use_prefilter = prefilter
+        self.prefilters = {}  # id(rule) -> required literals or None
+        pattern_index = {}
+        for rule in self.rules:
+            all_keywords.extend(rule.get("keywords", []))
+            indices = []
+            for pat in rule.get("intent_patterns", []):
+                key = (pat.pattern, pat.flags)
+                if key not in pattern_index:
+                    pattern_index[key] = len(self.patterns)
+                    self.patterns.append(pat)
+                indices.append(pattern_index[key])
+            self.rule_patterns[id(rule)] = indices
+        self.keywords = keywords if keywords is not None else KeywordAutomaton(all_keywords)
+
+    def covers(self, rules):
+        return all(id(rule) in self.rule_patterns for rule in rules)
+
+    def prefilter(self, rule, compute=True):
+        """Required literals for rule, or None when it must always be scored.
+
+        User rules carry a "_prefilter" entry from the compiled-rule cache.
+        Otherwise rule_prefilter() runs, once per rule, unless compute is
+        False (parsing costs more than scoring a short text outright).
+        """
+        key = id(rule)
+        if key not in self.prefilters:
+            if not self.use_prefilter:
+                return None
+            if "_prefilter" in rule:
+                self.prefilters[key] = rule["_prefilter"]
+            elif compute:
+                self.prefilters[key] = rule_prefilter(rule)
+            else:
+                return None
+        return self.prefilters[key]
+
+
+_MATCHER_CACHE = {}
+
+
+def rule_matcher(rules):
+    """Return a RuleMatcher for rules, reusing one built for the same rule objects."""
+    key = tuple(id(rule) for rule in rules)
+    cached = _MATCHER_CACHE.get(key)
+    if cached is not None and all(a is b for a, b in zip(cached.rules, rules)):
+        return cached
+    if len(_MATCHER_CACHE) >= 32:
+        _MATCHER_CACHE.clear()
+    matcher = RuleMatcher(rules)
+    _MATCHER_CACHE[key] = matcher
+    return matcher
 
 
 def session_project_dir():
@@ -288,43 +793,204 @@ def scope_rules_to_project(rules, project_dir):
     return scoped_rules
 
 
-def load_state():
-    """Load iteration tracking state. Returns empty dict if missing or corrupt."""
-    state_path = _hammertime_paths()["state"]
-    if not os.path.exists(state_path):
-        return {}
+_state_written = None  # Compact JSON of the state as last loaded or saved
+
+# Session shards untouched for this long are deleted when a new session
+# writes its first state.
+SESSION_STATE_MAX_AGE = 7 * 24 * 3600
+
+
+def _encode_state(state):
+    return json.dumps(state, separators=(",", ":"))
+
+
+def _read_state_file(path):
     try:
-        with open(state_path, "r") as f:
-            return json.load(f)
+        with open(path, "r") as f:
+            state = json.load(f)
     except (json.JSONDecodeError, OSError):
-        return {}
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def load_state(session_id):
+    """Load this session's iteration state. Returns empty dict if missing or corrupt.
+
+    Each session has its own shard under sessions/ (see session_state_path),
+    so concurrent sessions never reset or overwrite each other's counters.
+    A session still recorded in the pre-sharding state.json is picked up
+    from there once.
+    """
+    global _state_written
+    state = _read_state_file(os.fspath(session_state_path(session_id)))
+    if state is not None:
+        _state_written = _encode_state(state)
+        return state
+    _state_written = None  # Nothing in the shard yet
+    legacy = _read_state_file(_hammertime_paths()["state"])
+    if legacy is not None and legacy.get("session_id") == session_id:
+        return legacy
+    return {}
+
+
+def prune_session_states(max_age=SESSION_STATE_MAX_AGE):
+    """Delete session shards not written for max_age seconds. Returns count."""
+    sessions_dir = _hammertime_paths()["sessions"]
+    cutoff = time.time() - max_age
+    pruned = 0
+    try:
+        entries = list(os.scandir(sessions_dir))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                pruned += 1
+        except OSError:
+            continue  # Raced with another session's prune; fine
+    if pruned:
+        debug_log(f"STATE: pruned {pruned} session shard(s) older than {max_age // 86400}d")
+    return pruned
 
 
 def save_state(state):
-    """Atomically write iteration state (temp file + os.rename)."""
-    state_path = _hammertime_paths()["state"]
+    """Atomically write this session's state shard (temp file + os.rename).
+
+    Only the shard named by state["session_id"] is touched, through a
+    per-process temp file, so no stop waits on or clobbers another
+    session's write. Written compactly, and skipped entirely when the state
+    is unchanged since it was loaded or last saved.
+    """
+    global _state_written
+    started = time.monotonic()
+    encoded = _encode_state(state)
+    if encoded == _state_written:
+        debug_log("STATE: unchanged, write skipped")
+        return
+    state_path = os.fspath(session_state_path(state.get("session_id", "unknown")))
+    new_shard = not os.path.exists(state_path)
     os.makedirs(os.path.dirname(state_path), exist_ok=True)
-    tmp_path = state_path + ".tmp"
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
     try:
         with open(tmp_path, "w") as f:
-            json.dump(state, f, indent=2)
+            f.write(encoded)
         os.rename(tmp_path, state_path)
+        _state_written = encoded
     except OSError:
         pass
+    if new_shard:
+        prune_session_states()
+    TRACE.add("state_save", started)
+
+
+# Anchors and lookarounds can see past a sentence's edges, so a whole-text
+# match does not imply a per-sentence one (or vice versa). Patterns using
+# them (conservatively: any ^ outside "[^", $, \A, \Z, or (?= (?! (?<= (?<!)
+# take SentenceIndex's per-sentence path. \b is safe: every sentence edge
+# is a string edge or a [.!?\n] delimiter, both non-word.
+_CONTEXT_SENSITIVE = re.compile(r"(?<!\[)\^|\$|\\[AZ]|\(\?<?[=!]")
+
+
+class SentenceIndex:
+    r"""Which SENT_SPLIT sentences of a text each Layer 3 pattern matches.
+
+    Answers the same question as running pattern.search() on every sentence,
+    but with one finditer() over the whole text per pattern: each match is
+    mapped to a sentence id by bisecting the sorted delimiter-run offsets.
+    A match that crosses a delimiter (e.g. \s+ spanning a newline) could
+    hide an in-sentence match, so only the sentences it overlaps are
+    re-searched individually. Results are memoized per pattern, so rules
+    sharing a dismissal or qualifier regex share the pass.
+
+    co_occur() is Layer 3's test: the dismissal pattern's sentence set,
+    intersected with the qualifier's. The qualifier is only searched inside
+    the dismissal sentences unless its full set is already known.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.run_starts = []
+        self.run_ends = []
+        for run in SENT_SPLIT.finditer(text):
+            self.run_starts.append(run.start())
+            self.run_ends.append(run.end())
+        self._ids = {}
+
+    def sentence(self, sid):
+        start = self.run_ends[sid - 1] if sid > 0 else 0
+        end = self.run_starts[sid] if sid < len(self.run_starts) else len(self.text)
+        return self.text[start:end]
+
+    def ids(self, pattern):
+        """Set of sentence ids in which pattern.search() would succeed."""
+        key = id(pattern)
+        if key in self._ids:
+            return self._ids[key][1]
+        if _CONTEXT_SENSITIVE.search(pattern.pattern) or pattern.search("") is not None:
+            found = self._search_each(pattern, range(len(self.run_starts) + 1))
+        else:
+            found = set()
+            recheck = set()
+            for m in pattern.finditer(self.text):
+                start, end = m.span()
+                sid = bisect.bisect_right(self.run_ends, start)
+                if sid == len(self.run_starts) or self.run_starts[sid] >= end > start:
+                    found.add(sid)
+                else:
+                    last = bisect.bisect_right(self.run_ends, max(start, end - 1))
+                    recheck.update(range(sid, last + 1))
+            found |= self._search_each(pattern, recheck - found)
+        self._ids[key] = (pattern, found)  # Keep pattern alive so id() stays unique
+        return found
+
+    def _search_each(self, pattern, sids):
+        return {sid for sid in sids if pattern.search(self.sentence(sid))}
+
+    def co_occur(self, dismissal_re, qualifier_re):
+        """True if some sentence matches both patterns."""
+        candidates = self.ids(dismissal_re)
+        if not candidates:
+            return False
+        if id(qualifier_re) in self._ids:
+            return not candidates.isdisjoint(self._ids[id(qualifier_re)][1])
+        return any(qualifier_re.search(self.sentence(sid)) for sid in sorted(candidates))
 
 
-def score_message(text, rules):
+def score_message(text, rules, matcher=None):
     """Score message against all rules using three-layer detection.
 
     Returns list of (rule, score, breakdown) tuples where score > 0.
     breakdown is a dict with kw, intent, cluster counts and matched_keywords list.
+    matcher is a RuleMatcher covering rules; one is built (and cached) if omitted.
     """
+    if matcher is None or not matcher.covers(rules):
+        matcher = rule_matcher(rules)
     scored_text = QUOTED_SPAN.sub("", text)
     text_lower = scored_text.lower()
-    sentences = None  # Lazy-split for Layer 3, cached across rules
+    found_keywords = matcher.keywords.find_all(text_lower)  # One pass for every rule
+    literal_hits = {}  # Prefilter literal -> occurs in the text, shared across rules
+    fold_text = None  # Built lazily for the prefilter
+    compute_prefilters = len(scored_text) >= PREFILTER_MIN_CHARS
+    intent_hits = {}  # pattern index -> first match text or None, shared across rules
+    sentence_index = None  # Built lazily for Layer 3, shared across rules
     results = []
+    skipped = 0
 
     for rule in rules:
+        literals = matcher.prefilter(rule, compute_prefilters)
+        if literals is not None and not any(kw in found_keywords for kw in rule.get("keywords", [])):
+            if fold_text is None:
+                fold_text = prefilter_text(scored_text, text_lower)
+            for lit in literals:
+                if lit not in literal_hits:
+                    literal_hits[lit] = lit in fold_text
+                if literal_hits[lit]:
+                    break
+            else:
+                skipped += 1
+                continue
+
         kw_count = 0
         intent_count = 0
         cluster_count = 0
@@ -332,116 +998,64 @@ def score_message(text, rules):
 
         # Layer 1: Keyword hits (+1 each, keywords pre-lowercased at load time)
         for kw in rule.get("keywords", []):
-            if kw in text_lower:
+            if kw in found_keywords:
                 kw_count += 1
                 matched_keywords.append(kw)
 
         # Layer 2: Intent pattern hits (+2 each)
         matched_intents = []
-        intent_patterns = rule.get("intent_patterns", [])
-        for pat in intent_patterns:
-            m = pat.search(scored_text)
-            if m:
+        for idx in matcher.rule_patterns[id(rule)]:
+            if idx not in intent_hits:
+                m = matcher.patterns[idx].search(scored_text)
+                intent_hits[idx] = m.group(0) if m else None
+            if intent_hits[idx] is not None:
                 intent_count += 1
-                matched_intents.append(m.group(0))
+                matched_intents.append(intent_hits[idx])
 
         # Layer 3: Sentence co-occurrence (+3)
         dismissal_re = rule.get("dismissal_verbs")
         qualifier_re = rule.get("qualifiers")
         if dismissal_re and qualifier_re:
-            if sentences is None:
-                sentences = SENT_SPLIT.split(scored_text)
-            for sent in sentences:
-                if dismissal_re.search(sent) and qualifier_re.search(sent):
-                    cluster_count = 1
-                    break
+            if sentence_index is None:
+                sentence_index = SentenceIndex(scored_text)
+            if sentence_index.co_occur(dismissal_re, qualifier_re):
+                cluster_count = 1
 
         score = kw_count + (intent_count * 2) + (cluster_count * 3)
         if score > 0:
             results.append((rule, score, {"kw": kw_count, "intent": intent_count, "cluster": cluster_count, "matched_keywords": matched_keywords, "matched_intents": matched_intents}))
 
+    debug_log(f"PREFILTER: skipped {skipped}/{len(rules)} rules with no required literal in {len(text)} chars")
     return results
 
 
-def count_pending_agents(transcript_path):
+def count_pending_agents(transcript_path, scan=None):
     """Count background agents dispatched but not yet completed in this turn.
 
     Scans the transcript for Agent tool_use with run_in_background=true,
     then checks for matching task-notification completions by tool_use_id.
-    Returns the count of agents still pending.
+    Returns the count of agents still pending. Pass the run's TranscriptScan
+    to reuse its parse instead of reading the transcript again.
     """
     if not transcript_path:
         return 0
+    if scan is None:
+        scan = TranscriptScan(transcript_path)
+    if scan.pending_agents:
+        debug_log(f"PENDING_AGENTS: {scan.pending_agents} still running")
+    return scan.pending_agents
 
-    try:
-        file_size = os.path.getsize(transcript_path)
-    except OSError:
-        return 0
-
-    MAX_READ = 2 * 1024 * 1024
-    try:
-        with open(transcript_path, "rb") as f:
-            start_pos = max(0, file_size - MAX_READ)
-            f.seek(start_pos)
-            tail = f.read().decode("utf-8", errors="replace")
-    except (OSError, UnicodeDecodeError):
-        return 0
-
-    dispatched = set()
-    completed = set()
 
-    for line in tail.strip().split("\n"):
-        if not line.strip():
-            continue
-        try:
-            obj = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-
-        msg = obj.get("message", {})
-        content = msg.get("content", "")
-
-        # Detect background Agent dispatches
-        if isinstance(content, list):
-            for block in content:
-                if (isinstance(block, dict)
-                        and block.get("type") == "tool_use"
-                        and block.get("name") == "Agent"
-                        and block.get("input", {}).get("run_in_background")):
-                    dispatched.add(block.get("id", ""))
+VERIFIER_URL = "https://api.anthropic.com/v1/messages"
+# Overall wall-clock budget for one Stop run's verifier calls, in seconds.
+VERIFIER_DEADLINE = 10.0
+# Each call's socket timeout sits this far past the deadline, so the join
+# (not the socket) is what abandons a slow call.
+VERIFIER_TIMEOUT_MARGIN = 1.0
+VERDICT_CACHE_MAX = 256
 
-        # Detect task-notification completions
-        if isinstance(content, str) and "<task-notification>" in content:
-            match = re.search(r"<tool-use-id>(.*?)</tool-use-id>", content)
-            if match:
-                completed.add(match.group(1))
-
-    pending = dispatched - completed
-    if pending:
-        debug_log(f"PENDING_AGENTS: {len(pending)} still running")
-    return len(pending)
-
-
-def phase2_haiku_evaluate(text, rule, pending_agents=0):
-    """Optional Anthropic Haiku verifier for ambiguous scores.
-
-    Privacy/safety notes:
-      - Only runs when ANTHROPIC_API_KEY is set and score is below the hard threshold.
-      - Sends a truncated slice of the assistant response (last 4000 chars) + rule text.
-      - Does NOT recursively launch an advisor, subagent, or model loop.
-      - Debug-logs when used so operators can audit verifier traffic.
-    Returns True if violated. Missing API key fails closed (treat as violated).
-    """
-    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-    if not api_key:
-        debug_log("PHASE2: ANTHROPIC_API_KEY unset — failing closed (violated=True)")
-        return True
-
-    debug_log(
-        f"PHASE2: invoking Anthropic Haiku verifier for rule '{rule.get('name', '?')}' "
-        f"(pending_agents={pending_agents}, text_len={len(text or '')})"
-    )
 
+def _verifier_prompt(text, rule, pending_agents):
     context_note = ""
     if pending_agents > 0:
         context_note = (
@@ -451,7 +1065,7 @@ def phase2_haiku_evaluate(text, rule, pending_agents=0):
             "whether the work is still in progress.\n"
         )
 
-    prompt = (
+    return (
         "You are a compliance checker for an AI coding assistant.\n\n"
         f"RULE: {rule['rule']}\n\n"
         f"{context_note}"
@@ -464,6 +1078,13 @@ def phase2_haiku_evaluate(text, rule, pending_agents=0):
         "Answer ONLY 'yes' or 'no'."
     )
 
+
+def _haiku_answer(prompt, api_key, timeout):
+    """POST one verifier prompt; returns the lowercased answer text.
+
+    The endpoint is HAMMERTIME_VERIFIER_URL when set (e.g. a local stand-in
+    server for tests), else the Anthropic Messages API.
+    """
     body = json.dumps({
         "model": os.environ.get(
             "HAMMERTIME_VERIFIER_MODEL", "claude-haiku-4-5-20251001"
@@ -472,8 +1093,10 @@ def phase2_haiku_evaluate(text, rule, pending_agents=0):
         "messages": [{"role": "user", "content": prompt}],
     }).encode()
 
+    import urllib.request
+
     req = urllib.request.Request(
-        "https://api.anthropic.com/v1/messages",
+        os.environ.get("HAMMERTIME_VERIFIER_URL") or VERIFIER_URL,
         data=body,
         headers={
             "Content-Type": "application/json",
@@ -482,17 +1105,147 @@ def phase2_haiku_evaluate(text, rule, pending_agents=0):
         },
         method="POST",
     )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        result = json.loads(resp.read())
+    return result.get("content", [{}])[0].get("text", "").strip().lower()
+
+
+def verdict_cache_key(text, rule, pending_agents=0):
+    """Cache key: rule name, rule-text hash, and hash of the text actually sent."""
+    rule_hash = hashlib.sha256(rule.get("rule", "").encode()).hexdigest()[:16]
+    text_hash = hashlib.sha256(f"{pending_agents}\0{text[-4000:]}".encode()).hexdigest()[:16]
+    return f"{rule.get('name', '?')}:{rule_hash}:{text_hash}"
 
+
+def load_verdict_cache():
+    """Load cached verifier verdicts ({key: [violated, epoch]}); {} if unusable."""
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            answer = result.get("content", [{}])[0].get("text", "").strip().lower()
-            violated = answer.startswith("yes")
-            debug_log(f"PHASE2: Haiku answer={answer!r} violated={violated}")
-            return violated
-    except (urllib.error.URLError, OSError, json.JSONDecodeError, KeyError, IndexError) as exc:
-        debug_log(f"PHASE2: Haiku verifier error ({type(exc).__name__}) — failing open (violated=False)")
-        return False
+        with open(_hammertime_paths()["verdicts"], "r") as f:
+            cache = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_verdict_cache(cache):
+    """Atomically write the verdict cache, keeping the newest VERDICT_CACHE_MAX."""
+    if len(cache) > VERDICT_CACHE_MAX:
+        newest = sorted(cache.items(), key=lambda item: item[1][1])[-VERDICT_CACHE_MAX:]
+        cache = dict(newest)
+    cache_path = _hammertime_paths()["verdicts"]
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.rename(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def phase2_verify_rules(candidates, pending_agents=0, deadline=None):
+    """Optional Anthropic Haiku verifier for ambiguous scores.
+
+    candidates is a list of (rule, text) pairs; returns one violated bool per
+    pair, in order.
+
+    Privacy/safety notes:
+      - Only runs when ANTHROPIC_API_KEY is set and score is below the hard threshold.
+      - Sends a truncated slice of the assistant response (last 4000 chars) + rule text.
+      - Does NOT recursively launch an advisor, subagent, or model loop.
+      - Debug-logs when used so operators can audit verifier traffic.
+
+    Verdicts already in the on-disk cache (see verdict_cache_key) are reused
+    without a request. The remaining calls run concurrently on daemon
+    threads and share one deadline (HAMMERTIME_VERIFIER_DEADLINE seconds,
+    default VERIFIER_DEADLINE), so N ambiguous rules cost one round trip
+    rather than N. Missing API key fails closed (violated=True); errors and
+    calls still running at the deadline fail open (violated=False) and are
+    not cached.
+    """
+    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
+    if not api_key:
+        debug_log("PHASE2: ANTHROPIC_API_KEY unset — failing closed (violated=True)")
+        return [True] * len(candidates)
+
+    if deadline is None:
+        try:
+            deadline = float(os.environ.get("HAMMERTIME_VERIFIER_DEADLINE", VERIFIER_DEADLINE))
+        except ValueError:
+            deadline = VERIFIER_DEADLINE
+
+    cache = load_verdict_cache()
+    verdicts = [None] * len(candidates)
+    keys = []
+    pending = []
+    for i, (rule, text) in enumerate(candidates):
+        key = verdict_cache_key(text, rule, pending_agents)
+        keys.append(key)
+        hit = cache.get(key)
+        if isinstance(hit, list) and hit and isinstance(hit[0], bool):
+            verdicts[i] = hit[0]
+            debug_log(f"PHASE2: rule '{rule.get('name', '?')}' verdict cache hit violated={hit[0]}")
+        else:
+            pending.append(i)
+    if not pending:
+        return verdicts
+
+    outcomes = {}  # index -> (answer or exception, seconds)
+
+    def call(i):
+        rule, text = candidates[i]
+        t0 = time.monotonic()
+        try:
+            outcome = _haiku_answer(_verifier_prompt(text, rule, pending_agents), api_key,
+                                    deadline + VERIFIER_TIMEOUT_MARGIN)
+        except Exception as exc:  # noqa: BLE001 — reported and failed open below
+            outcome = exc
+        outcomes[i] = (outcome, time.monotonic() - t0)
+
+    import threading
+
+    started = time.monotonic()
+    threads = []
+    for i in pending:
+        rule, text = candidates[i]
+        debug_log(
+            f"PHASE2: invoking Anthropic Haiku verifier for rule '{rule.get('name', '?')}' "
+            f"(pending_agents={pending_agents}, text_len={len(text or '')})"
+        )
+        thread = threading.Thread(target=call, args=(i,), daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join(max(0.0, deadline - (time.monotonic() - started)))
+
+    cache_changed = False
+    for i in pending:
+        name = candidates[i][0].get("name", "?")
+        if i not in outcomes:
+            debug_log(f"PHASE2: rule '{name}' verifier missed the {deadline:g}s deadline — failing open (violated=False)")
+            verdicts[i] = False
+            continue
+        outcome, seconds = outcomes[i]
+        if isinstance(outcome, Exception):
+            debug_log(
+                f"PHASE2: rule '{name}' Haiku verifier error ({type(outcome).__name__}) "
+                f"after {seconds * 1000:.0f}ms — failing open (violated=False)"
+            )
+            verdicts[i] = False
+            continue
+        violated = outcome.startswith("yes")
+        debug_log(f"PHASE2: rule '{name}' Haiku answer={outcome!r} violated={violated} in {seconds * 1000:.0f}ms")
+        verdicts[i] = violated
+        cache[keys[i]] = [violated, int(time.time())]
+        cache_changed = True
+    if cache_changed:
+        save_verdict_cache(cache)
+    return verdicts
+
+
+def phase2_haiku_evaluate(text, rule, pending_agents=0):
+    """Verify a single rule; see phase2_verify_rules. Returns True if violated."""
+    return phase2_verify_rules([(rule, text)], pending_agents)[0]
 
 
 def infer_mode(rule_text):
@@ -505,12 +1258,88 @@ def infer_mode(rule_text):
     return "ask"
 
 
+TIMER_INDEX_VERSION = 1
+# rules.json mtimes closer than this to the index build time are "racy": a
+# rewrite within the same filesystem timestamp tick would leave mtime, size,
+# and inode unchanged, so such an index is not trusted (as with git's index).
+TIMER_INDEX_RACY_NS = 2_000_000_000
+
+
+def _rules_source_key(rules_path):
+    st = os.stat(rules_path)
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _read_timer_index():
+    try:
+        with open(_hammertime_paths()["timers"], "r") as f:
+            index = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != TIMER_INDEX_VERSION:
+        return None
+    return index
+
+
+def write_timer_index(user_rules, rules_path):
+    """Write timers.json: the user rules' timer deadlines, soonest first.
+
+    "next" is the earliest deadline (epoch seconds, or None without timers)
+    and "source" the rules.json (mtime_ns, size, inode) it was built from,
+    or None when that stamp is too fresh to trust.
+    """
+    deadlines = []
+    timers = [rule for rule in user_rules if isinstance(rule, dict) and rule.get("deadline")]
+    if timers:
+        from datetime import datetime
+    for rule in timers:
+        try:
+            when = datetime.fromisoformat(rule["deadline"]).timestamp()
+        except (ValueError, TypeError):
+            continue  # Invalid deadline: never expires, same as cleanup
+        deadlines.append([when, rule.get("name", "unknown")])
+    deadlines.sort()
+    try:
+        source = _rules_source_key(rules_path)
+    except OSError:
+        source = None
+    if source is not None and time.time_ns() - source[0] < TIMER_INDEX_RACY_NS:
+        source = None
+    index_path = _hammertime_paths()["timers"]
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "version": TIMER_INDEX_VERSION,
+                "source": source,
+                "next": deadlines[0][0] if deadlines else None,
+                "deadlines": deadlines,
+            }, f, separators=(",", ":"))
+        os.rename(tmp_path, index_path)
+    except OSError:
+        pass
+
+
 def cleanup_expired_timers():
-    """Remove expired timer rules from rules.json. Returns list of removed rule names."""
+    """Remove expired timer rules from rules.json. Returns list of removed rule names.
+
+    Consults the timers.json deadline index first: while it still describes
+    rules.json and its next deadline is in the future, nothing can have
+    expired and rules.json is not read. Otherwise rules.json is parsed,
+    rewritten only if a timer expired, and the index rebuilt.
+    """
     rules_path = _hammertime_paths()["rules"]
-    if not os.path.exists(rules_path):
+    try:
+        source = _rules_source_key(rules_path)
+    except OSError:
         return []
 
+    index = _read_timer_index()
+    if index is not None and index.get("source") == source:
+        upcoming = index.get("next")
+        if upcoming is None or time.time() < upcoming:
+            return []
+
     try:
         with open(rules_path, "r") as f:
             user_rules = json.load(f)
@@ -520,7 +1349,10 @@ def cleanup_expired_timers():
     if not isinstance(user_rules, list):
         return []
 
-    now = datetime.now()
+    if any(rule.get("deadline") for rule in user_rules):
+        from datetime import datetime
+
+        now = datetime.now()
     removed = []
     kept = []
     for rule in user_rules:
@@ -546,6 +1378,7 @@ def cleanup_expired_timers():
         for name in removed:
             debug_log(f"TIMER: expired rule '{name}' auto-deleted from rules.json")
 
+    write_timer_index(kept, rules_path)
     return removed
 
 
@@ -557,6 +1390,8 @@ def build_block_message(rule, matched_keywords=None, matched_intents=None):
     the rule. The message is structured with labeled sections so the
     agent can parse it even without prior knowledge of the rule.
     """
+    from datetime import datetime
+
     name = rule["name"]
     text = rule["rule"]
 
@@ -614,6 +1449,8 @@ def build_block_message(rule, matched_keywords=None, matched_intents=None):
 
 def block_and_exit(rule, reason, matched_keywords=None, matched_intents=None):
     """Print block output JSON and exit. Called when a rule violation is confirmed."""
+    import subprocess
+
     # Play alert sound (macOS only, non-blocking, fail silently)
     try:
         subprocess.Popen(
@@ -625,52 +1462,232 @@ def block_and_exit(rule, reason, matched_keywords=None, matched_intents=None):
     msg = build_block_message(rule, matched_keywords=matched_keywords, matched_intents=matched_intents)
     output = {"decision": "block", "reason": reason, "systemMessage": msg}
     print(json.dumps(output))
+    TRACE.note(decision="block", rule=rule.get("name"))
     sys.exit(0)
 
 
+_debug_file = None  # (path, line-buffered file) opened once per run
+
+
 def debug_log(msg):
     """Write to debug log if HAMMERTIME_DEBUG is set. Includes elapsed ms."""
+    global _debug_file
     debug_path = os.environ.get("HAMMERTIME_DEBUG", "")
     if debug_path:
         elapsed = int((time.monotonic() - _start_time) * 1000)
         try:
-            with open(os.path.expanduser(debug_path), "a") as f:
-                f.write(f"[{elapsed:>5}ms] {msg}\n")
+            if _debug_file is None or _debug_file[0] != debug_path:
+                if _debug_file is not None:
+                    _debug_file[1].close()
+                _debug_file = (debug_path, open(os.path.expanduser(debug_path), "a", buffering=1))
+            _debug_file[1].write(f"[{elapsed:>5}ms] {msg}\n")
         except OSError:
             pass
 
 
-def check_git_clean():
-    """Check if git working tree is clean and HEAD matches remote.
-    Returns True if there's nothing to commit or push."""
+# telemetry.jsonl is rotated to telemetry.jsonl.1 once it grows past this.
+TELEMETRY_MAX_BYTES = 5 * 1024 * 1024
+
+
+class RunTrace:
+    """Structured timing record for one hook run.
+
+    Stage durations (ms) accumulate in memory via add(); flush() appends the
+    whole record to telemetry.jsonl as a single line at exit. Unlike the
+    debug log this is always on; HAMMERTIME_TELEMETRY=0 disables it.
+    skills/hammertime/scripts/telemetry-report.py aggregates the records.
+    """
+
+    def __init__(self):
+        self.record = {"ts": int(time.time()), "decision": "exit", "stages": {}}
+
+    def add(self, stage, started):
+        """Charge the time since monotonic timestamp started to stage."""
+        stages = self.record["stages"]
+        stages[stage] = round(stages.get(stage, 0.0) + (time.monotonic() - started) * 1000, 3)
+
+    def note(self, **fields):
+        self.record.update(fields)
+
+    def flush(self):
+        if os.environ.get("HAMMERTIME_TELEMETRY", "").lower() in ("0", "false", "off"):
+            return
+        self.record["total_ms"] = round((time.monotonic() - _start_time) * 1000, 3)
+        line = (json.dumps(self.record, separators=(",", ":")) + "\n").encode()
+        path = _hammertime_paths()["telemetry"]
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                if os.path.getsize(path) > TELEMETRY_MAX_BYTES:
+                    os.replace(path, path + ".1")
+            except OSError:
+                pass
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line)  # One O_APPEND write: concurrent runs never interleave
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+TRACE = RunTrace()
+
+
+# A cached git-status.json verdict is reused for this long while the repo's
+# index, HEAD and branch ref are untouched. Unstaged edits do not touch any
+# of them, so the window stays short.
+GIT_STATUS_CACHE_TTL = 10.0
+
+_git_clean_memo = {}  # cwd -> verdict, for this run
+
+
+def find_git_dir(start):
+    """Return the git dir for start (following a worktree's .git file), or None."""
+    path = os.path.abspath(start)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            try:
+                with open(dot_git) as f:
+                    line = f.read().strip()
+            except OSError:
+                return None
+            if not line.startswith("gitdir:"):
+                return None
+            return os.path.normpath(os.path.join(path, line[len("gitdir:"):].strip()))
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def git_state_stamp(git_dir):
+    """[index, HEAD, branch ref] mtime_ns (None when missing). Staging,
+    committing, checking out and resetting all change at least one."""
+    stamp = []
+    for name in ("index", "HEAD"):
+        try:
+            stamp.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    ref_mtime = None
     try:
-        # Check for uncommitted changes
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode != 0 or result.stdout.strip():
-            return False  # Has uncommitted changes
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.read().strip()
+    except OSError:
+        head = ""
+    if head.startswith("ref: "):
+        bases = [git_dir]
+        try:
+            with open(os.path.join(git_dir, "commondir")) as f:
+                bases.append(os.path.normpath(os.path.join(git_dir, f.read().strip())))
+        except OSError:
+            pass
+        for base in bases:
+            try:
+                ref_mtime = os.stat(os.path.join(base, head[len("ref: "):])).st_mtime_ns
+                break
+            except OSError:
+                continue
+    stamp.append(ref_mtime)
+    return stamp
+
+
+def parse_git_status_v2(output):
+    """True when `git status --porcelain=v2 --branch` output shows no changed,
+    unmerged or untracked entries and an upstream with nothing ahead."""
+    ahead = None
+    for line in output.splitlines():
+        if line.startswith("# branch.ab "):
+            try:
+                ahead = int(line.split()[2])
+            except (IndexError, ValueError):
+                return False
+        elif line and not line.startswith("#"):
+            return False
+    return ahead == 0
+
+
+def _load_git_status_cache():
+    try:
+        with open(_hammertime_paths()["git_status"]) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_git_status_cache(cache):
+    """Atomically write git-status.json, dropping entries past the TTL."""
+    now = time.time()
+    cache = {
+        key: entry for key, entry in cache.items()
+        if isinstance(entry, dict) and now - entry.get("at", 0) < GIT_STATUS_CACHE_TTL
+    }
+    path = _hammertime_paths()["git_status"]
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
 
-        # Check for unpushed commits
-        result = subprocess.run(
-            ["git", "log", "@{u}..HEAD", "--oneline"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode != 0 or result.stdout.strip():
-            return False  # Has unpushed commits
 
-        # Check for untracked files (not in .gitignore)
+def _probe_git_clean(cwd):
+    import subprocess
+
+    git_dir = find_git_dir(cwd)
+    if git_dir is None:
+        debug_log("GIT: not inside a repository, treating as not clean")
+        return False
+    stamp = git_state_stamp(git_dir)
+    cache = _load_git_status_cache()
+    entry = cache.get(git_dir)
+    if (isinstance(entry, dict) and entry.get("stamp") == stamp
+            and time.time() - entry.get("at", 0) < GIT_STATUS_CACHE_TTL):
+        debug_log(f"GIT: cached clean={entry.get('clean')} for {git_dir}")
+        return bool(entry.get("clean"))
+
+    started = time.monotonic()
+    try:
         result = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            capture_output=True, text=True, timeout=5
+            # No optional locks: never rewrite the index (which would change
+            # the stamp) or contend for index.lock with the session's own git
+            ["git", "--no-optional-locks", "status", "--porcelain=v2", "--branch"],
+            capture_output=True, text=True, timeout=5, cwd=cwd,
         )
-        if result.returncode != 0 or result.stdout.strip():
-            return False  # Has untracked files
-
-        return True  # Everything is clean and pushed
     except (FileNotFoundError, OSError, subprocess.TimeoutExpired):
         return False  # Can't determine, assume not clean (safe default)
+    if result.returncode != 0:
+        return False
+    clean = parse_git_status_v2(result.stdout)
+    debug_log(f"GIT: probed clean={clean} in {(time.monotonic() - started) * 1000:.0f}ms")
+    cache[git_dir] = {"stamp": stamp, "at": time.time(), "clean": clean}
+    _save_git_status_cache(cache)
+    return clean
+
+
+def check_git_clean():
+    """Check if git working tree is clean and HEAD matches remote.
+    Returns True if there's nothing to commit or push.
+
+    One `git status --porcelain=v2 --branch` probe answers both: no entry
+    lines, and an upstream with an ahead count of 0 (no upstream means not
+    clean, as before). The verdict is memoized for the rest of the run and
+    cached per repo in git-status.json, keyed on git_state_stamp(), for
+    GIT_STATUS_CACHE_TTL seconds.
+    """
+    cwd = os.getcwd()
+    if cwd not in _git_clean_memo:
+        started = time.monotonic()
+        _git_clean_memo[cwd] = _probe_git_clean(cwd)
+        TRACE.add("git_check", started)
+    return _git_clean_memo[cwd]
 
 
 def find_transcript(cwd=None):
@@ -793,60 +1810,297 @@ def classify_transcript_entry(obj):
     return "other", None
 
 
-def collect_turn_messages(transcript_path):
-    """Read transcript backwards, collect assistant text since last user message.
+# On a cold start (no cursor) background-agent dispatches are only looked for
+# this far back from EOF; the current turn itself is never truncated.
+AGENT_SCAN_WINDOW = 2 * 1024 * 1024
+REVERSE_CHUNK_SIZE = 64 * 1024
+_TOOL_USE_ID = re.compile(r"<tool-use-id>(.*?)</tool-use-id>")
 
-    Uses tolerant Claude + Codex adapters. Returns concatenated text, or None
-    if reading/parsing fails (caller must fall back — never block on parse errors).
+
+def iter_lines_reverse(f, end, chunk_size=REVERSE_CHUNK_SIZE):
+    """Yield (offset, line) for the lines of binary file f before end, last first.
+
+    Reads fixed-size chunks backwards from end, so memory stays bounded by
+    chunk_size plus the longest single line no matter how far back the caller
+    iterates. line excludes its trailing newline; a final line with no newline
+    (possibly mid-write) is yielded too, ending exactly at end.
     """
-    if not transcript_path:
-        return None
+    pos = end
+    buf = b""
+    while pos > 0:
+        step = min(chunk_size, pos)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + buf
+        lines = buf.split(b"\n")
+        buf = lines[0]  # May continue in the previous chunk
+        line_end = pos + len(buf)
+        tail = []
+        for line in lines[1:]:
+            line_end += 1
+            tail.append((line_end, line))
+            line_end += len(line)
+        for start, line in reversed(tail):
+            yield start, line
+    if buf:
+        yield 0, buf
+
+
+def _stdlib_loads(raw):
+    return json.loads(raw.decode("utf-8", errors="replace"))
+
+
+# Optional native JSON decoders for transcript lines, imported on first use:
+# module name -> module, or None when not installed. Both accept bytes and
+# return plain dicts/lists, so the adapters below work unchanged; the stdlib
+# json module is the fallback when neither is installed.
+_NATIVE_DECODERS = {}
+
+
+def _native_decoder(module):
+    if module not in _NATIVE_DECODERS:
+        try:
+            _NATIVE_DECODERS[module] = __import__(module)
+        except ImportError:
+            _NATIVE_DECODERS[module] = None
+    return _NATIVE_DECODERS[module]
 
-    try:
-        file_size = os.path.getsize(transcript_path)
-    except OSError:
-        return None
 
-    MAX_READ = 2 * 1024 * 1024  # 2MB max — safety cap
+def select_json_decoder(name=None):
+    """Return (name, loads) for the fastest available JSON decoder.
 
-    try:
-        with open(transcript_path, "rb") as f:
-            start_pos = max(0, file_size - MAX_READ)
-            f.seek(start_pos)
-            tail = f.read().decode("utf-8", errors="replace")
-    except (OSError, UnicodeDecodeError):
-        debug_log("TRANSCRIPT: failed to read file")
+    name forces one of "orjson", "msgspec", or "json"; an unavailable choice
+    falls through to the stdlib. loads takes bytes and raises one of
+    _DECODE_ERRORS on malformed input (invalid UTF-8 included).
+    """
+    global _DECODE_ERRORS
+    if name in (None, "orjson"):
+        orjson = _native_decoder("orjson")
+        if orjson is not None:
+            return "orjson", orjson.loads
+    if name in (None, "msgspec"):
+        msgspec = _native_decoder("msgspec.json")
+        if msgspec is not None:
+            _DECODE_ERRORS = (ValueError, msgspec.DecodeError)
+            return "msgspec", msgspec.json.decode
+    return "json", _stdlib_loads
+
+
+_DECODE_ERRORS = (ValueError,)
+# Chosen by _decode_line on the first transcript line it decodes
+JSON_DECODER, _json_loads = None, None
+
+# Every transcript line the adapters care about carries one of these byte
+# strings: Claude user/assistant entries (tool_use blocks and task
+# notifications live inside them) and Codex response_item/event_msg entries.
+# Lines without any (progress, snapshots, summaries, system) are skipped
+# before decoding.
+_TRANSCRIPT_MARKERS = (b'"assistant"', b'"user"', b'"response_item"', b'"event_msg"')
+
+
+def _decode_line(raw):
+    """Decode one transcript line; None for blanks, garbage, non-objects, or
+    lines without a _TRANSCRIPT_MARKERS marker."""
+    global JSON_DECODER, _json_loads
+    for marker in _TRANSCRIPT_MARKERS:
+        if marker in raw:
+            break
+    else:
         return None
+    if _json_loads is None:
+        JSON_DECODER, _json_loads = select_json_decoder(os.environ.get("HAMMERTIME_JSON_DECODER"))
+    try:
+        obj = _json_loads(raw)
+    except _DECODE_ERRORS:
+        if _json_loads is _stdlib_loads:
+            return None
+        # Native decoders reject invalid UTF-8 the stdlib path replaces
+        try:
+            obj = _stdlib_loads(raw)
+        except ValueError:
+            return None
+    return obj if isinstance(obj, dict) else None
 
-    lines = tail.strip().split("\n")
-    assistant_texts = []
 
-    try:
-        for line in reversed(lines):
-            if not line.strip():
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+def _track_agents(obj, dispatched, completed, at):
+    """Record background Agent dispatches and task-notification completions.
+
+    dispatched and completed map agent id -> end offset of the line it was
+    last seen on, so ids can age out of the scan window.
+    """
+    msg = obj.get("message", {})
+    content = msg.get("content", "") if isinstance(msg, dict) else ""
+
+    # Detect background Agent dispatches
+    if isinstance(content, list):
+        for block in content:
+            if (isinstance(block, dict)
+                    and block.get("type") == "tool_use"
+                    and block.get("name") == "Agent"
+                    and block.get("input", {}).get("run_in_background")):
+                agent_id = block.get("id", "")
+                dispatched[agent_id] = max(dispatched.get(agent_id, 0), at)
+
+    # Detect task-notification completions
+    if isinstance(content, str) and "<task-notification>" in content:
+        match = _TOOL_USE_ID.search(content)
+        if match:
+            completed[match.group(1)] = max(completed.get(match.group(1), 0), at)
+
+
+class TranscriptScan:
+    """One parse of a transcript, shared by every consumer in a Stop run.
+
+    cursor is the dict saved from the previous run of this session (see
+    self.cursor): the byte offset after the last complete line already seen,
+    the offset just past the last user message (the current turn's start),
+    and the unmatched dispatched/completed agent ids with the offsets they
+    were seen at. With a cursor the turn is streamed forward from its start
+    and only lines past the old offset update the agent maps, so cost tracks
+    the turn length rather than the file size. Without one, lines are
+    streamed backwards from EOF until the user boundary (agents: until
+    AGENT_SCAN_WINDOW). Either way an agent id seen before the current turn
+    and more than AGENT_SCAN_WINDOW bytes back is dropped, so one that never
+    completed stops counting as pending, as in the cold scan. Neither path holds
+    more than one line plus one read chunk of raw transcript in memory, and
+    neither truncates a turn, however large its tool output made it.
+
+    turn_text is the concatenated assistant text since the last user message
+    (None if unreadable or empty); pending_agents the number of background
+    agents without a completion; cursor the dict to persist, or None.
+    """
+
+    def __init__(self, transcript_path, cursor=None):
+        self.path = transcript_path
+        self.turn_text = None
+        self.turn_blocks = 0
+        self.pending_agents = 0
+        self.cursor = None
+        try:
+            self._scan(cursor)
+        except (OSError, UnicodeDecodeError):
+            debug_log("TRANSCRIPT: failed to read file")
+        except Exception as exc:  # noqa: BLE001 — tolerant adapter: never block on parse bugs
+            debug_log(f"TRANSCRIPT: adapter error ({type(exc).__name__}): falling back")
+
+    def _scan(self, cursor):
+        st = os.stat(self.path)
+        size = st.st_size
+        resumed = (
+            isinstance(cursor, dict)
+            and cursor.get("path") == self.path
+            and cursor.get("inode") == st.st_ino
+            and 0 <= cursor.get("turn_offset", -1) <= cursor.get("offset", -1) <= size
+            and isinstance(cursor.get("dispatched"), dict)
+            and isinstance(cursor.get("completed"), dict)
+        )
+        dispatched, completed = {}, {}
+        with open(self.path, "rb") as f:
+            if resumed:
+                dispatched.update(cursor["dispatched"])
+                completed.update(cursor["completed"])
+                texts, offset, turn_offset, read = self._scan_forward(
+                    f, size, cursor["offset"], cursor["turn_offset"], dispatched, completed
+                )
+            else:
+                texts, offset, turn_offset, read = self._scan_reverse(f, size, dispatched, completed)
+
+        turn_offset = min(turn_offset, offset)
+        horizon = min(max(0, offset - AGENT_SCAN_WINDOW), turn_offset)
+        done = dispatched.keys() & completed.keys()
+        dispatched = {agent_id: at for agent_id, at in dispatched.items() if agent_id not in done and at >= horizon}
+        completed = {agent_id: at for agent_id, at in completed.items() if agent_id not in done and at >= horizon}
+        self.pending_agents = len(dispatched)
+        self.turn_blocks = len(texts)
+        if texts:
+            self.turn_text = "\n\n".join(texts)
+        self.cursor = {
+            "path": self.path,
+            "inode": st.st_ino,
+            "offset": offset,
+            "turn_offset": turn_offset,
+            "dispatched": dispatched,
+            "completed": completed,
+        }
+        debug_log(
+            f"TRANSCRIPT: {'resumed' if resumed else 'cold'} scan read {read} bytes "
+            f"(file {size} bytes, turn starts at {self.cursor['turn_offset']}, decoder {JSON_DECODER or 'unused'})"
+        )
 
+    @staticmethod
+    def _scan_forward(f, size, offset, turn_offset, dispatched, completed):
+        """Stream from turn_offset to EOF. Returns (texts, offset, turn_offset, bytes_read)."""
+        texts = []
+        new_offset = offset
+        f.seek(turn_offset)
+        pos = start = turn_offset
+        for raw in f:
+            line_start = pos
+            pos += len(raw)
+            complete = raw.endswith(b"\n")
+            if complete:
+                # A trailing line without its newline may still be mid-write;
+                # leave it for the next run (re-reading it is harmless).
+                new_offset = max(new_offset, pos)
+            obj = _decode_line(raw)
+            if obj is None:
+                continue
+            if line_start >= offset:
+                _track_agents(obj, dispatched, completed, pos)
             role, text = classify_transcript_entry(obj)
             if role == "user":
+                texts = []
+                turn_offset = pos if complete else line_start
+            elif role == "assistant" and text:
+                texts.append(text)
+        return texts, new_offset, turn_offset, pos - start
+
+    @staticmethod
+    def _scan_reverse(f, size, dispatched, completed):
+        """Stream backwards from EOF. Returns (texts, offset, turn_offset, bytes_read)."""
+        texts = []
+        turn_offset = None
+        offset = size
+        agent_floor = max(0, size - AGENT_SCAN_WINDOW)
+        line_start = size
+        for line_start, raw in iter_lines_reverse(f, size):
+            line_end = line_start + len(raw) + 1
+            if line_end > size:
+                offset = line_start  # Unterminated final line; see _scan_forward
+            if turn_offset is not None and line_start < agent_floor:
                 break
-            if role == "assistant" and text:
-                assistant_texts.append(text)
-    except Exception as exc:  # noqa: BLE001 — tolerant adapter: never block on parse bugs
-        debug_log(f"TRANSCRIPT: adapter error ({type(exc).__name__}): falling back")
+            obj = _decode_line(raw)
+            if obj is None:
+                continue
+            _track_agents(obj, dispatched, completed, min(line_end, size))
+            if turn_offset is None:
+                role, text = classify_transcript_entry(obj)
+                if role == "user":
+                    turn_offset = min(line_end, size)
+                elif role == "assistant" and text:
+                    texts.append(text)
+        texts.reverse()
+        return texts, offset, turn_offset or 0, size - line_start
+
+
+def collect_turn_messages(transcript_path, scan=None):
+    """Collect assistant text since the last user message in the transcript.
+
+    Uses tolerant Claude + Codex adapters. Returns concatenated text, or None
+    if reading/parsing fails (caller must fall back — never block on parse errors).
+    Pass the run's TranscriptScan to reuse its parse.
+    """
+    if not transcript_path:
         return None
+    if scan is None:
+        scan = TranscriptScan(transcript_path)
 
-    if not assistant_texts:
+    if not scan.turn_text:
         debug_log("TRANSCRIPT: no assistant text found in current turn")
         return None
 
-    assistant_texts.reverse()
-    full_text = "\n\n".join(assistant_texts)
-    debug_log(f"TRANSCRIPT: collected {len(assistant_texts)} assistant blocks, {len(full_text)} chars")
-    return full_text
+    debug_log(f"TRANSCRIPT: collected {scan.turn_blocks} assistant blocks, {len(scan.turn_text)} chars")
+    return scan.turn_text
 
 
 def extract_last_assistant_message(hook_input):
@@ -903,28 +2157,186 @@ def hook_enabled(name: str) -> bool:
     return True
 
 
+def _daemon_source_stamp():
+    """mtimes of the files the daemon was started from; a change means upgrade."""
+    stamp = []
+    for path in (os.path.abspath(__file__), os.path.join(_SKILL_SCRIPTS, "hammertime_paths.py")):
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+
+def _daemon_handle(conn):
+    """Forked child: read one forwarded Stop event, run main() for it and reply.
+
+    The child owns a copy of the warm daemon (imports, compiled builtin
+    patterns, the in-memory rule set), so per-run globals, cwd and the
+    environment can be replaced freely. A stalled or malformed request gets
+    no reply (the client falls back in-process). Never returns.
+    """
+    global _start_time, TRACE
+    import io
+    import signal
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # subprocess.run must reap git
+    _start_time = time.monotonic()
+    TRACE = RunTrace()
+    TRACE.note(daemon=True)
+    code = 1
+    out, err = io.StringIO(), io.StringIO()
+    try:
+        conn.settimeout(5.0)
+        chunks = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        request = marshal.loads(b"".join(chunks))
+        if not (isinstance(request, dict) and isinstance(request.get("env"), dict)
+                and isinstance(request.get("stdin"), str) and isinstance(request.get("cwd"), str)):
+            return
+        conn.settimeout(None)
+        os.environ.clear()
+        os.environ.update(request["env"])
+        try:
+            os.chdir(request["cwd"])
+        except OSError:
+            pass
+        sys.stdin = io.StringIO(request["stdin"])
+        sys.stdout, sys.stderr = out, err
+        try:
+            main()
+            code = 0
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        except Exception:  # noqa: BLE001 — report like an in-process crash would
+            import traceback
+
+            traceback.print_exc()
+        TRACE.flush()
+        conn.sendall(marshal.dumps((code, out.getvalue(), err.getvalue())))
+    except Exception:  # noqa: BLE001 — client falls back in-process on no reply
+        pass
+    finally:
+        os._exit(0)
+
+
+def _daemon_warm():
+    """Load the rule set into the daemon's memory.
+
+    Runs under the daemon's own environment: its socket lives in the
+    HammerTime home, so every client it serves resolves the same rules.json.
+    """
+    try:
+        load_rule_set()
+    except Exception:  # noqa: BLE001
+        pass
+
+
+def serve_daemon(socket_path=None):
+    """Serve Stop events on a Unix socket until SIGTERM/SIGINT.
+
+    Each connection is one marshal-encoded {stdin, cwd, env} request from the
+    thin client at the top of this file; the reply is (exit_code, stdout,
+    stderr). The parent forks as soon as it accepts a connection and the
+    child reads the request, so a slow or stalled client holds up only its
+    own child. After forking, the parent refreshes its in-memory rule set
+    (load_rule_set reloads when rules.json changes). Editing this file
+    re-executes the daemon.
+    """
+    import signal
+    import socket
+
+    socket_path = socket_path or _hammertime_paths()["daemon_socket"]
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        print(f"HammerTime daemon already listening on {socket_path}", file=sys.stderr)
+        return 1
+    except OSError:
+        pass
+    finally:
+        probe.close()
+    try:
+        os.unlink(socket_path)  # Stale socket from a daemon that died
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # Socket is owner-only (0600)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen(64)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # Children are reaped automatically
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    os.environ.pop("HAMMERTIME_DEBUG", None)  # Each child logs its own run
+    _daemon_warm()
+    stamp = _daemon_source_stamp()
+    print(f"HammerTime daemon listening on {socket_path} (pid {os.getpid()})", file=sys.stderr)
+
+    restart = False
+    try:
+        while not restart:
+            conn, _ = server.accept()
+            try:
+                if os.fork() == 0:
+                    server.close()
+                    _daemon_handle(conn)
+            except OSError:
+                continue  # Could not fork; the client falls back in-process
+            finally:
+                conn.close()
+            _daemon_warm()
+            restart = _daemon_source_stamp() != stamp
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+    if restart:
+        print("HammerTime daemon source changed, restarting", file=sys.stderr)
+        os.execv(sys.executable, [sys.executable, os.path.abspath(__file__), "--daemon"])
+    return 0
+
+
 def main():
+    atexit.register(TRACE.flush)
+
     # These two exits are logged BEFORE they fire: a silent exit-0 here is
     # indistinguishable from "no rule matched" in test output, which made a
     # suite flake undiagnosable — no debug line ever appeared.
     if not hook_enabled("hammertime"):
         debug_log("EXIT: hook_enabled('hammertime') returned False (config disable)")
+        TRACE.note(decision="disabled")
         sys.exit(0)
 
     # Global kill switch — if the sentinel file exists, skip all processing
     disabled_path = _hammertime_paths()["disabled"]
     if os.path.exists(disabled_path):
         debug_log(f"EXIT: disabled sentinel present at {disabled_path}")
+        TRACE.note(decision="disabled")
         sys.exit(0)
 
     debug_log("--- HammerTime run ---")
     debug_log(f"HOME: {resolve_hammertime_home()}")
+    started = time.monotonic()
     try:
         raw = sys.stdin.read()
         hook_input = json.loads(raw) if raw.strip() else {}
     except (json.JSONDecodeError, OSError):
         debug_log("EXIT: failed to parse stdin")
         sys.exit(0)
+    finally:
+        TRACE.add("stdin_parse", started)
 
     if not isinstance(hook_input, dict):
         debug_log("EXIT: stdin JSON was not an object")
@@ -936,6 +2348,7 @@ def main():
     reason = hook_input.get("reason")
     if reason in ("channel_closed", "shutdown"):
         debug_log(f"EXIT: session-end Stop reason={reason!r}")
+        TRACE.note(decision="session-end")
         sys.exit(0)
 
     last_msg = extract_last_assistant_message(hook_input)
@@ -969,9 +2382,13 @@ def main():
         transcript_path = find_transcript(cwd)
 
     # If still no last message, try transcript adapters before giving up
+    scan = None  # One TranscriptScan per run, shared by every transcript consumer
     if not last_msg and transcript_path:
         try:
-            last_msg = collect_turn_messages(transcript_path) or ""
+            started = time.monotonic()
+            scan = TranscriptScan(transcript_path)
+            TRACE.add("transcript_read", started)
+            last_msg = collect_turn_messages(transcript_path, scan) or ""
             if last_msg:
                 debug_log(f"LAST_MSG: recovered {len(last_msg)} chars from transcript")
         except Exception as exc:  # noqa: BLE001
@@ -980,24 +2397,33 @@ def main():
 
     if not last_msg:
         debug_log("EXIT: no last_assistant_message (and transcript fallback empty)")
+        TRACE.note(decision="no-message")
         sys.exit(0)
 
     debug_log(f"LAST_MSG length: {len(last_msg)} chars; session_id={session_id!r}")
 
     # Clean up expired timer rules (auto-delete from rules.json)
+    TRACE.note(last_msg_chars=len(last_msg))
+    started = time.monotonic()
     removed = cleanup_expired_timers()
+    TRACE.add("timer_cleanup", started)
     if removed:
         debug_log(f"TIMER: cleaned up {len(removed)} expired timer(s): {removed}")
 
     project_dir = session_project_dir()
     debug_log(f"SCOPE: project_dir={project_dir!r}")
-    rules = scope_rules_to_project(load_rules(), project_dir)
+    started = time.monotonic()
+    all_rules, keyword_automaton = load_rule_set()
+    rules = scope_rules_to_project(all_rules, project_dir)
+    TRACE.add("rule_load", started)
+    TRACE.note(rules=len(rules))
     if not rules:
         debug_log("EXIT: no enabled rules for this project")
+        TRACE.note(decision="no-rules")
         sys.exit(0)
 
     # Load iteration state for loop safety (max_iterations)
-    state = load_state()
+    state = load_state(session_id)
     if state.get("session_id") != session_id:
         debug_log(f"STATE: new session {str(session_id)[:12]}..., resetting iteration counters")
         state = {"session_id": session_id, "rule_iterations": {}}
@@ -1005,9 +2431,12 @@ def main():
     # --- Timer rules: evaluate BEFORE stop_hook_active guard ---
     # Timer rules bypass stop_hook_active because they have deadline-based
     # termination (no risk of infinite loops — the deadline always arrives).
-    now = datetime.now()
     timer_rules = [r for r in rules if r.get("deadline")]
     content_rules = [r for r in rules if not r.get("deadline")]
+    if timer_rules:
+        from datetime import datetime
+
+        now = datetime.now()
 
     for rule in timer_rules:
         rule_name = rule["name"]
@@ -1030,6 +2459,7 @@ def main():
             debug_log(f"TIMER: rule '{rule_name}' active, {remaining_mins}m {remaining_secs % 60}s remaining, blocking exit")
             state.setdefault("rule_iterations", {})[rule_name] = current_iter + 1
             save_state(state)
+            TRACE.note(timer=True)
             block_and_exit(rule, f"Timer rule '{rule_name}': {rule.get('rule', '')[:150]} ({remaining_mins}m remaining)")
         else:
             debug_log(f"TIMER: rule '{rule_name}' expired (deadline was {deadline_str}), skipping")
@@ -1037,16 +2467,32 @@ def main():
     # --- Content rules: stop_hook_active guard applies ---
     if hook_input.get("stop_hook_active") or hook_input.get("stopHookActive"):
         debug_log("EXIT: stop_hook_active=true, skipping content rules")
+        TRACE.note(decision="stop-hook-active")
         sys.exit(0)
 
     if not content_rules:
         debug_log("EXIT: no content rules to evaluate")
+        TRACE.note(decision="no-content-rules")
         sys.exit(0)
 
+    # Compile every content rule's keywords/intents once for both scoring passes
+    started = time.monotonic()
+    matcher = RuleMatcher(content_rules, keyword_automaton)
+    TRACE.add("rule_load", started)
+
+    # Parse the transcript once, resuming from this session's cursor, for
+    # both the pending-agent count and full-turn evaluation
+    if transcript_path and scan is None:
+        started = time.monotonic()
+        scan = TranscriptScan(transcript_path, state.get("transcript_cursor"))
+        TRACE.add("transcript_read", started)
+    if scan is not None and scan.cursor is not None:
+        state["transcript_cursor"] = scan.cursor
+
     # Count pending background agents for Haiku context (Claude transcripts)
     pending_agents = 0
     try:
-        pending_agents = count_pending_agents(transcript_path)
+        pending_agents = count_pending_agents(transcript_path, scan)
     except Exception as exc:  # noqa: BLE001
         debug_log(f"PENDING_AGENTS: scan failed ({type(exc).__name__})")
 
@@ -1055,7 +2501,7 @@ def main():
     if any(r.get("evaluate_full_turn") for r in content_rules):
         if transcript_path:
             try:
-                full_turn_text = collect_turn_messages(transcript_path)
+                full_turn_text = collect_turn_messages(transcript_path, scan)
             except Exception as exc:  # noqa: BLE001
                 debug_log(f"FULL_TURN: collect failed ({type(exc).__name__}); using last_msg only")
                 full_turn_text = None
@@ -1070,18 +2516,28 @@ def main():
             last_msg_rules.append(rule)
 
     # Score each group against appropriate text
+    TRACE.note(content_rules=len(content_rules), turn_chars=len(full_turn_text or ""))
+    started = time.monotonic()
     scored = []
     if last_msg_rules:
-        scored.extend(score_message(last_msg, last_msg_rules))
+        scored.extend(score_message(last_msg, last_msg_rules, matcher))
     if full_turn_rules:
         debug_log(f"FULL_TURN: scoring {len(full_turn_rules)} rules against {len(full_turn_text)} chars")
-        scored.extend(score_message(full_turn_text, full_turn_rules))
+        scored.extend(score_message(full_turn_text, full_turn_rules, matcher))
 
+    TRACE.add("scoring", started)
+    TRACE.note(scored=len(scored))
     debug_log(f"SCORED: {len(scored)} rules with score > 0")
     if not scored:
+        if scan is not None:
+            save_state(state)  # Persist the advanced transcript cursor
+        TRACE.note(decision="pass")
         sys.exit(0)
 
-    # Evaluate each scored rule
+    # Decide each scored rule in order. Ambiguous rules ahead of the first
+    # hard block are verified together so their calls share one deadline.
+    hard_block = None
+    ambiguous = []
     for rule, score, breakdown in scored:
         threshold = rule.get("confidence_threshold", 5)
         eval_text = full_turn_text if rule.get("evaluate_full_turn") and full_turn_text else last_msg
@@ -1100,24 +2556,28 @@ def main():
                 debug_log(f"SKIP: rule '{rule['name']}' score={score} but git state is clean")
                 continue
             debug_log(f"BLOCK: score {score} >= {threshold}, skipping Phase 2")
-            state.setdefault("rule_iterations", {})[rule_name] = current_iter + 1
-            save_state(state)
-            block_and_exit(
-                rule,
-                f"HammerTime rule '{rule['name']}': {rule['rule'][:150]} (score={score})",
-                matched_keywords=breakdown.get("matched_keywords"),
-                matched_intents=breakdown.get("matched_intents"),
-            )
+            hard_block = (rule, score, breakdown, current_iter)
+            break
         else:
             if rule.get("check_git_state") and check_git_clean():
                 debug_log(f"SKIP: rule '{rule['name']}' score={score}, Haiku phase skipped — git clean")
                 continue
             debug_log(f"PHASE2: score {score} < {threshold}, verifying with Haiku")
-            violated = phase2_haiku_evaluate(eval_text, rule, pending_agents)
+            ambiguous.append((rule, score, breakdown, current_iter, eval_text))
+
+    if ambiguous:
+        started = time.monotonic()
+        verdicts = phase2_verify_rules(
+            [(rule, eval_text) for rule, _, _, _, eval_text in ambiguous], pending_agents
+        )
+        TRACE.add("verifier", started)
+        TRACE.note(verified=len(ambiguous))
+        for (rule, score, breakdown, current_iter, _), violated in zip(ambiguous, verdicts):
             debug_log(f"PHASE2: rule '{rule['name']}' violated={violated}")
             if violated:
-                state.setdefault("rule_iterations", {})[rule_name] = current_iter + 1
+                state.setdefault("rule_iterations", {})[rule["name"]] = current_iter + 1
                 save_state(state)
+                TRACE.note(verifier_block=True)
                 block_and_exit(
                     rule,
                     f"HammerTime rule '{rule['name']}': {rule['rule'][:150]} (score={score}, haiku=yes)",
@@ -1125,10 +2585,26 @@ def main():
                     matched_intents=breakdown.get("matched_intents"),
                 )
 
+    if hard_block:
+        rule, score, breakdown, current_iter = hard_block
+        state.setdefault("rule_iterations", {})[rule["name"]] = current_iter + 1
+        save_state(state)
+        block_and_exit(
+            rule,
+            f"HammerTime rule '{rule['name']}': {rule['rule'][:150]} (score={score})",
+            matched_keywords=breakdown.get("matched_keywords"),
+            matched_intents=breakdown.get("matched_intents"),
+        )
+
     # No violations confirmed
     debug_log("PASS: no violations confirmed")
+    if scan is not None:
+        save_state(state)  # Persist the advanced transcript cursor
+    TRACE.note(decision="pass")
     sys.exit(0)
 
 
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--daemon"]:
+        sys.exit(serve_daemon())
     main()
@@ -4,7 +4,8 @@
 #
 # When a Task dispatch targets subagent_type "general-purpose" or "Explore",
 # scores the dispatch prompt/description against the AGENT entries in
-# ~/.claude/core/router-index.json. Above threshold, emits ONLY
+# ~/.claude/core/router-index.json (or its precompiled router-index.marshal
+# when that is at least as new). Above threshold, emits ONLY
 # additionalContext suggesting the matching roster specialist — no
 # permissionDecision field at all. additionalContext is a standalone
 # PreToolUse output field and does not require a decision; an advisory
@@ -46,49 +47,112 @@ ${task_prompt}"
 
 DISPATCH_TEXT="$dispatch_text" INDEX_PATH="$INDEX_PATH" python3 - <<'PY'
 import json
+import marshal
 import os
 import re
 import sys
+import zlib
 
 text = os.environ.get("DISPATCH_TEXT", "")
 index_path = os.environ.get("INDEX_PATH", "")
 
-try:
+
+def load_index(index_path):
+    """The router index, from its precompiled .marshal artifact when that is
+    at least as new as the JSON and its header checks out, else the JSON.
+    Header and format: scripts/build-router-index.py."""
+    artifact = os.path.splitext(index_path)[0] + ".marshal"
+    try:
+        if os.stat(artifact).st_mtime_ns >= os.stat(index_path).st_mtime_ns:
+            with open(artifact, "rb") as f:
+                header = f.readline().split()
+                payload = f.read()
+            if (
+                len(header) == 5
+                and header[:3] == [b"BOPEN-ROUTER-INDEX", b"1", b"py%d.%d" % sys.version_info[:2]]
+                and int(header[4]) == len(payload)
+                and int(header[3], 16) == zlib.crc32(payload)
+            ):
+                return marshal.loads(payload)
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
     with open(index_path, "r", encoding="utf-8") as f:
-        index = json.load(f)
+        return json.load(f)
+
+
+try:
+    index = load_index(index_path)
 except (OSError, ValueError):
     sys.exit(0)
+if not isinstance(index, dict):
+    sys.exit(0)
 
-entries = [e for e in (index.get("entries") or []) if e.get("kind") == "agent"]
-if not entries:
+# Lookup positions index the full entry list; non-agents are dropped when
+# scored.
+entries = index.get("entries") or []
+if not any(e.get("kind") == "agent" for e in entries):
     sys.exit(0)
 
 text_lower = text.lower()
 word_re = re.compile(r"[a-z0-9']+")
+key_re = re.compile(r"[a-z0-9]+")
+ALNUM = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
 text_words = set(word_re.findall(text_lower))
 
 
-def score_entry(entry):
-    score = 0
-    for trig in entry.get("triggers") or []:
-        t = (trig or "").strip().lower()
-        if not t:
-            continue
-        if " " in t:
-            pattern = r"(?<![a-z0-9])" + re.escape(t) + r"(?![a-z0-9])"
-            if re.search(pattern, text_lower):
-                score += 3
-        elif t in text_words:
-            score += 1
-    return score
-
+def build_lookup(entries):
+    """Same inverted index build-router-index.py writes as `lookup`: word ->
+    entry positions, phrase first token -> phrase -> entry positions."""
+    words, phrases = {}, {}
+    for position, entry in enumerate(entries):
+        for trig in entry.get("triggers") or []:
+            t = (trig or "").strip().lower()
+            if not t:
+                continue
+            if " " in t:
+                key = key_re.match(t)
+                phrases.setdefault(key.group() if key else "", {}).setdefault(t, []).append(position)
+            else:
+                words.setdefault(t, []).append(position)
+    return {"words": words, "phrases": phrases}
+
+
+def phrase_hit(phrase):
+    """True when `phrase` occurs with no letter or digit glued to either end."""
+    start = text_lower.find(phrase)
+    while start != -1:
+        end = start + len(phrase)
+        if (start == 0 or text_lower[start - 1] not in ALNUM) and (
+            end == len(text_lower) or text_lower[end] not in ALNUM
+        ):
+            return True
+        start = text_lower.find(phrase, start + 1)
+    return False
+
+
+# Score only entries that share a token with the text: a keyword hit is +1, a
+# phrase hit +3, looked up through the index's inverted `lookup` block.
+lookup = index.get("lookup")
+if not (isinstance(lookup, dict) and isinstance(lookup.get("words"), dict)
+        and isinstance(lookup.get("phrases"), dict)):
+    lookup = build_lookup(entries)
+
+scores = {}
+for w in text_words:
+    for position in lookup["words"].get(w, ()):
+        scores[position] = scores.get(position, 0) + 1
+for key in set(key_re.findall(text_lower)) | {""}:
+    for phrase, positions in (lookup["phrases"].get(key) or {}).items():
+        if phrase_hit(phrase):
+            for position in positions:
+                scores[position] = scores.get(position, 0) + 3
 
 # Threshold: >=2 keyword hits OR >=1 phrase hit (a phrase alone scores 3).
-scored = []
-for entry in entries:
-    s = score_entry(entry)
-    if s >= 2:
-        scored.append((s, entry))
+scored = [
+    (s, entries[position])
+    for position, s in scores.items()
+    if s >= 2 and 0 <= position < len(entries) and entries[position].get("kind") == "agent"
+]
 
 if not scored:
     sys.exit(0)
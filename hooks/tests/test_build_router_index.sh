@@ -74,6 +74,27 @@ assert_not_contains "build-router-index excludes negative clause tail" "interfac
 agent_triggers=$(jq -r '.entries[] | select(.id=="pluginA:bar-agent") | .triggers[]' "$OUT_FILE" 2>/dev/null)
 assert_not_contains "build-router-index excludes example dialogue" "i'll use the bar-agent to handle unrelated dialogue text here" "$agent_triggers"
 
+# Inverted lookup: keywords and first-token phrase table point back at entry positions.
+foo_pos=$(jq '.entries | map(.id) | index("pluginA:foo-skill")' "$OUT_FILE" 2>/dev/null)
+word_hits=$(jq -c '.lookup.words.widget // .lookup.words.automation' "$OUT_FILE" 2>/dev/null)
+assert_eq "build-router-index lookup maps keyword to entry" "[$foo_pos]" "$word_hits"
+phrase_hits=$(jq -c '.lookup.phrases.build["build a foo widget"]' "$OUT_FILE" 2>/dev/null)
+assert_eq "build-router-index lookup keys phrase by first token" "[$foo_pos]" "$phrase_hits"
+
+# Precompiled artifact beside the JSON: header line, then a marshal payload.
+ARTIFACT="$OUT_DIR/router-index.marshal"
+artifact_header=$(head -n1 "$ARTIFACT" 2>/dev/null | cut -d' ' -f1-2)
+assert_eq "build-router-index writes artifact header" "BOPEN-ROUTER-INDEX 1" "$artifact_header"
+artifact_ids=$(python3 -c '
+import marshal, sys, zlib
+with open(sys.argv[1], "rb") as f:
+    header = f.readline().split()
+    payload = f.read()
+assert int(header[3], 16) == zlib.crc32(payload) and int(header[4]) == len(payload)
+print(" ".join(e["id"] for e in marshal.loads(payload)["entries"]))
+' "$ARTIFACT" 2>/dev/null)
+assert_contains "build-router-index artifact checksum and entries" "pluginA:foo-skill" "$artifact_ids"
+
 # Determinism: rebuilding produces the same entries (ignoring generated_at).
 OUT_FILE2="$OUT_DIR/router-index-2.json"
 python3 "$BUILDER" --cache-root "$CACHE_DIR" --output "$OUT_FILE2" >/dev/null 2>&1
@@ -121,24 +121,58 @@ cat > "$HT_HOME/rules.json" <<'JSON'
 JSON
 
 msg='Looks good, ship it.'
-input=$(jq -n --arg m "$msg" '{session_id:"codex-session-A", last_assistant_message:$m}')
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"codex-session-A", last_assistant_message:$m, cwd:$cwd}')
 run_ht "$input"
 assert_contains "hammertime session A first block" '"decision": "block"' "$HOOK_STDOUT"
 
-# State should record session A
-state_a=$(jq -r '.session_id' "$HT_HOME/state.json")
+# State should record session A in its own shard
+state_a=$(jq -r '.session_id' "$HT_HOME/sessions/codex-session-A.json")
 assert_eq "hammertime state session A" "codex-session-A" "$state_a"
-iter_a=$(jq -r '.rule_iterations["no-ship-it"] // 0' "$HT_HOME/state.json")
 
-# New session B should reset counters
-input=$(jq -n --arg m "$msg" '{session_id:"codex-session-B", last_assistant_message:$m}')
+# New session B gets its own shard and counters
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"codex-session-B", last_assistant_message:$m, cwd:$cwd}')
 run_ht "$input"
-state_b=$(jq -r '.session_id' "$HT_HOME/state.json")
+state_b=$(jq -r '.session_id' "$HT_HOME/sessions/codex-session-B.json")
 assert_eq "hammertime state session B distinct" "codex-session-B" "$state_b"
-iter_b=$(jq -r '.rule_iterations["no-ship-it"] // 0' "$HT_HOME/state.json")
+iter_b=$(jq -r '.rule_iterations["no-ship-it"] // 0' "$HT_HOME/sessions/codex-session-B.json")
 # Fresh session starts at 1 after one block
 assert_eq "hammertime session B iteration starts fresh" "1" "$iter_b"
 
+# Session B's stop did not reset session A: A continues to 2, then max_iterations
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"codex-session-A", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_eq "hammertime session A counter survives session B" "2" \
+  "$(jq -r '.rule_iterations["no-ship-it"]' "$HT_HOME/sessions/codex-session-A.json")"
+run_ht "$input"
+assert_not_contains "hammertime session A hits max_iterations" '"decision": "block"' "$HOOK_STDOUT"
+
+# Unsafe session ids are hashed into a safe shard name
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"../escape/attempt", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_eq "hammertime unsafe session id stays in sessions dir" "0" \
+  "$(find "$HT_HOME/sessions" -name '*.json' | grep -c escape || true)"
+
+# Shards untouched for over a week are pruned when a new session starts
+touch -d '8 days ago' "$HT_HOME/sessions/codex-session-B.json"
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"codex-session-C", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_eq "hammertime stale session shard pruned" "no" \
+  "$([ -f "$HT_HOME/sessions/codex-session-B.json" ] && echo yes || echo no)"
+assert_eq "hammertime live session shard kept" "yes" \
+  "$([ -f "$HT_HOME/sessions/codex-session-A.json" ] && echo yes || echo no)"
+
+# Dozens of concurrent sessions each keep an exact counter
+for i in $(seq 1 24); do
+  jq -n --arg m "$msg" --arg s "par-$i" --arg cwd "$HT_CWD" '{session_id:$s, last_assistant_message:$m, cwd:$cwd}' \
+    | python3 "$ROOT/hammertime.py" >/dev/null 2>&1 &
+done
+wait
+par_ok=0
+for i in $(seq 1 24); do
+  [ "$(jq -r '.rule_iterations["no-ship-it"]' "$HT_HOME/sessions/par-$i.json" 2>/dev/null)" = "1" ] && par_ok=$((par_ok + 1))
+done
+assert_eq "hammertime concurrent sessions all recorded" "24" "$par_ok"
+
 # 5) cwd_prefix scopes content-rule evaluation to CLAUDE_PROJECT_DIR
 cat > "$HT_HOME/rules.json" <<'JSON'
 [
@@ -175,11 +209,11 @@ cat > "$HT_HOME/rules.json" <<'JSON'
   }
 ]
 JSON
-input=$(jq -n --arg m "$CLEAN_MSG" '{session_id:"scope-timer-miss", last_assistant_message:$m}')
+input=$(jq -n --arg m "$CLEAN_MSG" --arg cwd "$HT_CWD" '{session_id:"scope-timer-miss", last_assistant_message:$m, cwd:$cwd}')
 CLAUDE_PROJECT_DIR="/work/unrelated" run_ht "$input"
 assert_not_contains "hammertime nonmatching timer cwd_prefix skips" '"decision": "block"' "$HOOK_STDOUT"
 
-input=$(jq -n --arg m "$CLEAN_MSG" '{session_id:"scope-timer-match", last_assistant_message:$m}')
+input=$(jq -n --arg m "$CLEAN_MSG" --arg cwd "$HT_CWD" '{session_id:"scope-timer-match", last_assistant_message:$m, cwd:$cwd}')
 CLAUDE_PROJECT_DIR="/work/timer-repo/app" run_ht "$input"
 assert_contains "hammertime matching timer cwd_prefix blocks" '"decision": "block"' "$HOOK_STDOUT"
 
@@ -195,7 +229,7 @@ cat > "$HT_HOME/rules.json" <<'JSON'
   }
 ]
 JSON
-input=$(jq -n --arg m "$msg" '{session_id:"scope-malformed", last_assistant_message:$m}')
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"scope-malformed", last_assistant_message:$m, cwd:$cwd}')
 CLAUDE_PROJECT_DIR="/work/scoped-repo" run_ht "$input"
 assert_not_contains "hammertime malformed cwd_prefix skips" '"decision": "block"' "$HOOK_STDOUT"
 assert_contains "hammertime malformed cwd_prefix warns" "malformed cwd_prefix" "$HOOK_STDERR"
@@ -228,8 +262,122 @@ input=$(jq -n --arg p "$TX" --arg m "$msg" \
   '{session_id:"codex-tx", transcript_path:$p, last_assistant_message:$m}')
 run_ht "$input"
 assert_contains "hammertime codex transcript still blocks on last_msg" '"decision": "block"' "$HOOK_STDOUT"
+tx_size=$(wc -c < "$TX" | tr -d ' ')
+assert_eq "hammertime transcript cursor persisted" "$tx_size" "$(jq -r '.transcript_cursor.offset' "$HT_HOME/sessions/codex-tx.json")"
+assert_eq "hammertime state written compactly" "0" "$(wc -l < "$HT_HOME/sessions/codex-tx.json" | tr -d ' ')"
+# A passing re-run over the same transcript changes nothing: no state write
+input=$(jq -n --arg p "$TX" --arg m "$CLEAN_MSG" \
+  '{session_id:"codex-tx", transcript_path:$p, last_assistant_message:$m}')
+run_ht "$input"
+: > "$HAMMERTIME_DEBUG"
+run_ht "$input"
+assert_eq "hammertime unchanged state not rewritten" "yes" "$(grep -qF 'STATE: unchanged, write skipped' "$HAMMERTIME_DEBUG" && echo yes || echo no)"
 rm -f "$TX"
 
+# 7b) Compiled-rule cache: miss on first load, hit while rules.json is
+# unchanged, miss again once its content changes. Invalid regexes are dropped.
+cat > "$HT_HOME/rules.json" <<'JSON'
+[
+  {
+    "name": "cached-ship-it",
+    "rule": "Never say ship it without tests.",
+    "enabled": true,
+    "keywords": ["Ship It"],
+    "intent_patterns": ["(unclosed", "ship\\s+it"],
+    "confidence_threshold": 3
+  }
+]
+JSON
+rm -f "$HT_HOME/rules.cache"
+: > "$HAMMERTIME_DEBUG"
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"cache-1", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_eq "hammertime rule cache miss logged" "yes" "$(grep -qF 'RULES: cache miss' "$HAMMERTIME_DEBUG" && echo yes || echo no)"
+assert_eq "hammertime invalid intent pattern dropped" "yes" "$(grep -qF 'dropped invalid intent pattern' "$HAMMERTIME_DEBUG" && echo yes || echo no)"
+assert_contains "hammertime rule cache miss still blocks" '"decision": "block"' "$HOOK_STDOUT"
+assert_eq "hammertime rule cache written" "yes" "$([ -f "$HT_HOME/rules.cache" ] && echo yes || echo no)"
+: > "$HAMMERTIME_DEBUG"
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"cache-2", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_eq "hammertime rule cache hit logged" "yes" "$(grep -qF 'RULES: cache hit' "$HAMMERTIME_DEBUG" && echo yes || echo no)"
+assert_contains "hammertime rule cache hit still blocks" '"decision": "block"' "$HOOK_STDOUT"
+jq '.[0].keywords = ["never matches"] | .[0].intent_patterns = []' "$HT_HOME/rules.json" > "$HT_HOME/rules.json.new"
+mv "$HT_HOME/rules.json.new" "$HT_HOME/rules.json"
+: > "$HAMMERTIME_DEBUG"
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"cache-3", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_eq "hammertime rule cache invalidated by edit" "yes" "$(grep -qF 'RULES: cache miss' "$HAMMERTIME_DEBUG" && echo yes || echo no)"
+assert_not_contains "hammertime edited rules take effect" '"decision": "block"' "$HOOK_STDOUT"
+
+# 7c) Telemetry: every run appends one structured record; the report
+# aggregates them. The last two runs above were a cache-hit block and a pass.
+tel="$HT_HOME/telemetry.jsonl"
+assert_eq "hammertime telemetry block record" "block" "$(tail -n 2 "$tel" | head -n 1 | jq -r '.decision')"
+assert_eq "hammertime telemetry pass record" "pass" "$(tail -n 1 "$tel" | jq -r '.decision')"
+assert_eq "hammertime telemetry stages recorded" "true" \
+  "$(tail -n 1 "$tel" | jq '.stages | has("stdin_parse") and has("rule_load") and has("scoring")')"
+# A pass with no transcript has no cursor to persist, so only the block
+# (which bumps rule_iterations) is guaranteed a state_save stage.
+assert_eq "hammertime telemetry state save recorded on block" "true" \
+  "$(tail -n 2 "$tel" | head -n 1 | jq '.stages | has("state_save")')"
+report=$(BOPEN_HAMMERTIME_HOME="$HT_HOME" python3 "$ROOT/../skills/hammertime/scripts/telemetry-report.py" --json)
+assert_eq "hammertime telemetry report counts runs" "$(wc -l < "$tel" | tr -d ' ')" "$(printf '%s' "$report" | jq '.runs')"
+assert_eq "hammertime telemetry report has scoring p95" "true" "$(printf '%s' "$report" | jq '.stages.scoring.p95_ms >= 0')"
+lines_before=$(wc -l < "$tel" | tr -d ' ')
+HAMMERTIME_TELEMETRY=0 run_ht "$input"
+assert_eq "hammertime telemetry can be disabled" "$lines_before" "$(wc -l < "$tel" | tr -d ' ')"
+
+# 7d) Daemon mode: the hook forwards to a warm daemon on daemon.sock, picks
+# up rules.json edits, and falls back in-process once the daemon is gone.
+cat > "$HT_HOME/rules.json" <<'JSON'
+[{"name": "daemon-ship-it", "rule": "Never say ship it without tests.", "keywords": ["ship it"], "confidence_threshold": 1}]
+JSON
+python3 "$ROOT/hammertime.py" --daemon 2>/dev/null &
+daemon_pid=$!
+for _ in $(seq 1 50); do [ -S "$HT_HOME/daemon.sock" ] && break; sleep 0.1; done
+assert_eq "hammertime daemon socket created" "yes" "$([ -S "$HT_HOME/daemon.sock" ] && echo yes || echo no)"
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"daemon-1", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_contains "hammertime daemon blocks" '"decision": "block"' "$HOOK_STDOUT"
+assert_eq "hammertime daemon run recorded" "true" "$(tail -n 1 "$tel" | jq '.daemon == true')"
+assert_eq "hammertime daemon shares session shards" "1" \
+  "$(jq -r '.rule_iterations["daemon-ship-it"]' "$HT_HOME/sessions/daemon-1.json")"
+input=$(jq -n --arg m "$CLEAN_MSG" --arg cwd "$HT_CWD" '{session_id:"daemon-1", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_not_contains "hammertime daemon passes clean message" '"decision": "block"' "$HOOK_STDOUT"
+jq '.[0].keywords = ["never matches"]' "$HT_HOME/rules.json" > "$HT_HOME/rules.json.new"
+mv "$HT_HOME/rules.json.new" "$HT_HOME/rules.json"
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"daemon-2", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_not_contains "hammertime daemon reloads edited rules" '"decision": "block"' "$HOOK_STDOUT"
+assert_eq "hammertime daemon reload run recorded" "true" "$(tail -n 1 "$tel" | jq '.daemon == true')"
+# A client that connects and never sends must not hold up other sessions
+# (the old parent-side read waited up to 5s on it before forking).
+python3 -c 'import socket, sys, time; s = socket.socket(socket.AF_UNIX); s.connect(sys.argv[1]); time.sleep(10)' \
+  "$HT_HOME/daemon.sock" &
+stall_pid=$!
+sleep 0.2
+input=$(jq -n --arg m "$CLEAN_MSG" --arg cwd "$HT_CWD" '{session_id:"daemon-4", last_assistant_message:$m, cwd:$cwd}')
+stall_started=$(date +%s%N)
+run_ht "$input"
+stall_ms=$(( ($(date +%s%N) - stall_started) / 1000000 ))
+assert_eq "hammertime daemon serves past a stalled client" "true" \
+  "$([ "$stall_ms" -lt 3000 ] && tail -n 1 "$tel" | jq '.daemon == true')"
+kill "$stall_pid" 2>/dev/null || true
+wait "$stall_pid" 2>/dev/null || true
+kill "$daemon_pid" 2>/dev/null || true
+wait "$daemon_pid" 2>/dev/null || true
+assert_eq "hammertime daemon removes socket on exit" "no" "$([ -e "$HT_HOME/daemon.sock" ] && echo yes || echo no)"
+# A stale socket left by a crashed daemon: the client falls back in-process
+python3 -c 'import socket, sys; socket.socket(socket.AF_UNIX).bind(sys.argv[1])' "$HT_HOME/daemon.sock"
+jq '.[0].keywords = ["ship it"]' "$HT_HOME/rules.json" > "$HT_HOME/rules.json.new"
+mv "$HT_HOME/rules.json.new" "$HT_HOME/rules.json"
+input=$(jq -n --arg m "$msg" --arg cwd "$HT_CWD" '{session_id:"daemon-3", last_assistant_message:$m, cwd:$cwd}')
+run_ht "$input"
+assert_contains "hammertime stale daemon socket falls back in-process" '"decision": "block"' "$HOOK_STDOUT"
+assert_eq "hammertime fallback run not from daemon" "false" "$(tail -n 1 "$tel" | jq '.daemon == true')"
+rm -f "$HT_HOME/daemon.sock"
+
 # 8) Pure per-project scoping predicate and malformed-scope warnings
 if python3 "$TESTS_DIR/test_hammertime_scope.py"; then
   PASS=$((PASS + 1))
@@ -240,7 +388,47 @@ else
   printf '  FAIL  hammertime cwd_prefix unit tests\n'
 fi
 
-# 9) Production scorer corpus, including quoted/documentation false positives
+# 9) Compiled single-pass matcher agrees with per-keyword/per-pattern scans
+if python3 "$TESTS_DIR/test_hammertime_matcher.py"; then
+  PASS=$((PASS + 1))
+  printf '  PASS  hammertime matcher unit tests\n'
+else
+  FAIL=$((FAIL + 1))
+  failures+=("hammertime matcher unit tests")
+  printf '  FAIL  hammertime matcher unit tests\n'
+fi
+
+# 10) Transcript scan shared by full-turn text and pending-agent counting
+if python3 "$TESTS_DIR/test_hammertime_transcript.py"; then
+  PASS=$((PASS + 1))
+  printf '  PASS  hammertime transcript unit tests\n'
+else
+  FAIL=$((FAIL + 1))
+  failures+=("hammertime transcript unit tests")
+  printf '  FAIL  hammertime transcript unit tests\n'
+fi
+
+# 10b) Phase 2 verifier: concurrency, shared deadline, verdict cache
+if python3 "$TESTS_DIR/test_hammertime_verifier.py"; then
+  PASS=$((PASS + 1))
+  printf '  PASS  hammertime verifier unit tests\n'
+else
+  FAIL=$((FAIL + 1))
+  failures+=("hammertime verifier unit tests")
+  printf '  FAIL  hammertime verifier unit tests\n'
+fi
+
+# 10c) check_git_state: one cached porcelain v2 probe per Stop
+if python3 "$TESTS_DIR/test_hammertime_git.py"; then
+  PASS=$((PASS + 1))
+  printf '  PASS  hammertime git probe unit tests\n'
+else
+  FAIL=$((FAIL + 1))
+  failures+=("hammertime git probe unit tests")
+  printf '  FAIL  hammertime git probe unit tests\n'
+fi
+
+# 11) Production scorer corpus, including quoted/documentation false positives
 if python3 "$ROOT/../skills/hammertime/evals/test_scorer.py"; then
   PASS=$((PASS + 1))
   printf '  PASS  hammertime scorer corpus\n'
@@ -250,5 +438,15 @@ else
   printf '  FAIL  hammertime scorer corpus\n'
 fi
 
+# 12) Startup profile: fast exits load no heavy modules; import-time ceiling
+if python3 "$TESTS_DIR/test_hammertime_startup.py"; then
+  PASS=$((PASS + 1))
+  printf '  PASS  hammertime startup profile\n'
+else
+  FAIL=$((FAIL + 1))
+  failures+=("hammertime startup profile")
+  printf '  FAIL  hammertime startup profile\n'
+fi
+
 rm -rf "$HT_HOME"
 unset BOPEN_HAMMERTIME_HOME HAMMERTIME_DEBUG
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Focused unit tests for HammerTime's cached git-cleanliness probe."""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+HOOK_PATH = Path(__file__).resolve().parents[1] / "hammertime.py"
+SPEC = importlib.util.spec_from_file_location("hammertime", HOOK_PATH)
+hammertime = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(hammertime)
+
+
+def git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class ParseStatusTests(unittest.TestCase):
+    def test_clean_and_pushed(self):
+        out = "# branch.oid abc\n# branch.head main\n# branch.upstream origin/main\n# branch.ab +0 -2\n"
+        self.assertTrue(hammertime.parse_git_status_v2(out))
+
+    def test_ahead_changed_untracked_or_no_upstream_is_not_clean(self):
+        head = "# branch.oid abc\n# branch.head main\n"
+        self.assertFalse(hammertime.parse_git_status_v2(head + "# branch.ab +1 -0\n"))
+        self.assertFalse(hammertime.parse_git_status_v2(head + "# branch.ab +0 -0\n1 .M N... 100644 100644 100644 a b f\n"))
+        self.assertFalse(hammertime.parse_git_status_v2(head + "# branch.ab +0 -0\n? new.txt\n"))
+        self.assertFalse(hammertime.parse_git_status_v2(head))
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class CheckGitCleanTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        env = {
+            "BOPEN_HAMMERTIME_HOME": str(root / "ht"),
+            "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com",
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        git(root, "init", "-q", "--bare", "-b", "main", "remote.git")
+        git(root, "clone", "-q", "remote.git", "work")
+        self.repo = root / "work"
+        git(self.repo, "checkout", "-q", "-b", "main")
+        (self.repo / "a.txt").write_text("a\n")
+        git(self.repo, "add", "a.txt")
+        git(self.repo, "commit", "-q", "-m", "init")
+        git(self.repo, "push", "-q", "-u", "origin", "main")
+        cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.addCleanup(os.chdir, cwd)
+        hammertime._git_clean_memo.clear()
+        self.addCleanup(hammertime._git_clean_memo.clear)
+
+    def check(self):
+        hammertime._git_clean_memo.clear()  # A fresh Stop event
+        return hammertime.check_git_clean()
+
+    def test_clean_pushed_repo(self):
+        self.assertTrue(self.check())
+
+    def test_dirty_untracked_and_unpushed_repos_are_not_clean(self):
+        (self.repo / "new.txt").write_text("x\n")
+        self.assertFalse(self.check())
+        git(self.repo, "add", "new.txt")
+        self.assertFalse(self.check())
+        git(self.repo, "commit", "-q", "-m", "more")
+        self.assertFalse(self.check())
+        git(self.repo, "push", "-q")
+        os.utime(self.repo / ".git" / "index")  # push alone touches no stamped file
+        self.assertTrue(self.check())
+
+    def test_one_probe_per_run_and_cached_across_runs(self):
+        real_run = subprocess.run
+        with mock.patch("subprocess.run", side_effect=real_run) as run:
+            self.assertTrue(hammertime.check_git_clean())
+            self.assertTrue(hammertime.check_git_clean())
+            self.assertEqual(1, run.call_count)
+            self.assertTrue(self.check())  # Next Stop: served from git-status.json
+            self.assertEqual(1, run.call_count)
+            (self.repo / "a.txt").write_text("b\n")
+            git(self.repo, "add", "a.txt")  # Staging changes the index stamp
+            run.reset_mock()
+            self.assertFalse(self.check())
+            self.assertEqual(1, run.call_count)
+
+    def test_cached_verdict_expires(self):
+        self.assertTrue(self.check())
+        with mock.patch.object(hammertime, "GIT_STATUS_CACHE_TTL", 0.0), \
+                mock.patch("subprocess.run", wraps=subprocess.run) as run:
+            self.assertTrue(self.check())
+            self.assertEqual(1, run.call_count)
+
+    def test_outside_a_repository_is_not_clean_without_running_git(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, outside)
+        os.chdir(outside)
+        with mock.patch("subprocess.run") as run:
+            if hammertime.find_git_dir(outside) is None:
+                self.assertFalse(self.check())
+                run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Focused unit tests for the HammerTime compiled rule matcher."""
+
+import importlib.util
+import os
+import random
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+HOOK_PATH = Path(__file__).resolve().parents[1] / "hammertime.py"
+SPEC = importlib.util.spec_from_file_location("hammertime", HOOK_PATH)
+hammertime = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(hammertime)
+
+
+def naive_score(text, rules):
+    """Reference scorer: per-keyword substring scan + per-pattern search."""
+    scored_text = hammertime.QUOTED_SPAN.sub("", text)
+    text_lower = scored_text.lower()
+    results = []
+    for rule in rules:
+        keywords = [kw for kw in rule.get("keywords", []) if kw in text_lower]
+        intents = [p.search(scored_text) for p in rule.get("intent_patterns", [])]
+        intents = [m.group(0) for m in intents if m]
+        results.append((rule["name"], keywords, intents))
+    return results
+
+
+def user_rule(name, keywords, patterns=()):
+    return hammertime.compile_user_rule({
+        "name": name,
+        "rule": "Test rule.",
+        "keywords": list(keywords),
+        "intent_patterns": list(patterns),
+    })
+
+
+class KeywordAutomatonTests(unittest.TestCase):
+    def test_reports_overlapping_and_nested_keywords(self):
+        automaton = hammertime.KeywordAutomaton(
+            ["pre-existing", "many pre-existing", "existing", "pre", "ting errors"]
+        )
+        found = automaton.find_all("there are many pre-existing errors")
+        self.assertEqual(
+            {"pre-existing", "many pre-existing", "existing", "pre", "ting errors"},
+            found,
+        )
+
+    def test_misses_are_empty(self):
+        automaton = hammertime.KeywordAutomaton(["ship it", "lgtm"])
+        self.assertEqual(set(), automaton.find_all("all tests pass"))
+
+    def test_regex_metacharacters_are_literal(self):
+        automaton = hammertime.KeywordAutomaton(["a.b", "(x)", "c++"])
+        self.assertEqual({"(x)", "c++"}, automaton.find_all("axb (x) c++"))
+
+    def test_empty_keyword_always_matches(self):
+        automaton = hammertime.KeywordAutomaton(["", "foo"])
+        self.assertEqual({""}, automaton.find_all("bar"))
+
+
+class SentenceIndexTests(unittest.TestCase):
+    PATTERNS = [
+        hammertime._PROJECT_OWNER_DISMISSAL,
+        hammertime._PROJECT_OWNER_QUALIFIERS,
+        re.compile(r"nothing\s+new", re.IGNORECASE),  # \s+ can cross a newline
+        re.compile(r"skip.*baseline", re.IGNORECASE),  # .* can cross a period
+        re.compile(r"^legacy|baseline$", re.IGNORECASE),  # anchors: per-sentence path
+        re.compile(r"(?<=\.)\s*skip"),  # lookbehind: per-sentence path
+        re.compile(r"x*"),  # matches empty: per-sentence path
+    ]
+    WORDS = ["nothing", "new", "skip", "baseline", "legacy", "scope", "unrelated",
+             "x", "ok", ".", "!", "?", "...", "\n", " "]
+
+    @staticmethod
+    def per_sentence(text, pattern):
+        return {i for i, sent in enumerate(hammertime.SENT_SPLIT.split(text)) if pattern.search(sent)}
+
+    def test_matches_per_sentence_search(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            text = " ".join(rng.choice(self.WORDS) for _ in range(rng.randint(0, 30)))
+            index = hammertime.SentenceIndex(text)
+            for pattern in self.PATTERNS:
+                self.assertEqual(self.per_sentence(text, pattern), index.ids(pattern), (text, pattern))
+
+    def test_co_occurrence_requires_the_same_sentence(self):
+        dismissal = re.compile(r"\bskip\b")
+        qualifier = re.compile(r"\bbaseline\b")
+        self.assertTrue(hammertime.SentenceIndex("ok. skip the baseline. ok").co_occur(dismissal, qualifier))
+        self.assertFalse(hammertime.SentenceIndex("skip it.\nbaseline").co_occur(dismissal, qualifier))
+        index = hammertime.SentenceIndex("baseline. skip. skip baseline")
+        index.ids(qualifier)  # Known qualifier set: answered by intersection
+        self.assertTrue(index.co_occur(dismissal, qualifier))
+
+
+class RuleMatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = list(hammertime.BUILTIN_RULES) + [
+            user_rule("ship", ["Ship It", "ship", "pre-existing"], [r"ship\s+it", r"not\s+from"]),
+            user_rule("done", ["all done", "shipped"], [r"\ball\s+done\b"]),
+        ]
+
+    def test_breakdown_matches_reference_scorer(self):
+        texts = [
+            "These are pre-existing errors, not from our changes. Ship it.",
+            "All done. Shipped and pushed. Many pre-existing warnings remain.",
+            "I fixed the race condition and all tests pass.",
+            "The 'pre-existing' label is quoted, so ship it anyway.",
+        ]
+        for text in texts:
+            expected = {
+                name: (kws, intents) for name, kws, intents in naive_score(text, self.rules)
+            }
+            for rule, score, breakdown in hammertime.score_message(text, self.rules):
+                kws, intents = expected[rule["name"]]
+                self.assertEqual(kws, breakdown["matched_keywords"], text)
+                self.assertEqual(intents, breakdown["matched_intents"], text)
+                self.assertEqual(len(kws), breakdown["kw"])
+                self.assertEqual(len(intents), breakdown["intent"])
+
+    def test_shared_patterns_are_compiled_once(self):
+        shared = [r"ship\s+it"]
+        rules = [user_rule("a", [], shared), user_rule("b", [], shared)]
+        matcher = hammertime.RuleMatcher(rules)
+        self.assertEqual(1, len(matcher.patterns))
+        self.assertEqual([0], matcher.rule_patterns[id(rules[1])])
+
+    def test_explicit_matcher_scores_rule_subsets(self):
+        matcher = hammertime.RuleMatcher(self.rules)
+        subset = self.rules[-1:]
+        results = hammertime.score_message("All done.", subset, matcher)
+        self.assertEqual(["done"], [rule["name"] for rule, _, _ in results])
+
+    def test_matcher_is_reused_for_the_same_rules(self):
+        self.assertIs(
+            hammertime.rule_matcher(self.rules), hammertime.rule_matcher(self.rules)
+        )
+
+
+
+class PrefilterTests(unittest.TestCase):
+    def test_required_literals_from_regex_structure(self):
+        literals = hammertime.pattern_literals
+        self.assertEqual({"ship"}, literals(r"\bship\s+it\b"))
+        self.assertEqual({"seem", "look", "appear"}, literals(r"(?:appear|seem|look)s?\s+to"))
+        self.assertEqual({"existing"}, literals(r"(?:many|few)\s+pre-?existing"))
+        self.assertEqual({"baseline"}, literals(r"(?:the\s+)?baseline"))  # Optional part dropped
+        self.assertEqual({"abcabc"}, literals(r"(?:abcabc)+x?"))
+        self.assertIsNone(literals(r"\d+\s+\w+"))
+        self.assertIsNone(literals(r"no|nothing"))  # A 2-char branch is too common
+        self.assertIsNone(literals(r"(?:fixed|)\s+\w+"))  # Empty branch: no requirement
+        self.assertEqual({"now"}, literals(r"(?:fixed|)\s+now"))
+        self.assertEqual({"caf"}, literals("caf\u00e9"))  # Non-ASCII ends the literal
+
+    def test_rule_without_usable_literals_is_always_scored(self):
+        rule = user_rule("digits", [], [r"\d+ errors", r"\w+\s+\w+"])
+        self.assertIsNone(hammertime.rule_prefilter(rule))
+        self.assertEqual([" errors"], hammertime.rule_prefilter(user_rule("e", [], [r"\d+ errors"])))
+
+    def test_prefiltered_scores_match_unfiltered(self):
+        rules = list(hammertime.BUILTIN_RULES) + [
+            user_rule("ship", ["ship it"], [r"ship\s+it", r"(?:won't|will not)\s+fix"]),
+            user_rule("scope", [], [r"out\s+of\s+scope", r"separate\s+(?:issue|task)"]),
+            user_rule("kelvin", [], [r"skip\s+it", r"\bnit\b"]),
+        ]
+        words = ["ship", "it", "will", "not", "fix", "won't", "out", "of", "scope", "separate",
+                 "issue", "pre-existing", "errors", "baseline", "unrelated", "skip", "nit",
+                 "SKIP", "\u017fkip", "n\u0131t", "N\u0130T", "ok", ".", "\n", "done"]
+        rng = random.Random(15)
+        with mock.patch.object(hammertime, "PREFILTER_MIN_CHARS", 0):
+            for _ in range(500):
+                text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+                filtered = hammertime.score_message(text, rules, hammertime.RuleMatcher(rules))
+                plain = hammertime.score_message(text, rules, hammertime.RuleMatcher(rules, prefilter=False))
+                self.assertEqual(
+                    [(r["name"], score, b) for r, score, b in plain],
+                    [(r["name"], score, b) for r, score, b in filtered], text,
+                )
+
+    def test_skipped_rules_run_no_regex_and_are_logged(self):
+        searched = []
+
+        class Spy:
+            def __init__(self, source):
+                self.compiled = re.compile(source, re.IGNORECASE)
+                self.pattern, self.flags = self.compiled.pattern, self.compiled.flags
+
+            def search(self, text):
+                searched.append(self.pattern)
+                return self.compiled.search(text)
+
+        rule = {"name": "spy", "rule": "x", "keywords": [], "intent_patterns": [Spy(r"ship\s+it")]}
+        rule["_prefilter"] = ["ship"]
+        fd, log = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, log)
+        with mock.patch.dict(os.environ, {"HAMMERTIME_DEBUG": log}):
+            self.assertEqual([], hammertime.score_message("All tests pass.", [rule], hammertime.RuleMatcher([rule])))
+            self.assertEqual([], searched)
+            self.assertEqual(1, len(hammertime.score_message("Ship it.", [rule], hammertime.RuleMatcher([rule]))))
+            self.assertEqual([r"ship\s+it"], searched)
+        with open(log) as f:
+            lines = [line for line in f if "PREFILTER:" in line]
+        self.assertIn("skipped 1/1 rules", lines[0])
+        self.assertIn("skipped 0/1 rules", lines[1])
+
+    def test_cached_user_rules_carry_their_prefilter(self):
+        with tempfile.TemporaryDirectory() as home, \
+                mock.patch.dict(os.environ, {"BOPEN_HAMMERTIME_HOME": home}):
+            Path(home, "rules.json").write_text(
+                '[{"name": "u", "rule": "x", "keywords": ["k"], "intent_patterns": ["never\\\\s+again"]}]'
+            )
+            for _ in range(2):  # Cache miss, then cache hit
+                rules, _ = hammertime.load_rule_set()
+                user = next(r for r in rules if r["name"] == "u")
+                self.assertEqual(["never"], user["_prefilter"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Startup profile for the HammerTime hook: which modules each fast exit
+imports, and how long the hook's own imports take (via -X importtime)."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+HOOK_PATH = Path(__file__).resolve().parents[1] / "hammertime.py"
+
+# Needed only on the verifier, git-check, alert-sound, timer and transcript
+# paths; none of the fast exits may load them.
+HEAVY_MODULES = (
+    "subprocess", "threading", "urllib.request", "http.client", "ssl", "socket",
+    "datetime", "orjson", "msgspec",
+)
+
+# Best-of-three ceiling, in ms, on the hook's own top-level imports. Wall
+# clock on a shared runner is too noisy to gate on, so the check runs only
+# when a ceiling is given explicitly (e.g. HAMMERTIME_IMPORT_CEILING_MS=35).
+IMPORT_CEILING_MS = os.environ.get("HAMMERTIME_IMPORT_CEILING_MS")
+
+
+def parse_importtime(stderr):
+    """Return [(module, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(cumulative), depth))
+    return rows
+
+
+class StartupProfileTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.home = Path(tmp.name) / "home"
+        self.cwd = Path(tmp.name) / "project"
+        self.home.mkdir()
+        self.cwd.mkdir()
+        self.env = {
+            "PATH": os.environ.get("PATH", ""),
+            "HOME": tmp.name,
+            "BOPEN_HAMMERTIME_HOME": str(self.home),
+            "CLAUDE_PROJECT_DIR": str(self.cwd),
+            "HAMMERTIME_DAEMON": "0",
+        }
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "pass"],
+            capture_output=True, text=True, env=self.env,
+        )
+        self.interpreter_modules = {name for name, _, _ in parse_importtime(result.stderr)}
+
+    def run_hook(self, hook_input):
+        """Run the hook once; return (decision from telemetry, import rows)."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", str(HOOK_PATH)],
+            input=json.dumps(hook_input), capture_output=True, text=True,
+            env=self.env, cwd=self.cwd,
+        )
+        self.assertEqual(0, result.returncode, result.stderr[-2000:])
+        records = (self.home / "telemetry.jsonl").read_text().splitlines()
+        return json.loads(records[-1])["decision"], parse_importtime(result.stderr)
+
+    def assert_fast_exit(self, hook_input, decision):
+        got, rows = self.run_hook(hook_input)
+        self.assertEqual(decision, got)
+        loaded = {name for name, _, _ in rows}
+        self.assertEqual([], [m for m in HEAVY_MODULES if m in loaded], f"{decision} exit")
+
+    def test_disabled_sentinel_exit(self):
+        (self.home / "disabled").touch()
+        self.assert_fast_exit({"session_id": "s", "last_assistant_message": "Done."}, "disabled")
+
+    def test_empty_message_exit(self):
+        self.assert_fast_exit({"session_id": "s", "cwd": str(self.cwd)}, "no-message")
+
+    def test_no_rules_exit(self):
+        (self.home / "rules.json").write_text(json.dumps([{"name": "project-owner", "enabled": False}]))
+        self.assert_fast_exit({"session_id": "s", "last_assistant_message": "Done."}, "no-rules")
+
+    def test_no_match_exit(self):
+        self.assert_fast_exit({"session_id": "s", "last_assistant_message": "Done, tests pass."}, "pass")
+
+    @unittest.skipUnless(IMPORT_CEILING_MS, "set HAMMERTIME_IMPORT_CEILING_MS to check import time")
+    def test_hook_import_time_under_ceiling(self):
+        totals = []
+        for _ in range(3):
+            _, rows = self.run_hook({"session_id": "s", "last_assistant_message": "Done, tests pass."})
+            own = [(name, us) for name, us, depth in rows
+                   if depth == 0 and name not in self.interpreter_modules]
+            totals.append((sum(us for _, us in own) / 1000, own))
+        best_ms, own = min(totals, key=lambda t: t[0])
+        top = ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in sorted(own, key=lambda r: -r[1])[:8])
+        self.assertLessEqual(best_ms, float(IMPORT_CEILING_MS), f"hook imports took {best_ms:.1f}ms: {top}")
+
+
+if __name__ == "__main__":
+    unittest.main()
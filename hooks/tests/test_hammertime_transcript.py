@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Focused unit tests for HammerTime transcript scanning and cursors."""
+
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+HOOK_PATH = Path(__file__).resolve().parents[1] / "hammertime.py"
+SPEC = importlib.util.spec_from_file_location("hammertime", HOOK_PATH)
+hammertime = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(hammertime)
+
+
+def user(text):
+    return {"type": "user", "message": {"role": "user", "content": text}}
+
+
+def assistant(text):
+    return {"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}}
+
+
+def dispatch(agent_id):
+    return {"type": "assistant", "message": {"role": "assistant", "content": [
+        {"type": "tool_use", "id": agent_id, "name": "Agent", "input": {"run_in_background": True}},
+    ]}}
+
+
+def notification(agent_id):
+    return user(f"<task-notification><tool-use-id>{agent_id}</tool-use-id></task-notification>")
+
+
+class ReverseLineIteratorTests(unittest.TestCase):
+    def test_matches_forward_split_at_every_chunk_size(self):
+        data = b'{"a": 1}\n\nsecond line\nx\n{"long": "' + b"z" * 300 + b'"}\npartial'
+        expected = []
+        pos = 0
+        for line in data.split(b"\n"):
+            expected.append((pos, line))
+            pos += len(line) + 1
+        expected = [item for item in reversed(expected)]
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            for chunk_size in (1, 2, 7, 64, 4096):
+                got = list(hammertime.iter_lines_reverse(f, len(data), chunk_size))
+                self.assertEqual([e for e in expected if e[1]], [g for g in got if g[1]], chunk_size)
+
+
+class DecodeLineTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(setattr, hammertime, "_json_loads", hammertime._json_loads)
+
+    def test_every_decoder_agrees_with_stdlib(self):
+        lines = [json.dumps(entry).encode() for entry in (
+            user("go"), assistant("caf\u00e9 done"), dispatch("a1"), notification("a1"),
+            {"type": "response_item", "payload": {"role": "assistant", "content": "x"}},
+            {"type": "event_msg", "payload": {"type": "user_message", "message": "hi"}},
+        )]
+        lines += [b"", b"   ", b'{"type": "user", "mess', b'["user"]', b'{"type": "user", "bad": "\xff"}',
+                  '{"type": "user", "message": {"content": "\xff"}}'.encode("latin-1")]
+        hammertime._json_loads = hammertime.select_json_decoder("json")[1]
+        expected = [hammertime._decode_line(line) for line in lines]
+        self.assertEqual(hammertime._decode_line(lines[-1])["message"]["content"], "\ufffd")
+        for name in ("orjson", "msgspec"):
+            hammertime._json_loads = hammertime.select_json_decoder(name)[1]
+            self.assertEqual(expected, [hammertime._decode_line(line) for line in lines], name)
+
+    def test_lines_without_markers_are_not_decoded(self):
+        calls = []
+        hammertime._json_loads = lambda raw: calls.append(raw) or json.loads(raw)
+        progress = json.dumps({"type": "progress", "data": {"step": 1}}).encode()
+        self.assertIsNone(hammertime._decode_line(progress))
+        self.assertEqual([], calls)
+        self.assertIsNotNone(hammertime._decode_line(json.dumps(user("hi")).encode()))
+        self.assertEqual(1, len(calls))
+
+    def test_unavailable_decoder_falls_back_to_stdlib(self):
+        if hammertime._native_decoder("msgspec.json") is None:
+            self.assertEqual("json", hammertime.select_json_decoder("msgspec")[0])
+        self.assertEqual("json", hammertime.select_json_decoder("json")[0])
+
+
+class TranscriptScanTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def append(self, *entries):
+        with open(self.path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+    def test_cold_scan_collects_turn_and_pending_agents(self):
+        self.append(user("go"), dispatch("a1"), dispatch("a2"), notification("a1"),
+                    assistant("first"), assistant("second"))
+        scan = hammertime.TranscriptScan(self.path)
+        self.assertEqual("first\n\nsecond", scan.turn_text)
+        self.assertEqual(1, scan.pending_agents)
+        self.assertEqual(os.path.getsize(self.path), scan.cursor["offset"])
+
+    def test_resumed_scan_matches_cold_scan(self):
+        self.append(user("go"), dispatch("a1"), assistant("working"))
+        cursor = hammertime.TranscriptScan(self.path).cursor
+        self.append(assistant("still working"), notification("a1"), dispatch("a2"),
+                    assistant("done"))
+        resumed = hammertime.TranscriptScan(self.path, cursor)
+        cold = hammertime.TranscriptScan(self.path)
+        self.assertEqual(cold.turn_text, resumed.turn_text)
+        self.assertEqual(cold.pending_agents, resumed.pending_agents)
+        self.assertEqual(1, resumed.pending_agents)
+
+    def test_resumed_scan_reads_only_the_current_turn(self):
+        self.append(user("old turn"), assistant("x" * 5000), user("new turn"))
+        cursor = hammertime.TranscriptScan(self.path).cursor
+        turn_start = os.path.getsize(self.path)
+        self.assertEqual(turn_start, cursor["turn_offset"])
+        self.append(assistant("only this"))
+        scan = hammertime.TranscriptScan(self.path, cursor)
+        self.assertEqual("only this", scan.turn_text)
+        self.assertEqual(turn_start, scan.cursor["turn_offset"])
+
+    def test_agent_sets_survive_across_turns(self):
+        self.append(user("go"), dispatch("a1"))
+        cursor = hammertime.TranscriptScan(self.path).cursor
+        self.assertEqual(["a1"], list(cursor["dispatched"]))
+        self.append(user("next"), assistant("waiting"))
+        cursor = hammertime.TranscriptScan(self.path, cursor).cursor
+        self.append(notification("a1"), assistant("all back"))
+        scan = hammertime.TranscriptScan(self.path, cursor)
+        self.assertEqual(0, scan.pending_agents)
+        self.assertEqual({}, scan.cursor["dispatched"])
+
+    def test_agent_that_never_completes_ages_out(self):
+        self.append(user("go"), dispatch("lost"), notification("never-dispatched"), assistant("waiting"))
+        cursor = hammertime.TranscriptScan(self.path).cursor
+        self.assertEqual(["lost"], list(cursor["dispatched"]))
+        with mock.patch.object(hammertime, "AGENT_SCAN_WINDOW", 4096):
+            # Still inside the window, even from a later turn
+            self.append(user("next"), assistant("short"))
+            cursor = hammertime.TranscriptScan(self.path, cursor).cursor
+            self.assertEqual(["lost"], list(cursor["dispatched"]))
+            self.append(assistant("z" * 5000), user("later"), assistant("done"))
+            resumed = hammertime.TranscriptScan(self.path, cursor)
+            cold = hammertime.TranscriptScan(self.path)
+        self.assertEqual(cold.pending_agents, resumed.pending_agents)
+        self.assertEqual(0, resumed.pending_agents)
+        self.assertEqual({}, resumed.cursor["dispatched"])
+        self.assertEqual({}, resumed.cursor["completed"])
+
+    def test_pending_agent_in_current_turn_outlives_the_window(self):
+        with mock.patch.object(hammertime, "AGENT_SCAN_WINDOW", 4096):
+            self.append(user("go"), dispatch("a1"))
+            cursor = hammertime.TranscriptScan(self.path).cursor
+            self.append(assistant("z" * 5000))
+            resumed = hammertime.TranscriptScan(self.path, cursor)
+            cold = hammertime.TranscriptScan(self.path)
+        self.assertEqual(1, cold.pending_agents)
+        self.assertEqual(1, resumed.pending_agents)
+
+    def test_cursor_with_agent_lists_rescans_cold(self):
+        self.append(user("go"), dispatch("a1"), assistant("working"))
+        cursor = dict(hammertime.TranscriptScan(self.path).cursor, dispatched=["a1"], completed=[])
+        scan = hammertime.TranscriptScan(self.path, cursor)
+        self.assertEqual(1, scan.pending_agents)
+        self.assertEqual(["a1"], list(scan.cursor["dispatched"]))
+
+    def test_truncated_file_discards_cursor(self):
+        self.append(user("go"), assistant("a" * 1000), dispatch("a1"))
+        cursor = hammertime.TranscriptScan(self.path).cursor
+        with open(self.path, "w") as f:
+            f.write(json.dumps(user("fresh")) + "\n" + json.dumps(assistant("new")) + "\n")
+        scan = hammertime.TranscriptScan(self.path, cursor)
+        self.assertEqual("new", scan.turn_text)
+        self.assertEqual(0, scan.pending_agents)
+
+    def test_partial_trailing_line_is_not_consumed(self):
+        self.append(user("go"), assistant("done"))
+        complete = os.path.getsize(self.path)
+        with open(self.path, "a") as f:
+            f.write('{"type": "assistant", "mess')
+        scan = hammertime.TranscriptScan(self.path)
+        self.assertEqual("done", scan.turn_text)
+        self.assertEqual(complete, scan.cursor["offset"])
+
+    def test_turn_larger_than_agent_window_is_not_truncated(self):
+        block = "y" * (1024 * 1024)
+        self.append(user("old"), assistant("before the turn"), user("go"),
+                    assistant("start " + block), assistant(block), assistant(block + " end"))
+        self.assertGreater(os.path.getsize(self.path), hammertime.AGENT_SCAN_WINDOW)
+        scan = hammertime.TranscriptScan(self.path)
+        self.assertTrue(scan.turn_text.startswith("start "))
+        self.assertTrue(scan.turn_text.endswith(" end"))
+        self.assertNotIn("before the turn", scan.turn_text)
+        self.assertEqual(3, scan.turn_blocks)
+
+    def test_unreadable_transcript_falls_back(self):
+        scan = hammertime.TranscriptScan(self.path + ".missing")
+        self.assertIsNone(scan.turn_text)
+        self.assertIsNone(scan.cursor)
+        self.assertIsNone(hammertime.collect_turn_messages(self.path + ".missing", scan))
+
+
+if __name__ == "__main__":
+    unittest.main()
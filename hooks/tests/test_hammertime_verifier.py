@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Focused unit tests for the HammerTime Phase 2 verifier against a stand-in server."""
+
+import http.server
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+HOOK_PATH = Path(__file__).resolve().parents[1] / "hammertime.py"
+SPEC = importlib.util.spec_from_file_location("hammertime", HOOK_PATH)
+hammertime = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(hammertime)
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Answers 'yes' when the prompt's RULE line contains 'violate'.
+
+    A RULE containing 'slow' sleeps server.delay seconds first; a RULE
+    containing 'broken' gets an HTTP 500.
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][0]["content"]
+        rule_line = prompt.split("RULE: ", 1)[1].split("\n", 1)[0]
+        self.server.requests.append(rule_line)
+        if "slow" in rule_line:
+            time.sleep(self.server.delay)
+            if self.server.delay > 1:
+                return  # The client gave up long ago; nothing to answer
+        if "broken" in rule_line:
+            self.send_error(500)
+            return
+        answer = "yes" if "violate" in rule_line else "no"
+        payload = json.dumps({"content": [{"type": "text", "text": answer}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def rule(name, text):
+    return {"name": name, "rule": text}
+
+
+class VerifierTests(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        self.server.delay = 0.3
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.home = tempfile.TemporaryDirectory()
+        self.addCleanup(self.home.cleanup)
+        self.debug_log = os.path.join(self.home.name, "debug.log")
+        env = {
+            "BOPEN_HAMMERTIME_HOME": self.home.name,
+            "HAMMERTIME_VERIFIER_URL": f"http://127.0.0.1:{self.server.server_address[1]}/v1/messages",
+            "HAMMERTIME_DEBUG": self.debug_log,
+            "ANTHROPIC_API_KEY": "test-key",
+        }
+        saved = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        self.addCleanup(self.restore_env, saved)
+
+    @staticmethod
+    def restore_env(saved):
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def read_log(self):
+        with open(self.debug_log) as f:
+            return f.read()
+
+    def test_verdicts_follow_the_server_in_order(self):
+        candidates = [(rule("a", "violate a"), "text"), (rule("b", "fine b"), "text")]
+        self.assertEqual([True, False], hammertime.phase2_verify_rules(candidates))
+
+    def test_calls_run_concurrently(self):
+        candidates = [(rule(f"r{i}", f"slow violate {i}"), "text") for i in range(4)]
+        started = time.monotonic()
+        verdicts = hammertime.phase2_verify_rules(candidates, deadline=5)
+        elapsed = time.monotonic() - started
+        self.assertEqual([True] * 4, verdicts)
+        self.assertLess(elapsed, 4 * self.server.delay)
+
+    def test_deadline_fails_open(self):
+        self.server.delay = 1.5
+        candidates = [(rule("slow", "slow violate"), "text"), (rule("fast", "violate"), "text")]
+        started = time.monotonic()
+        verdicts = hammertime.phase2_verify_rules(candidates, deadline=0.5)
+        elapsed = time.monotonic() - started
+        self.assertEqual([False, True], verdicts)
+        self.assertGreaterEqual(elapsed, 0.5)
+        self.assertLess(elapsed, 1.5)
+
+    def test_verdict_cache_skips_repeat_calls(self):
+        candidates = [(rule("a", "violate a"), "same text"), (rule("b", "fine b"), "same text")]
+        first = hammertime.phase2_verify_rules(candidates)
+        self.assertEqual(2, len(self.server.requests))
+        self.assertEqual(first, hammertime.phase2_verify_rules(candidates))
+        self.assertEqual(2, len(self.server.requests))
+        self.assertIn("verdict cache hit", self.read_log())
+
+        # Any change to the rule text or the verified text misses the cache
+        hammertime.phase2_verify_rules([(rule("a", "violate a!"), "same text")])
+        hammertime.phase2_verify_rules([(rule("a", "violate a"), "other text")])
+        self.assertEqual(4, len(self.server.requests))
+
+    def test_errors_fail_open_and_are_not_cached(self):
+        candidates = [(rule("x", "broken violate"), "text")]
+        self.assertEqual([False], hammertime.phase2_verify_rules(candidates))
+        self.assertEqual([False], hammertime.phase2_verify_rules(candidates))
+        self.assertEqual(2, len(self.server.requests))
+
+    def test_latency_is_logged_per_call(self):
+        hammertime.phase2_verify_rules([(rule("a", "violate a"), "text")])
+        self.assertRegex(self.read_log(), r"PHASE2: rule 'a' Haiku answer='yes' violated=True in \d+ms")
+
+    def test_missing_api_key_fails_closed(self):
+        del os.environ["ANTHROPIC_API_KEY"]
+        self.assertEqual([True, True], hammertime.phase2_verify_rules(
+            [(rule("a", "fine"), "t"), (rule("b", "fine"), "t")]
+        ))
+        self.assertEqual([], self.server.requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
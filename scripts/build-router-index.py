@@ -7,6 +7,14 @@ each plugin, and extracts a routing entry per skills/*/SKILL.md and
 agents/*.md: {kind, id, triggers, hint}. Triggers are the quoted phrases
 found in the frontmatter `description` plus significant keywords (stopwords
 dropped). id is "<plugin>:<name>" using the frontmatter `name` field.
+A `lookup` block inverts the triggers (word -> entries, phrase first token
+-> phrases -> entries) so the routing hooks score only entries that share a
+token with the prompt.
+
+Alongside the JSON it writes router-index.marshal: just what the hooks read
+(entries without triggers, plus the lookup) as a marshal payload behind a
+one-line header. The hooks load it instead of the JSON while it is at least
+as new.
 
 stdlib only, no third-party YAML — frontmatter is parsed with a minimal
 hand-rolled reader that handles plain scalars and block scalars (|, |-, >,
@@ -23,9 +31,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import marshal
 import os
 import re
 import sys
+import zlib
 from datetime import datetime, timezone
 
 # Common English stopwords plus corpus-specific boilerplate that appears in
@@ -53,6 +63,7 @@ QUOTE_RE = re.compile(r'"([^"\n]{3,80})"')
 TAG_RE = re.compile(r"<[^>]+>")
 URL_RE = re.compile(r"https?://\S+")
 WORD_RE = re.compile(r"[A-Za-z][A-Za-z'-]{2,}")
+PHRASE_KEY_RE = re.compile(r"[a-z0-9]+")
 BLOCK_SCALAR_MARKS = {"|", "|-", "|+", ">", ">-", ">+"}
 MAX_TRIGGERS_PER_ENTRY = 40
 
@@ -276,6 +287,41 @@ def collect_entries(plugin_name: str, plugin_path: str) -> list[dict]:
     return entries
 
 
+def phrase_key(phrase: str) -> str:
+    """Table key for a multi-word trigger: its leading [a-z0-9] run.
+
+    The hooks match a phrase only where it is not glued to a letter or
+    digit on either side, so a hit always puts this run in the prompt as a
+    whole alphanumeric token. Phrases that open with punctuation key on ""
+    and are checked for every prompt."""
+    m = PHRASE_KEY_RE.match(phrase)
+    return m.group() if m else ""
+
+
+def build_lookup(entries: list[dict]) -> dict:
+    """Inverted index over entry triggers, so the hooks score only entries
+    that share a token with the prompt instead of every trigger of every
+    entry.
+
+    words:   single-word trigger -> positions in `entries`
+    phrases: phrase_key -> {multi-word trigger -> positions in `entries`}
+
+    A position repeats once per matching trigger, mirroring the per-trigger
+    scoring the lookup replaces."""
+    words: dict[str, list[int]] = {}
+    phrases: dict[str, dict[str, list[int]]] = {}
+    for position, entry in enumerate(entries):
+        for trigger in entry.get("triggers") or []:
+            t = (trigger or "").strip().lower()
+            if not t:
+                continue
+            if " " in t:
+                phrases.setdefault(phrase_key(t), {}).setdefault(t, []).append(position)
+            else:
+                words.setdefault(t, []).append(position)
+    return {"words": words, "phrases": phrases}
+
+
 def build_index(cache_root: str) -> dict:
     plugins = find_latest_version_dirs(cache_root)
     entries: list[dict] = []
@@ -288,9 +334,41 @@ def build_index(cache_root: str) -> dict:
         "source_cache_root": cache_root,
         "entry_count": len(entries),
         "entries": entries,
+        "lookup": build_lookup(entries),
     }
 
 
+# Artifact header: magic, format version, the Python that wrote the marshal
+# payload (marshal is only stable within one minor version), CRC-32 of the
+# payload in hex, payload length. Any mismatch sends the hooks back to JSON.
+ARTIFACT_MAGIC = "BOPEN-ROUTER-INDEX"
+ARTIFACT_VERSION = 1
+
+
+def artifact_path(output: str) -> str:
+    return os.path.splitext(output)[0] + ".marshal"
+
+
+def write_artifact(index: dict, path: str) -> None:
+    payload = marshal.dumps(
+        {
+            "entries": [
+                {"kind": e["kind"], "id": e["id"], "hint": e["hint"]} for e in index["entries"]
+            ],
+            "lookup": index["lookup"],
+        }
+    )
+    header = (
+        f"{ARTIFACT_MAGIC} {ARTIFACT_VERSION} py{sys.version_info[0]}.{sys.version_info[1]} "
+        f"{zlib.crc32(payload):08x} {len(payload)}\n"
+    )
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header.encode("ascii"))
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -316,6 +394,8 @@ def main() -> int:
         json.dump(index, f, ensure_ascii=False, indent=2, sort_keys=True)
         f.write("\n")
     os.replace(tmp_path, args.output)
+    # Written second, so a complete artifact is never older than its JSON.
+    write_artifact(index, artifact_path(args.output))
 
     print(f"Wrote {index['entry_count']} entries to {args.output}", file=sys.stderr)
     return 0
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""HammerTime latency benchmark with a p95 regression gate.
+
+The Stop hook runs synchronously on every assistant stop, so its latency is
+user-visible. This harness generates synthetic Claude and Codex transcripts
+(10 KB, 1 MB, 10 MB by default) plus a configurable number of synthetic user
+rules, then times each stage in-process:
+
+    rule_load        load_rule_set() + RuleMatcher compile
+    transcript_read  cold TranscriptScan of the whole transcript
+    scoring          score_message() over the full turn
+    state_save       save_state() with the new transcript cursor
+
+and the whole hook end to end (a fresh `python3 hooks/hammertime.py` per run,
+state cleared first so every run is a cold scan). The synthetic text is
+neutral, so no rule fires and the verifier is never called: this measures
+the common no-violation path.
+
+Results are written as JSON (default: latency.json next to this script).
+With a stored baseline (latency-baseline.json) the run fails when any
+case's end-to-end p95 exceeds baseline * (1 + tolerance) + slack. Baselines
+are machine-specific; refresh with --update-baseline after an intended
+change.
+
+Usage:
+    python3 skills/hammertime/evals/bench_latency.py
+    python3 skills/hammertime/evals/bench_latency.py --sizes 10KB,1MB --rules 0,25 --runs 5
+    python3 skills/hammertime/evals/bench_latency.py --update-baseline
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+EVALS_DIR = os.path.dirname(os.path.abspath(__file__))
+HOOK_PATH = os.path.join(EVALS_DIR, "..", "..", "..", "hooks", "hammertime.py")
+DEFAULT_OUTPUT = os.path.join(EVALS_DIR, "latency.json")
+DEFAULT_BASELINE = os.path.join(EVALS_DIR, "latency-baseline.json")
+STAGES = ("rule_load", "transcript_read", "scoring", "state_save", "end_to_end")
+
+# Neutral engineering prose: none of these words (or their neighbours) hit a
+# built-in rule, so every run takes the score-0 path.
+VOCAB = (
+    "the module reads config values from disk and caches parsed entries "
+    "before the request handler renders a response with updated metrics "
+    "while a worker thread drains the queue and writes batches into storage "
+    "each batch carries a sequence number plus checksum so readers can "
+    "verify ordering during replay after restart of service process"
+).split()
+RULE_VOCAB = (
+    "ship deploy rollback migrate refactor benchmark profile optimise "
+    "vendor bundle release publish archive rotate compact vacuum"
+).split()
+
+
+def parse_size(text):
+    text = text.strip().upper()
+    for suffix, scale in (("MB", 1024 * 1024), ("KB", 1024), ("B", 1)):
+        if text.endswith(suffix):
+            return int(float(text[: -len(suffix)]) * scale)
+    return int(text)
+
+
+def size_label(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):g}MB"
+    return f"{size / 1024:g}KB"
+
+
+def sentence(rng, words=16):
+    return " ".join(rng.choice(VOCAB) for _ in range(words)).capitalize() + "."
+
+
+def paragraph(rng, chars):
+    out, total = [], 0
+    while total < chars:
+        s = sentence(rng)
+        out.append(s)
+        total += len(s) + 1
+    return " ".join(out)
+
+
+def claude_entries(rng, kind, text, index):
+    base = {"uuid": f"u-{index}", "timestamp": f"2026-01-01T00:00:{index % 60:02d}Z", "sessionId": "bench"}
+    if kind == "user":
+        return {**base, "type": "user", "message": {"role": "user", "content": text}}
+    if kind == "assistant":
+        return {**base, "type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}}
+    if kind == "tool_use":
+        return {**base, "type": "assistant", "message": {"role": "assistant", "content": [
+            {"type": "tool_use", "id": f"toolu_{index}", "name": "Read", "input": {"file_path": f"/src/m{index}.py"}},
+        ]}}
+    if kind == "tool_result":
+        return {**base, "type": "user", "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": f"toolu_{index - 1}", "content": text},
+        ]}}
+    return {**base, "type": "progress", "data": {"step": index}}
+
+
+def codex_entries(rng, kind, text, index):
+    if kind == "user":
+        return {"type": "event_msg", "payload": {"type": "user_message", "message": text}}
+    if kind == "assistant":
+        return {"type": "response_item", "payload": {"type": "message", "role": "assistant",
+                                                     "content": [{"type": "output_text", "text": text}]}}
+    if kind == "tool_use":
+        return {"type": "response_item", "payload": {"type": "function_call", "name": "shell",
+                                                     "arguments": json.dumps({"command": ["cat", f"m{index}.py"]})}}
+    if kind == "tool_result":
+        return {"type": "response_item", "payload": {"type": "function_call_output", "output": text}}
+    return {"type": "turn_context", "payload": {"cwd": "/src"}}
+
+
+def write_transcript(path, fmt, size, seed=0):
+    """Write a synthetic transcript of about size bytes.
+
+    The last ~20% is the current turn: one user prompt followed by assistant
+    text blocks, which is what the hook scores. The rest is history made of
+    prompts, tool calls, bulky tool output, and bookkeeping lines.
+    """
+    rng = random.Random(seed)
+    make = claude_entries if fmt == "claude" else codex_entries
+    turn_bytes = max(size // 5, 512)
+    written = 0
+    index = 0
+    with open(path, "w") as f:
+        def emit(kind, text=""):
+            nonlocal written, index
+            line = json.dumps(make(rng, kind, text, index)) + "\n"
+            f.write(line)
+            written += len(line)
+            index += 1
+
+        while written < size - turn_bytes:
+            emit("user", sentence(rng))
+            for _ in range(rng.randint(1, 3)):
+                emit("tool_use")
+                emit("tool_result", paragraph(rng, rng.randint(200, 4000)))
+                emit("progress")
+            emit("assistant", paragraph(rng, rng.randint(100, 800)))
+        emit("user", sentence(rng))
+        while written < size:
+            emit("assistant", paragraph(rng, min(2000, max(100, size - written))))
+    return written
+
+
+def synthetic_rules(count, seed=0):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        words = rng.sample(RULE_VOCAB, 3)
+        rules.append({
+            "name": f"bench-rule-{i}",
+            "rule": f"Synthetic benchmark rule {i}: never {words[0]} without {words[1]}.",
+            "enabled": True,
+            "evaluate_full_turn": i % 2 == 0,
+            "keywords": [f"{w} {words[(j + 1) % 3]}" for j, w in enumerate(words)] + [f"{words[0]}-{i}"],
+            "intent_patterns": [
+                rf"(?:will|going\s+to)\s+{words[0]}\s+\w+\s+without\s+{words[1]}",
+                rf"\b{words[2]}\w*\s+(?:later|tomorrow|eventually)\b",
+            ],
+            "dismissal_verbs": rf"\bskip(?:ped)?\s+{words[1]}",
+            "qualifiers": rf"\b{words[2]}\b",
+        })
+    return rules
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples):
+    return {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "max_ms": round(max(samples), 3) if samples else 0.0,
+    }
+
+
+def load_hook():
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location("hammertime", HOOK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_case(fmt, size, rule_count, runs, workdir):
+    """Time every stage for one (format, size, rules) case; returns a result dict."""
+    home = os.path.join(workdir, f"home-{fmt}-{size}-{rule_count}")
+    os.makedirs(home, exist_ok=True)
+    with open(os.path.join(home, "rules.json"), "w") as f:
+        json.dump(synthetic_rules(rule_count), f, indent=2)
+    transcript = os.path.join(workdir, f"{fmt}-{size}.jsonl")
+    if not os.path.exists(transcript):
+        write_transcript(transcript, fmt, size)
+    actual_size = os.path.getsize(transcript)
+
+    env = dict(os.environ, BOPEN_HAMMERTIME_HOME=home)
+    for key in ("HAMMERTIME_DEBUG", "ANTHROPIC_API_KEY", "CLAUDE_PROJECT_DIR"):
+        env.pop(key, None)
+    saved_env = dict(os.environ)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        hook = load_hook()
+        timings = {stage: [] for stage in STAGES}
+        scored = 0
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            rules, automaton = hook.load_rule_set()
+            content_rules = [r for r in rules if not r.get("deadline")]
+            matcher = hook.RuleMatcher(content_rules, automaton)
+            t1 = time.perf_counter()
+            scan = hook.TranscriptScan(transcript)
+            t2 = time.perf_counter()
+            scored = len(hook.score_message(scan.turn_text or "", content_rules, matcher))
+            t3 = time.perf_counter()
+            hook.save_state({"session_id": "bench", "rule_iterations": {}, "transcript_cursor": scan.cursor})
+            t4 = time.perf_counter()
+            for stage, seconds in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+                timings[stage].append(seconds * 1000)
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+    hook_input = json.dumps({
+        "session_id": "bench",
+        "transcript_path": transcript,
+        "cwd": workdir,
+        "hook_event_name": "Stop",
+    })
+    blocked = 0
+    for _ in range(runs):
+        shutil.rmtree(os.path.join(home, "sessions"), ignore_errors=True)
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, HOOK_PATH], input=hook_input, capture_output=True, text=True, env=env,
+        )
+        timings["end_to_end"].append((time.perf_counter() - t0) * 1000)
+        if proc.stdout.strip():
+            blocked += 1
+
+    return {
+        "case": f"{fmt}/{size_label(size)}/{rule_count}-rules",
+        "format": fmt,
+        "transcript_bytes": actual_size,
+        "user_rules": rule_count,
+        "rules_scored": scored,
+        "hook_blocked_runs": blocked,
+        "stages": {stage: summarize(samples) for stage, samples in timings.items()},
+    }
+
+
+def check_regressions(results, baseline, tolerance, slack_ms):
+    """Return failure strings for cases whose end-to-end p95 regressed."""
+    base_cases = {case["case"]: case for case in baseline.get("cases", [])}
+    failures = []
+    for case in results["cases"]:
+        base = base_cases.get(case["case"])
+        if not base:
+            continue
+        before = base["stages"]["end_to_end"]["p95_ms"]
+        after = case["stages"]["end_to_end"]["p95_ms"]
+        limit = before * (1 + tolerance) + slack_ms
+        case["baseline_p95_ms"] = before
+        if after > limit:
+            failures.append(f"{case['case']}: end-to-end p95 {after:.1f}ms > limit {limit:.1f}ms (baseline {before:.1f}ms)")
+    return failures
+
+
+def print_table(results):
+    print(f"{'case':<28} " + " ".join(f"{stage:>16}" for stage in STAGES))
+    print(f"{'':<28} " + " ".join(f"{'p50 / p95 ms':>16}" for _ in STAGES))
+    for case in results["cases"]:
+        cells = []
+        for stage in STAGES:
+            s = case["stages"][stage]
+            cells.append(f"{s['p50_ms']:>7.1f} /{s['p95_ms']:>7.1f}")
+        print(f"{case['case']:<28} " + " ".join(f"{c:>16}" for c in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HammerTime latency benchmark")
+    parser.add_argument("--sizes", default="10KB,1MB,10MB", help="Transcript sizes (default: 10KB,1MB,10MB)")
+    parser.add_argument("--formats", default="claude,codex", help="Transcript formats (default: claude,codex)")
+    parser.add_argument("--rules", default="10", help="Comma-separated synthetic user-rule counts (default: 10)")
+    parser.add_argument("--runs", type=int, default=15, help="Runs per case (default: 15)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Results JSON path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 regression ratio (default: 0.25)")
+    parser.add_argument("--slack-ms", type=float, default=10.0, help="Absolute p95 slack in ms (default: 10)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--json", action="store_true", help="Print results JSON instead of a table")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    rule_counts = [int(n) for n in args.rules.split(",") if n.strip()]
+
+    workdir = tempfile.mkdtemp(prefix="hammertime-bench-")
+    try:
+        cases = [
+            run_case(fmt, size, count, args.runs, workdir)
+            for fmt in formats for size in sizes for count in rule_counts
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "runner": platform.node(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs_per_case": args.runs,
+        "cases": cases,
+    }
+
+    failures = []
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            failures = check_regressions(results, json.load(f), args.tolerance, args.slack_ms)
+    results["regressions"] = failures
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    if args.update_baseline:
+        shutil.copyfile(args.output, args.baseline)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+        print()
+        fired = [c["case"] for c in cases if c["rules_scored"] or c["hook_blocked_runs"]]
+        if fired:
+            print(f"  NOTE: rules fired on synthetic text in {', '.join(fired)}; timings include that path")
+        for failure in failures:
+            print(f"  REGRESSION  {failure}")
+        print(f"  results: {args.output}")
+    return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
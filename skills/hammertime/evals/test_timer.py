@@ -14,6 +14,7 @@ import os
 import sys
 import tempfile
 import shutil
+import time
 
 # Isolate the hook resolver before importing HammerTime so evals never touch a
 # developer's real rules or state.
@@ -312,6 +313,75 @@ def test_cleanup_no_file(results):
         _restore_rules(original)
 
 
+def _age_rules_file(seconds):
+    """Backdate rules.json so the timer index treats its stamp as settled."""
+    st = os.stat(USER_RULES_PATH)
+    os.utime(USER_RULES_PATH, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_timer_index_skips_rules_read(results):
+    """With a settled index and no due deadline, rules.json is not re-read."""
+    future = (datetime.now() + timedelta(minutes=30)).isoformat()
+    test_rules = [
+        {"name": "later-timer", "rule": "Later", "enabled": True, "deadline": future, "keywords": []},
+    ]
+
+    original = _setup_temp_rules(test_rules)
+    try:
+        _age_rules_file(60)
+        cleanup_expired_timers()  # Builds the index
+        with open(_hammertime_paths()["timers"], "r") as f:
+            index = json.load(f)
+        if [name for _, name in index["deadlines"]] != ["later-timer"] or index["source"] is None:
+            results.fail("timer_index_built", f"Unexpected index: {index}")
+            return
+
+        # Same-size garbage with the original stamp: a full read would fail
+        st = os.stat(USER_RULES_PATH)
+        with open(USER_RULES_PATH, "r+") as f:
+            f.write("#" * st.st_size)
+        os.utime(USER_RULES_PATH, ns=(st.st_atime_ns, st.st_mtime_ns))
+        if cleanup_expired_timers() != []:
+            results.fail("timer_index_skip", "cleanup did not trust the index")
+            return
+        with open(USER_RULES_PATH, "r") as f:
+            if f.read() != "#" * st.st_size:
+                results.fail("timer_index_skip", "rules.json was rewritten")
+                return
+        results.ok("timer_index_skips_rules_read")
+    finally:
+        _restore_rules(original)
+
+
+def test_timer_index_expiry_and_edits(results):
+    """A due deadline or any edit to rules.json falls back to a full cleanup."""
+    soon = (datetime.now() + timedelta(seconds=1)).isoformat()
+    test_rules = [
+        {"name": "soon-timer", "rule": "Soon", "enabled": True, "deadline": soon, "keywords": []},
+    ]
+
+    original = _setup_temp_rules(test_rules)
+    try:
+        _age_rules_file(60)
+        if cleanup_expired_timers():
+            results.fail("timer_index_expiry", "timer expired early")
+            return
+        time.sleep(1.1)
+        if cleanup_expired_timers() != ["soon-timer"]:
+            results.fail("timer_index_expiry", "due timer was not removed")
+            return
+
+        # An edit (new mtime) adding an expired timer is picked up at once
+        past = (datetime.now() - timedelta(minutes=1)).isoformat()
+        _setup_temp_rules([{"name": "added", "rule": "x", "enabled": True, "deadline": past, "keywords": []}])
+        if cleanup_expired_timers() != ["added"]:
+            results.fail("timer_index_edit", "edited rules.json ignored")
+            return
+        results.ok("timer_index_expiry_and_edits")
+    finally:
+        _restore_rules(original)
+
+
 def test_timer_rule_loads(results):
     """Timer rules load correctly through load_rules()."""
     future = (datetime.now() + timedelta(minutes=30)).isoformat()
@@ -462,6 +532,8 @@ def run_tests(verbose=False):
     test_cleanup_expired_timers(results)
     test_cleanup_no_expired(results)
     test_cleanup_no_file(results)
+    test_timer_index_skips_rules_read(results)
+    test_timer_index_expiry_and_edits(results)
 
     # Loading tests
     test_timer_rule_loads(results)
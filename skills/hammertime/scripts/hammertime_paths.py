@@ -3,9 +3,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
+import re
 from pathlib import Path
 
+_SAFE_SESSION_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9._-]{0,99}")
+
 
 def resolve_hammertime_home() -> Path:
     override = os.environ.get("BOPEN_HAMMERTIME_HOME", "").strip()
@@ -24,11 +28,27 @@ def hammertime_paths() -> dict[str, Path]:
     return {
         "home": home,
         "rules": home / "rules.json",
+        "rules_cache": home / "rules.cache",
+        "timers": home / "timers.json",
         "state": home / "state.json",
+        "sessions": home / "sessions",
+        "verdicts": home / "verdicts.json",
+        "git_status": home / "git-status.json",
         "disabled": home / "disabled",
         "debug": home / "debug.log",
+        "telemetry": home / "telemetry.jsonl",
+        "daemon_socket": home / "daemon.sock",
     }
 
 
+def session_state_path(session_id: str) -> Path:
+    """Per-session state shard. Unsafe or overlong ids are hashed."""
+    session_id = str(session_id)
+    name = session_id
+    if not _SAFE_SESSION_ID.fullmatch(session_id):
+        name = hashlib.sha256(session_id.encode()).hexdigest()[:32]
+    return hammertime_paths()["sessions"] / f"{name}.json"
+
+
 if __name__ == "__main__":
     print(resolve_hammertime_home())
@@ -12,6 +12,7 @@ PATHS = hammertime_paths()
 RULES_PATH = PATHS["rules"]
 DEBUG_LOG = PATHS["debug"]
 STATE_PATH = PATHS["state"]
+SESSIONS_DIR = PATHS["sessions"]
 DISABLED_PATH = PATHS["disabled"]
 
 BUILTIN_RULES = [
@@ -41,6 +42,27 @@ def format_scope(rule):
     return "invalid"
 
 
+def latest_state_path():
+    """Most recently written session shard, else the legacy state.json."""
+    newest, newest_mtime = None, -1.0
+    try:
+        with os.scandir(SESSIONS_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if mtime > newest_mtime:
+                    newest, newest_mtime = entry.path, mtime
+    except OSError:
+        pass
+    if newest:
+        return newest
+    return STATE_PATH if os.path.exists(STATE_PATH) else None
+
+
 def main():
     now = datetime.now()
 
@@ -119,9 +141,10 @@ def main():
     print()
 
     # --- State ---
-    if os.path.exists(STATE_PATH):
+    state_path = latest_state_path()
+    if state_path:
         try:
-            with open(STATE_PATH, "r") as f:
+            with open(state_path, "r") as f:
                 state = json.load(f)
             iters = state.get("rule_iterations", {})
             if iters:
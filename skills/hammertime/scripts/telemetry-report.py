@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Aggregate HammerTime run telemetry into per-stage latency percentiles.
+
+Reads telemetry.jsonl (and its rotated telemetry.jsonl.1) from the
+HammerTime home. The Stop hook appends one record per run.
+
+Usage:
+    python3 telemetry-report.py                 # all recorded runs
+    python3 telemetry-report.py --last 200      # most recent 200 runs
+    python3 telemetry-report.py --days 7 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from hammertime_paths import hammertime_paths
+
+STAGES = (
+    "stdin_parse",
+    "timer_cleanup",
+    "rule_load",
+    "transcript_read",
+    "scoring",
+    "git_check",
+    "verifier",
+    "state_save",
+)
+
+
+def load_records(path):
+    records = []
+    for candidate in (f"{path}.1", str(path)):
+        try:
+            with open(candidate) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(record, dict):
+                        records.append(record)
+        except OSError:
+            continue
+    records.sort(key=lambda r: r.get("ts", 0))
+    return records
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    rank = max(1, -(-len(samples) * pct // 100))
+    return samples[int(rank) - 1]
+
+
+def aggregate(records):
+    """Return {"runs", "decisions", "stages": {stage: stats}} for records.
+
+    Stage stats cover only the runs that reached that stage; "total" is the
+    whole hook run.
+    """
+    samples = {stage: [] for stage in STAGES + ("total",)}
+    decisions = {}
+    for record in records:
+        decisions[record.get("decision", "?")] = decisions.get(record.get("decision", "?"), 0) + 1
+        for stage, ms in (record.get("stages") or {}).items():
+            if isinstance(ms, (int, float)):
+                samples.setdefault(stage, []).append(float(ms))
+        if isinstance(record.get("total_ms"), (int, float)):
+            samples["total"].append(float(record["total_ms"]))
+
+    stages = {}
+    for stage, values in samples.items():
+        if not values:
+            continue
+        values.sort()
+        stages[stage] = {
+            "runs": len(values),
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "p99_ms": round(percentile(values, 99), 3),
+            "max_ms": round(values[-1], 3),
+        }
+    return {"runs": len(records), "decisions": decisions, "stages": stages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HammerTime telemetry report")
+    parser.add_argument("--last", type=int, help="Only the most recent N runs")
+    parser.add_argument("--days", type=float, help="Only runs from the last N days")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    path = hammertime_paths()["telemetry"]
+    records = load_records(path)
+    if args.days is not None:
+        cutoff = time.time() - args.days * 86400
+        records = [r for r in records if r.get("ts", 0) >= cutoff]
+    if args.last:
+        records = records[-args.last:]
+
+    report = aggregate(records)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    if not records:
+        print(f"No HammerTime telemetry at {path}")
+        return 0
+
+    print(f"## HammerTime telemetry ({report['runs']} runs)\n")
+    print("| Stage | Runs | p50 ms | p95 ms | p99 ms | max ms |")
+    print("|-------|-----:|-------:|-------:|-------:|-------:|")
+    ordered = [s for s in STAGES + ("total",) if s in report["stages"]]
+    ordered += sorted(s for s in report["stages"] if s not in ordered)
+    for stage in ordered:
+        stats = report["stages"][stage]
+        print(
+            f"| {stage} | {stats['runs']} | {stats['p50_ms']:.1f} | {stats['p95_ms']:.1f} "
+            f"| {stats['p99_ms']:.1f} | {stats['max_ms']:.1f} |"
+        )
+    print()
+    print("Decisions: " + ", ".join(f"{k}={v}" for k, v in sorted(report["decisions"].items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
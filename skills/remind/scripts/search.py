@@ -1,60 +1,243 @@
 #!/usr/bin/env python3
 """Search Claude Code conversation history.
 
-Two search backends:
+Search backends, in order:
   1. Scribe DB (preferred) - Uses SQLite FTS5 index at ~/.scribe/scribe.db
-  2. JSONL fallback - Direct grep through ~/.claude/projects/ JSONL files
+  2. JSONL index - remind's own FTS5 index of ~/.claude/projects/ JSONL files
+     at ~/.claude/remind/index.db, updated incrementally before each query
+  3. JSONL scan - Direct grep through the JSONL files (no FTS5 available)
 
 Usage:
     python3 search.py <query> [options]
 
 Options:
     --project <path>     Filter by project path (substring match)
-    --limit <n>          Max results (default: 10)
+    --limit <n>          Max results (default: 10); with --session, max messages
     --recent <days>      Only search last N days
     --full               Force JSONL full-text search (skip Scribe DB)
-    --context <n>        Show N surrounding messages for each match (default: 2)
+    --quick              Search only session summaries and first prompts
+                         (sessions-index.json metadata, cached)
+    --semantic           Hybrid search: hashed n-gram vectors blended with
+                         BM25 over the JSONL index (needs NumPy)
+    --semantic-weight <f> Semantic share of the hybrid score (default: 0.6)
+    --no-index           With --full or no Scribe, scan JSONL files directly
+                         (substring matching: "auth" also finds "oauth", which
+                         the index's word-prefix matching does not)
+    --jobs <n>           Worker processes for the direct JSONL scan (0 = all cores)
+    --context <n>        Show N surrounding messages for each match (default: 2,
+                         Scribe only) or around --message
     --json               Output as JSON
     --session <id>       Read a specific session by ID (prints full conversation)
+    --offset <n>         With --session, skip the first N messages
+    --message <uuid>     With --session, show one message and --context around it
     --recency-weight <f> Recency weight factor (default: 0.2)
     --half-life <days>   Recency half-life in days (default: 30)
     --no-recency         Disable recency weighting
+    --no-cache           Run the query even if a cached result list is fresh
 
 Examples:
     python3 search.py "auth middleware"
     python3 search.py "stripe" --project /Users/me/code/myapp
     python3 search.py "deploy railway" --limit 5 --recent 7
     python3 search.py --session abc123-def456
+    python3 search.py --session abc123-def456 --offset 40 --limit 20
 """
 
 import argparse
+import bisect
+import hashlib
+import heapq
 import json
 import math
+import mmap
 import os
 import re
 import sqlite3
+import struct
 import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 
 CLAUDE_PROJECTS = Path.home() / ".claude" / "projects"
 SCRIBE_DB = Path.home() / ".scribe" / "scribe.db"
+REMIND_INDEX = Path.home() / ".claude" / "remind" / "index.db"
+REMIND_SESSIONS_CACHE = Path.home() / ".claude" / "remind" / "sessions-index.json"
+REMIND_SESSION_PATHS = Path.home() / ".claude" / "remind" / "session-paths.json"
+REMIND_LINE_INDEX_DIR = Path.home() / ".claude" / "remind" / "lines"
+REMIND_RESULT_CACHE = Path.home() / ".claude" / "remind" / "results.json"
+
+# Optional native JSON decoders (bytes in, dicts out); stdlib json otherwise.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+try:
+    import msgspec as _msgspec
+except ImportError:
+    _msgspec = None
+
+
+def _stdlib_loads(raw):
+    return json.loads(raw.decode("utf-8", errors="replace"))
+
+
+if _orjson is not None:
+    _json_loads = _orjson.loads
+elif _msgspec is not None:
+    _json_loads = _msgspec.json.decode
+else:
+    _json_loads = _stdlib_loads
+_DECODE_ERRORS = (ValueError,) + ((_msgspec.DecodeError,) if _msgspec is not None else ())
+
+# Only user/assistant entries are indexed; any other line (progress, summary,
+# file snapshots) lacks both markers and is skipped without decoding.
+def decode_message_line(raw):
+    """Decode a JSONL line that may hold a user/assistant entry, else None."""
+    if b'"user"' not in raw and b'"assistant"' not in raw:
+        return None
+    try:
+        obj = _json_loads(raw)
+    except _DECODE_ERRORS:
+        try:
+            obj = _stdlib_loads(raw)  # Native decoders reject invalid UTF-8
+        except ValueError:
+            return None
+    return obj if isinstance(obj, dict) else None
 
 
 # ─── Scribe DB Search (FTS5) ────────────────────────────────────────────────
 
 
-def scribe_search(query, project_filter=None, recent_days=None, limit=10, context_messages=2, recency_weight=0.2, half_life_days=30):
-    """Search using Scribe's SQLite FTS5 index. Returns grouped-by-session results."""
-    if not SCRIBE_DB.exists():
-        return None  # Signal to fall back
+# Scribe may be writing while remind reads, so the DB is opened read-only
+# (mode=ro) rather than immutable, which would let SQLite skip locking and
+# read a half-written page. mmap serves repeat reads straight from the page
+# cache.
+SCRIBE_MMAP_SIZE = 256 * 1024 * 1024
 
+
+def open_scribe_db():
+    """Open Scribe's DB read-only with memory-mapped I/O, or None."""
+    if not SCRIBE_DB.exists():
+        return None
     try:
-        conn = sqlite3.connect(str(SCRIBE_DB))
+        conn = sqlite3.connect(f"{SCRIBE_DB.as_uri()}?mode=ro", uri=True)
         conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {SCRIBE_MMAP_SIZE}")
     except sqlite3.Error:
         return None
+    return conn
+
+
+# Enrichment for the selected sessions runs as set-based statements over two
+# temp tables, one for the sessions and one for the snippets, instead of
+# separate queries per session. The temp tables have no statistics, so CROSS
+# JOIN pins the join order: drive from the few selected rows into Scribe's
+# thread and message indexes, never the other way round. The first prompt is
+# an index-ordered LIMIT 1 per thread; ROW_NUMBER over every user message
+# measured 20x slower.
+SCRIBE_FIRST_PROMPTS_SQL = """
+    SELECT s.session_id,
+           (SELECT em.content_text FROM evidence_messages em
+            WHERE em.thread_id = et.id AND em.role = 'user'
+            ORDER BY em.timestamp LIMIT 1) AS first_prompt
+    FROM temp.remind_sessions s
+    CROSS JOIN evidence_threads et
+      ON et.external_thread_id = s.session_id AND et.provider_id = 'claude'
+"""
+
+# Each snippet is anchored to the last message at or before its timestamp.
+# Two index seeks per anchor find the timestamps N messages either side,
+# one range scan pulls the messages between them, and window functions
+# number each message relative to its anchor.
+SCRIBE_CONTEXT_SQL = """
+    WITH anchors AS (
+        SELECT m.match_id, m.timestamp, et.id AS thread_id,
+               COALESCE(
+                   (SELECT em.timestamp FROM evidence_messages em
+                    WHERE em.thread_id = et.id AND em.timestamp <= m.timestamp
+                    ORDER BY em.timestamp DESC LIMIT 1 OFFSET :n),
+                   (SELECT MIN(em.timestamp) FROM evidence_messages em WHERE em.thread_id = et.id)
+               ) AS lo,
+               COALESCE(
+                   (SELECT em.timestamp FROM evidence_messages em
+                    WHERE em.thread_id = et.id AND em.timestamp > m.timestamp
+                    ORDER BY em.timestamp LIMIT 1 OFFSET :n - 1),
+                   (SELECT MAX(em.timestamp) FROM evidence_messages em WHERE em.thread_id = et.id)
+               ) AS hi
+        FROM temp.remind_matches m
+        CROSS JOIN evidence_threads et
+          ON et.external_thread_id = m.session_id AND et.provider_id = 'claude'
+    )
+    SELECT a.match_id, em.role, em.content_text,
+           ROW_NUMBER() OVER w
+             - SUM(em.timestamp <= a.timestamp) OVER (PARTITION BY a.match_id) AS position
+    FROM anchors a
+    CROSS JOIN evidence_messages em
+      ON em.thread_id = a.thread_id AND em.timestamp BETWEEN a.lo AND a.hi
+    WINDOW w AS (PARTITION BY a.match_id ORDER BY em.timestamp)
+    ORDER BY a.match_id, em.timestamp
+"""
+
+
+def clean_scribe_content(content):
+    """Strip tags and ANSI codes; None for empty or continuation-summary text."""
+    content = re.sub(r'<[^>]+>', '', content or "")  # Strip HTML/XML tags
+    content = re.sub(r'\x1b\[[0-9;]*m', '', content)  # Strip ANSI
+    content = content.strip()
+    # Skip context continuation summaries — they're noise
+    if content.startswith("This session is being continued from"):
+        return None
+    content = content[:300]
+    return content if len(content) > 10 else None
+
+
+def scribe_enrich(conn, sessions, context_messages):
+    """Fill first prompts, snippets and context for the selected sessions."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS remind_sessions (session_id TEXT PRIMARY KEY)")
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS remind_matches"
+                 " (match_id INTEGER PRIMARY KEY, session_id TEXT, timestamp INTEGER)")
+    conn.execute("DELETE FROM temp.remind_sessions")
+    conn.execute("DELETE FROM temp.remind_matches")
+    conn.executemany("INSERT INTO temp.remind_sessions VALUES (?)",
+                     [(s["session_id"],) for s in sessions])
+
+    anchors = []
+    for session in sessions:
+        session["snippets"] = []
+        for match in session["matches"][:5]:
+            content = clean_scribe_content(match["content"])
+            if content:
+                session["snippets"].append(content)
+                anchors.append((len(anchors), session["session_id"], match["timestamp"]))
+            if len(session["snippets"]) >= 3:
+                break
+
+    first_prompts = dict(conn.execute(SCRIBE_FIRST_PROMPTS_SQL).fetchall())
+
+    context = [[] for _ in anchors]
+    if context_messages > 0 and anchors:
+        conn.executemany("INSERT INTO temp.remind_matches VALUES (?, ?, ?)", anchors)
+        for row in conn.execute(SCRIBE_CONTEXT_SQL, {"n": context_messages}):
+            context[row["match_id"]].append({
+                "position": row["position"],
+                "role": row["role"],
+                "text": (row["content_text"] or "")[:300],
+            })
+
+    anchor_iter = iter(context)
+    for session in sessions:
+        session["first_prompt"] = (first_prompts.get(session["session_id"]) or "")[:200]
+        session["context"] = [next(anchor_iter) for _ in session["snippets"]]
+
+
+def scribe_search(query, project_filter=None, recent_days=None, limit=10, context_messages=2, recency_weight=0.2, half_life_days=30):
+    """Search using Scribe's SQLite FTS5 index. Returns grouped-by-session results."""
+    conn = open_scribe_db()
+    if conn is None:
+        return None  # Signal to fall back
 
     try:
         # Build FTS query - wrap words in quotes for phrase-ish matching
@@ -108,127 +291,181 @@ def scribe_search(query, project_filter=None, recent_days=None, limit=10, contex
         now_ts = int(datetime.now(timezone.utc).timestamp())
         for sid, session in sessions.items():
             best_rank = min(m["rank"] for m in session["matches"])  # most negative = best
-            age_days = max((now_ts - session["latest_timestamp"]) / 86400, 0)
-            recency_boost = math.exp(-0.693 * age_days / half_life_days) if half_life_days > 0 else 0
-            session["blended_score"] = abs(best_rank) * (1 + recency_weight * recency_boost)
+            session["blended_score"] = recency_blend(abs(best_rank), session["latest_timestamp"],
+                                                     recency_weight, half_life_days, now_ts)
 
-        sorted_sessions = sorted(sessions.values(), key=lambda s: -s["blended_score"])
+        selected = sorted(sessions.values(), key=lambda s: -s["blended_score"])[:limit]
+        scribe_enrich(conn, selected, context_messages)
 
-        # For each session, fetch surrounding context from evidence_messages
         results = []
-        for session in sorted_sessions[:limit]:
-            sid = session["session_id"]
-
-            # Get thread info
-            thread = conn.execute("""
-                SELECT title, workspace_path, started_at, ended_at
-                FROM evidence_threads
-                WHERE external_thread_id = ? AND provider_id = 'claude'
-                LIMIT 1
-            """, [sid]).fetchone()
-
-            # Get first user message as summary
-            first_msg = conn.execute("""
-                SELECT content_text FROM evidence_messages
-                WHERE thread_id IN (
-                    SELECT id FROM evidence_threads
-                    WHERE external_thread_id = ? AND provider_id = 'claude'
-                )
-                AND role = 'user'
-                ORDER BY timestamp ASC
-                LIMIT 1
-            """, [sid]).fetchone()
-
-            # Get matching snippets
-            snippets = []
-            for match in session["matches"][:5]:
-                content = match["content"]
-                if content:
-                    # Clean up content for display
-                    content = re.sub(r'<[^>]+>', '', content)  # Strip HTML/XML tags
-                    content = re.sub(r'\x1b\[[0-9;]*m', '', content)  # Strip ANSI
-                    content = content.strip()
-                    # Skip context continuation summaries — they're noise
-                    if content.startswith("This session is being continued from"):
-                        continue
-                    content = content[:300]
-                    if content and len(content) > 10:
-                        snippets.append(content)
-                if len(snippets) >= 3:
-                    break
-
+        for session in selected:
             date_str = datetime.fromtimestamp(session["latest_timestamp"], tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
-
-            results.append({
-                "session_id": sid,
+            result = {
+                "session_id": session["session_id"],
                 "project": session["project"],
                 "date": date_str,
-                "first_prompt": (first_msg["content_text"][:200] if first_msg else ""),
-                "snippets": snippets,
+                "first_prompt": session["first_prompt"],
+                "snippets": session["snippets"],
                 "match_count": len(session["matches"]),
-            })
+            }
+            if context_messages > 0:
+                result["context"] = session["context"]
+            results.append(result)
 
-        conn.close()
         return results
 
     except sqlite3.Error as e:
-        conn.close()
         print(f"Scribe DB error: {e}", file=sys.stderr)
         return None
+    finally:
+        conn.close()
 
 
-def scribe_read_session(session_id, context_messages=None):
-    """Read a full session from Scribe's evidence_messages table."""
-    if not SCRIBE_DB.exists():
+def scribe_read_session(session_id, offset=0, limit=None):
+    """Read a page of a session from Scribe's evidence_messages table.
+
+    Returns (messages, total) with each message's position in "index", or
+    None when Scribe has no such session.
+    """
+    conn = open_scribe_db()
+    if conn is None:
         return None
 
     try:
-        conn = sqlite3.connect(str(SCRIBE_DB))
-        conn.row_factory = sqlite3.Row
-
-        messages = conn.execute("""
-            SELECT em.role, em.content_text, em.timestamp, em.tool_name
-            FROM evidence_messages em
-            JOIN evidence_threads et ON em.thread_id = et.id
-            WHERE et.external_thread_id = ? AND et.provider_id = 'claude'
-            ORDER BY em.timestamp ASC
-        """, [session_id]).fetchall()
-
-        conn.close()
+        thread = conn.execute("""
+            SELECT id FROM evidence_threads
+            WHERE external_thread_id = ? AND provider_id = 'claude'
+        """, [session_id]).fetchone()
+        if thread is None:
+            return None
 
-        if not messages:
+        total = conn.execute("""
+            SELECT COUNT(*) FROM evidence_messages
+            WHERE thread_id = ? AND content_text IS NOT NULL AND content_text != ''
+        """, [thread["id"]]).fetchone()[0]
+        if not total:
             return None
 
+        offset = max(offset, 0)
+        messages = conn.execute("""
+            SELECT role, content_text, timestamp, tool_name
+            FROM evidence_messages
+            WHERE thread_id = ? AND content_text IS NOT NULL AND content_text != ''
+            ORDER BY timestamp ASC
+            LIMIT ? OFFSET ?
+        """, [thread["id"], -1 if limit is None else max(limit, 0), offset]).fetchall()
+
         return [{
+            "index": offset + i,
             "role": msg["role"],
-            "text": msg["content_text"] or "",
+            "text": msg["content_text"],
             "timestamp": msg["timestamp"],
             "tool": msg["tool_name"],
-        } for msg in messages if msg["content_text"]]
+        } for i, msg in enumerate(messages)], total
 
     except sqlite3.Error:
         return None
+    finally:
+        conn.close()
 
 
 # ─── JSONL Fallback Search ───────────────────────────────────────────────────
 
 
-def load_session_indexes():
-    """Load all sessions-index.json files across projects."""
-    entries = []
-    for project_dir in CLAUDE_PROJECTS.iterdir():
-        if not project_dir.is_dir():
+# The quick search reads one merged cache of every project's
+# sessions-index.json instead of re-parsing each of them per query. Rows are
+# pre-normalized (epoch time, lowercased searchable text), and a project
+# dir's rows are rebuilt only when its index file's mtime or size changes.
+SESSIONS_CACHE_VERSION = 1
+# Row layout in the cache file.
+(ROW_SESSION_ID, ROW_TIME, ROW_MODIFIED, ROW_TEXT, ROW_PROJECT,
+ ROW_SUMMARY, ROW_FIRST_PROMPT, ROW_MESSAGES) = range(8)
+
+
+def parse_epoch(value):
+    """ISO-8601 timestamp -> epoch seconds (naive = UTC), or None."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def session_index_rows(idx_file):
+    """Normalize one sessions-index.json into cache rows."""
+    try:
+        data = json.loads(idx_file.read_text())
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return []
+    rows = []
+    for entry in data.get("entries", []) if isinstance(data, dict) else []:
+        if not isinstance(entry, dict):
             continue
-        idx_file = project_dir / "sessions-index.json"
-        if idx_file.exists():
-            try:
-                data = json.loads(idx_file.read_text())
-                for entry in data.get("entries", []):
-                    entry["_project_dir"] = str(project_dir)
-                    entries.append(entry)
-            except (json.JSONDecodeError, OSError):
-                continue
-    return entries
+        searchable = " ".join([
+            entry.get("summary", ""),
+            entry.get("firstPrompt", ""),
+            entry.get("gitBranch", ""),
+            entry.get("projectPath", ""),
+        ]).lower()
+        rows.append([
+            entry.get("sessionId", ""),
+            parse_epoch(entry.get("modified") or entry.get("created", "")),
+            entry.get("modified", ""),
+            searchable,
+            entry.get("projectPath", ""),
+            entry.get("summary", ""),
+            entry.get("firstPrompt", ""),
+            entry.get("messageCount", 0),
+        ])
+    return rows
+
+
+def load_session_cache(cache_path=None):
+    """Return every project's session-index rows, refreshing stale dirs."""
+    cache_path = Path(cache_path or REMIND_SESSIONS_CACHE)
+    try:
+        cache = _json_loads(cache_path.read_bytes())
+        dirs = cache["dirs"] if cache.get("version") == SESSIONS_CACHE_VERSION else {}
+    except (OSError, KeyError, AttributeError) + _DECODE_ERRORS:
+        dirs = {}
+
+    fresh = {}
+    changed = False
+    try:
+        project_dirs = list(CLAUDE_PROJECTS.iterdir())
+    except OSError:
+        project_dirs = []
+    for project_dir in project_dirs:
+        try:
+            st = (project_dir / "sessions-index.json").stat()
+        except OSError:
+            continue  # Not a project dir, or no index
+        cached = dirs.get(project_dir.name)
+        if cached and cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+            fresh[project_dir.name] = cached
+            continue
+        fresh[project_dir.name] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "rows": session_index_rows(project_dir / "sessions-index.json"),
+        }
+        changed = True
+
+    if changed or len(fresh) != len(dirs):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": SESSIONS_CACHE_VERSION, "dirs": fresh},
+                                      separators=(",", ":")))
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # Read-only home: serve from memory this time
+
+    return [row for entry in fresh.values() for row in entry["rows"]]
 
 
 def extract_project_name(project_dir_name):
@@ -239,176 +476,1108 @@ def extract_project_name(project_dir_name):
 
 def search_indexes(query, project_filter=None, recent_days=None, limit=10):
     """Fast search: scan session index metadata (summaries + first prompts)."""
-    entries = load_session_indexes()
+    rows = load_session_cache()
     query_lower = query.lower()
     query_words = query_lower.split()
-    results = []
-
-    for entry in entries:
-        if project_filter:
-            pp = entry.get("projectPath", "")
-            if project_filter not in pp:
-                continue
 
-        if recent_days:
-            modified = entry.get("modified") or entry.get("created", "")
-            if modified:
-                try:
-                    mod_dt = datetime.fromisoformat(modified.replace("Z", "+00:00"))
-                    cutoff = datetime.now(timezone.utc) - timedelta(days=recent_days)
-                    if mod_dt < cutoff:
-                        continue
-                except (ValueError, TypeError):
-                    pass
-
-        searchable = " ".join([
-            entry.get("summary", ""),
-            entry.get("firstPrompt", ""),
-            entry.get("gitBranch", ""),
-            entry.get("projectPath", ""),
-        ]).lower()
+    if project_filter:
+        rows = [r for r in rows if project_filter in r[ROW_PROJECT]]
+    if recent_days:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=recent_days)).timestamp()
+        rows = [r for r in rows if r[ROW_TIME] is None or r[ROW_TIME] >= cutoff]
+
+    # Score column-wise: one pass over the searchable texts per query word.
+    # The phrase can only occur where every word did.
+    n_words = len(query_words)
+    texts = [r[ROW_TEXT] for r in rows]
+    scores = [0] * len(texts)
+    for w in query_words:
+        scores = [score + (w in text) for score, text in zip(scores, texts)]
+    results = [
+        (score + n_words if score == n_words and query_lower in text else score, row)
+        for score, text, row in zip(scores, texts, rows) if score
+    ]
+
+    results = heapq.nsmallest(limit, results, key=lambda x: (-x[0], x[1][ROW_MODIFIED]))
+    return [{
+        "score": score,
+        "session_id": row[ROW_SESSION_ID],
+        "project": row[ROW_PROJECT],
+        "date": (datetime.fromtimestamp(row[ROW_TIME], tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+                 if row[ROW_TIME] is not None else ""),
+        "first_prompt": row[ROW_FIRST_PROMPT][:200],
+        "message_count": row[ROW_MESSAGES],
+        "snippets": [row[ROW_SUMMARY]] if row[ROW_SUMMARY] else [],
+    } for score, row in results]
+
+
+def message_from_entry(obj):
+    """Return {role, text, timestamp} for a user/assistant text entry, else None."""
+    msg_type = obj.get("type", "")
+    if msg_type not in ("user", "assistant"):
+        return None
 
-        score = sum(1 for w in query_words if w in searchable)
-        if score == 0:
-            continue
+    msg = obj.get("message", {})
+    content = msg.get("content", "") if isinstance(msg, dict) else ""
+    text = ""
 
-        if query_lower in searchable:
-            score += len(query_words)
+    if isinstance(content, str):
+        text = content
+    elif isinstance(content, list):
+        text_parts = []
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "text":
+                text_parts.append(block.get("text", ""))
+        text = "\n".join(text_parts)
 
-        results.append((score, entry))
+    if not text or len(text) <= 5 or text.strip().startswith("<system-reminder>"):
+        return None
+    return {
+        "role": msg_type,
+        "text": text,
+        "timestamp": obj.get("timestamp", ""),
+    }
 
-    results.sort(key=lambda x: (-x[0], x[1].get("modified", "")))
-    return results[:limit]
 
+def read_messages_from(jsonl_path, offset=0):
+    """Extract messages from complete lines at or after byte `offset`.
 
-def extract_messages_from_jsonl(jsonl_path):
-    """Extract user and assistant text messages from a JSONL file."""
+    Returns (messages, end_offset). A trailing line without a newline is
+    still being written, so it is left for the next read.
+    """
     messages = []
+    end = offset
     try:
-        with open(jsonl_path, "r") as f:
+        with open(jsonl_path, "rb") as f:
+            f.seek(offset)
             for line in f:
-                try:
-                    obj = json.loads(line.strip())
-                except json.JSONDecodeError:
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                obj = decode_message_line(line)
+                if obj is None:
                     continue
+                message = message_from_entry(obj)
+                if message is not None:
+                    messages.append(message)
+    except OSError:
+        pass
+    return messages, end
+
 
-                msg_type = obj.get("type", "")
-                if msg_type not in ("user", "assistant"):
+def iter_jsonl_messages(jsonl_path):
+    """Yield user and assistant text messages from a JSONL file, one at a time."""
+    try:
+        with open(jsonl_path, "rb") as f:
+            for line in f:
+                obj = decode_message_line(line)
+                if obj is None:
                     continue
+                message = message_from_entry(obj)
+                if message is not None:
+                    yield message
+    except OSError:
+        return
 
-                msg = obj.get("message", {})
-                content = msg.get("content", "")
-                text = ""
-
-                if isinstance(content, str):
-                    text = content
-                elif isinstance(content, list):
-                    text_parts = []
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "text":
-                            text_parts.append(block.get("text", ""))
-                    text = "\n".join(text_parts)
-
-                if text and len(text) > 5:
-                    if text.strip().startswith("<system-reminder>"):
-                        continue
-                    messages.append({
-                        "role": msg_type,
-                        "text": text,
-                        "timestamp": obj.get("timestamp", ""),
-                    })
+
+def extract_messages_from_jsonl(jsonl_path):
+    """Extract user and assistant text messages from a JSONL file."""
+    return list(iter_jsonl_messages(jsonl_path))
+
+
+def make_snippet(text, text_lower, word):
+    """Cut ~200 chars of `text` around the first occurrence of `word`, or None."""
+    idx = text_lower.find(word)
+    if idx < 0:
+        return None
+    start = max(0, idx - 80)
+    end = min(len(text), idx + len(word) + 120)
+    snippet = text[start:end].strip()
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(text):
+        snippet = snippet + "..."
+    return snippet
+
+
+def recency_blend(score, mtime, recency_weight, half_life_days, now_ts=None):
+    """Boost `score` by up to `recency_weight`, decaying with age over the half-life."""
+    if now_ts is None:
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+    age_days = max((now_ts - mtime) / 86400, 0)
+    recency_boost = math.exp(-0.693 * age_days / half_life_days) if half_life_days > 0 else 0
+    return score * (1 + recency_weight * recency_boost)
+
+
+# ─── JSONL Index (FTS5) ──────────────────────────────────────────────────────
+#
+# Without Scribe, remind keeps its own FTS5 index of the JSONL transcripts.
+# Each file row remembers the size, mtime and byte offset it was indexed up
+# to, so a query first stats every transcript and parses only bytes appended
+# since the last run. A file that shrank or was replaced is reindexed whole.
+#
+# Message rowids come from a counter in the meta table rather than FTS5's
+# max(rowid)+1, so a rowid is never reused after a delete. A file's
+# base_rowid is the counter value at its last reset; anything derived from
+# one of its messages with a rowid at or below that (the semantic vectors)
+# is stale. New files start at the current counter too: SQLite may hand a
+# deleted file's id to a new one, and the old file's vectors must not pass.
+
+INDEX_SCHEMA_VERSION = 3
+
+INDEX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS files (
+        id INTEGER PRIMARY KEY,
+        path TEXT UNIQUE NOT NULL,
+        session_id TEXT NOT NULL,
+        project TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        inode INTEGER NOT NULL,
+        offset INTEGER NOT NULL,
+        first_prompt TEXT NOT NULL DEFAULT '',
+        message_count INTEGER NOT NULL DEFAULT 0,
+        base_rowid INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5(
+        text, file_id UNINDEXED, role UNINDEXED
+    );
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+"""
+
+
+def open_index(path=None):
+    """Open (creating if needed) the JSONL index, or None without FTS5 support."""
+    path = Path(path or REMIND_INDEX)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=30)
+    except (OSError, sqlite3.Error):
+        return None
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_SCHEMA_VERSION:
+            conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS messages;"
+                               " DROP TABLE IF EXISTS meta;")
+            conn.executescript(INDEX_SCHEMA)
+            conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                             [("generation", os.urandom(8).hex()), ("next_rowid", 1)])
+            conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            conn.commit()
+        conn.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.Error:
+        conn.close()  # No FTS5 in this SQLite build, or a corrupt index
+        return None
+    return conn
+
+
+def update_index(conn):
+    """Bring the index up to date with ~/.claude/projects; returns files touched."""
+    # BEGIN IMMEDIATE serializes concurrent updaters; the loser waits, then
+    # sees the winner's offsets and has nothing left to parse.
+    conn.execute("BEGIN IMMEDIATE")
+    next_rowid = conn.execute("SELECT value FROM meta WHERE key = 'next_rowid'").fetchone()[0]
+    indexed = {
+        row[1]: row for row in conn.execute(
+            "SELECT id, path, size, mtime_ns, inode, offset, first_prompt, message_count FROM files")
+    }
+    seen = set()
+    touched = 0
+
+    try:
+        project_dirs = [d for d in CLAUDE_PROJECTS.iterdir() if d.is_dir()]
     except OSError:
-        pass
-    return messages
+        project_dirs = []
 
+    for project_dir in project_dirs:
+        project = extract_project_name(project_dir.name)
+        for jsonl_file in project_dir.glob("*.jsonl"):
+            path = str(jsonl_file)
+            try:
+                st = jsonl_file.stat()
+            except OSError:
+                continue
+            seen.add(path)
+            row = indexed.get(path)
+            if row is not None and row[2] == st.st_size and row[3] == st.st_mtime_ns:
+                continue
 
-def search_jsonl_full(query, project_filter=None, recent_days=None, limit=10, recency_weight=0.2, half_life_days=30):
-    """Deep search: scan actual JSONL conversation content."""
-    query_lower = query.lower()
-    query_words = query_lower.split()
-    results = []
+            if row is None:
+                file_id = conn.execute(
+                    "INSERT INTO files (path, session_id, project, size, mtime_ns, inode, offset, base_rowid)"
+                    " VALUES (?, ?, ?, 0, 0, ?, 0, ?)",
+                    (path, jsonl_file.stem, project, st.st_ino, next_rowid - 1),
+                ).lastrowid
+                offset, first_prompt, count = 0, "", 0
+            else:
+                file_id, offset, first_prompt, count = row[0], row[5], row[6], row[7]
+                if st.st_size < offset or st.st_ino != row[4]:
+                    conn.execute("DELETE FROM messages WHERE file_id = ?", (file_id,))
+                    conn.execute("UPDATE files SET base_rowid = ? WHERE id = ?", (next_rowid - 1, file_id))
+                    offset, first_prompt, count = 0, "", 0
+
+            messages, offset = read_messages_from(path, offset)
+            conn.executemany(
+                "INSERT INTO messages (rowid, text, file_id, role) VALUES (?, ?, ?, ?)",
+                [(next_rowid + i, m["text"], file_id, m["role"]) for i, m in enumerate(messages)],
+            )
+            next_rowid += len(messages)
+            if not first_prompt:
+                first_prompt = next((m["text"][:200] for m in messages if m["role"] == "user"), "")
+            conn.execute(
+                "UPDATE files SET size = ?, mtime_ns = ?, inode = ?, offset = ?,"
+                " first_prompt = ?, message_count = ? WHERE id = ?",
+                (st.st_size, st.st_mtime_ns, st.st_ino, offset, first_prompt,
+                 count + len(messages), file_id),
+            )
+            touched += 1
+
+    for path, row in indexed.items():
+        if path not in seen:
+            conn.execute("DELETE FROM messages WHERE file_id = ?", (row[0],))
+            conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+            touched += 1
+    conn.execute("UPDATE meta SET value = ? WHERE key = 'next_rowid'", (next_rowid,))
+    conn.commit()
+    return touched
+
+
+def fts_query(query):
+    """OR together quoted prefix terms.
+
+    A prefix term matches tokens that start with the word, so "auth" finds
+    "authentication" but not "oauth"; the direct scan (--no-index) matches
+    substrings anywhere and does find it.
+    """
+    return " OR ".join('"{}"*'.format(w.replace('"', '""')) for w in query.split())
+
+
+def index_session_ranks(conn, match, project_filter=None, recent_days=None):
+    """Per-session FTS hits: (file_id, session_id, project, mtime_ns,
+    first_prompt, message_count, best_rank, hits) rows."""
+    # The hidden rank column is bm25(); unlike bm25() it may be aggregated.
+    sql = """
+        SELECT f.id, f.session_id, f.project, f.mtime_ns, f.first_prompt,
+               f.message_count, MIN(messages.rank) AS best_rank, COUNT(*) AS hits
+        FROM messages
+        JOIN files f ON f.id = messages.file_id
+        WHERE messages MATCH ?
+    """
+    params = [match]
+    if project_filter:
+        sql += " AND instr(f.project, ?) > 0"
+        params.append(project_filter)
+    if recent_days:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=recent_days)
+        sql += " AND f.mtime_ns >= ?"
+        params.append(int(cutoff.timestamp() * 1e9))
+    sql += " GROUP BY f.id"
+    return conn.execute(sql, params)
+
+
+def search_jsonl_index(query, project_filter=None, recent_days=None, limit=10, recency_weight=0.2, half_life_days=30):
+    """Indexed search over the JSONL transcripts. Returns None if FTS5 is unavailable."""
+    if not CLAUDE_PROJECTS.is_dir() or not query.split():
+        return None
+    conn = open_index()
+    if conn is None:
+        return None
+
+    try:
+        update_index(conn)
+
+        match = fts_query(query)
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+        sessions = []
+        for file_id, sid, project, mtime_ns, first_prompt, count, best_rank, hits in \
+                index_session_ranks(conn, match, project_filter, recent_days):
+            mtime = mtime_ns / 1e9
+            sessions.append({
+                "file_id": file_id,
+                "score": abs(best_rank),
+                "blended_score": recency_blend(abs(best_rank), mtime, recency_weight, half_life_days, now_ts),
+                "session_id": sid,
+                "project": project,
+                "first_prompt": first_prompt,
+                "message_count": count,
+                "match_count": hits,
+                "modified": mtime,
+            })
+        sessions.sort(key=lambda x: (-x["blended_score"], -x["modified"]))
+        sessions = sessions[:limit]
+
+        # Snippets only for the sessions being returned, in transcript order.
+        snippets = {s["file_id"]: [] for s in sessions}
+        if snippets:
+            first_word = query.lower().split()[0]
+            placeholders = ",".join("?" * len(snippets))
+            rows = conn.execute(
+                f"SELECT file_id, text FROM messages WHERE messages MATCH ?"
+                f" AND file_id IN ({placeholders}) ORDER BY rowid",
+                [match, *snippets],
+            )
+            for file_id, text in rows:
+                found = snippets[file_id]
+                if len(found) < 3:
+                    snippet = make_snippet(text, text.lower(), first_word)
+                    if snippet is not None:
+                        found.append(snippet)
+
+        for session in sessions:
+            session["snippets"] = snippets[session.pop("file_id")]
+        return sessions
+
+    except sqlite3.Error as e:
+        print(f"JSONL index error: {e}", file=sys.stderr)
+        return None
+    finally:
+        conn.close()
+
+
+# ─── Semantic Search (optional NumPy) ────────────────────────────────────────
+#
+# --semantic embeds every indexed message with a hashed character n-gram
+# vectorizer: no model download, and fuzzy enough to match "deploying" to
+# "deploy" or "Railway's" to "railway". Each message is cut into chunks of
+# up to SEMANTIC_CHUNK_CHARS; their unit vectors are appended as float16
+# rows to vectors.f16 next to the JSONL index, with a parallel int64
+# (message rowid, file id, chunk) row in vectors.ids. A query is one
+# matrix-vector product over the memory-mapped matrix.
+#
+# Vectors are appended for messages whose rowid is past the last embedded
+# one. Rows of files that were since reset or removed are masked at query
+# time, and the matrix is rebuilt once such stale rows reach half of it.
+
+SEMANTIC_VERSION = 1
+SEMANTIC_DIM_BITS = 8
+SEMANTIC_DIMS = 1 << SEMANTIC_DIM_BITS
+SEMANTIC_NGRAMS = (3, 4, 5)
+SEMANTIC_CHUNK_CHARS = 1000
+SEMANTIC_MAX_CHUNKS = 8  # Per message; long pastes add noise, not recall
+SEMANTIC_BATCH = 2048
+SEMANTIC_BLOCK_ROWS = 4096  # Cache-sized float16 -> float32 blocks
+SEMANTIC_WEIGHT = 0.6  # Hybrid: semantic share; the rest is normalized BM25
+SEMANTIC_MIN_SCORE = 0.15  # Below this, a session with no keyword hit is noise
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def import_numpy():
+    """NumPy, imported only for --semantic (it costs ~100 ms), or None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def hash_embed(np, texts):
+    """Embed texts as L2-normalized hashed n-gram vectors (float32, n x dims).
+
+    All texts are hashed in one pass: the lowercased, space-padded words of
+    every text are concatenated, each byte n-gram gets a polynomial hash,
+    n-grams that straddle two texts are dropped, and the top hash bits pick
+    a bucket and a sign.
+    """
+    parts = [(" " + _NON_WORD.sub(" ", t.lower()).strip() + " ").encode("utf-8") for t in texts]
+    lengths = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts))
+    data = np.frombuffer(b"".join(parts), dtype=np.uint8).astype(np.uint64)
+    row_of = np.repeat(np.arange(len(parts), dtype=np.int64), lengths)
+    out = np.zeros(len(parts) * SEMANTIC_DIMS, dtype=np.float64)
+
+    with np.errstate(over="ignore"):  # uint64 arithmetic wraps, as intended
+        for n in SEMANTIC_NGRAMS:
+            count = len(data) - n + 1
+            if count <= 0:
+                continue
+            h = np.zeros(count, dtype=np.uint64)
+            for k in range(n):
+                h = h * np.uint64(1099511628211) + data[k:k + count]
+            inside = row_of[:count] == row_of[n - 1:]
+            h = h[inside] * np.uint64(0x9E3779B97F4A7C15)
+            bucket = (h >> np.uint64(64 - SEMANTIC_DIM_BITS)).astype(np.int64)
+            sign = 1.0 - 2.0 * ((h >> np.uint64(63 - SEMANTIC_DIM_BITS)) & np.uint64(1)).astype(np.float64)
+            out += np.bincount(row_of[:count][inside] * SEMANTIC_DIMS + bucket,
+                               weights=sign, minlength=len(out))
+
+    out = out.reshape(len(parts), SEMANTIC_DIMS)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    return (out / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def message_chunks(text):
+    """Split a message into at most SEMANTIC_MAX_CHUNKS fixed-size chunks."""
+    limit = SEMANTIC_CHUNK_CHARS * SEMANTIC_MAX_CHUNKS
+    return [text[i:i + SEMANTIC_CHUNK_CHARS] for i in range(0, min(len(text), limit), SEMANTIC_CHUNK_CHARS)]
+
+
+def semantic_paths(index_path=None):
+    base = Path(index_path or REMIND_INDEX)
+    return (base.with_name("vectors.f16"), base.with_name("vectors.ids"),
+            base.with_name("vectors.json"))
+
+
+def update_vectors(np, conn, index_path=None):
+    """Embed messages indexed since the last run; returns rows appended.
+
+    Call after update_index, on the same connection.
+    """
+    vec_path, ids_path, meta_path = semantic_paths(index_path)
+    # Holding the index's write lock serializes concurrent updaters.
+    conn.execute("BEGIN IMMEDIATE")
+    generation = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        meta = {}
+
+    # Rows past the recorded count are a torn append and get truncated.
+    rows = meta.get("rows", 0)
+    on_disk = min(vec_path.stat().st_size // (2 * SEMANTIC_DIMS),
+                  ids_path.stat().st_size // 24) if vec_path.exists() and ids_path.exists() else 0
+    rebuild = (
+        meta.get("version") != SEMANTIC_VERSION
+        or meta.get("dims") != SEMANTIC_DIMS
+        or meta.get("generation") != generation
+        or rows > on_disk
+    )
+    if not rebuild and rows:
+        ids = np.memmap(ids_path, dtype=np.int64, mode="r", shape=(rows, 3))
+        rebuild = int((~semantic_valid_mask(np, conn, ids)).sum()) * 2 > rows
+        del ids
+    if rebuild:
+        rows, last_rowid = 0, 0
+    else:
+        last_rowid = meta.get("last_rowid", 0)
+
+    appended = 0
+    mode = "wb" if rebuild else "r+b"
+    with open(vec_path, mode) as vec_f, open(ids_path, mode) as ids_f:
+        vec_f.truncate(rows * 2 * SEMANTIC_DIMS)  # Drop any torn tail
+        ids_f.truncate(rows * 24)
+        vec_f.seek(0, os.SEEK_END)
+        ids_f.seek(0, os.SEEK_END)
+        cursor = conn.execute(
+            "SELECT rowid, file_id, text FROM messages WHERE rowid > ? ORDER BY rowid", (last_rowid,))
+        while True:
+            batch = cursor.fetchmany(SEMANTIC_BATCH)
+            if not batch:
+                break
+            chunk_texts, chunk_ids = [], []
+            for rowid, file_id, text in batch:
+                for n, chunk in enumerate(message_chunks(text)):
+                    chunk_texts.append(chunk)
+                    chunk_ids.append((rowid, file_id, n))
+            if chunk_texts:
+                vec_f.write(hash_embed(np, chunk_texts).astype(np.float16).tobytes())
+                ids_f.write(np.asarray(chunk_ids, dtype=np.int64).tobytes())
+            rows += len(chunk_texts)
+            appended += len(chunk_texts)
+            last_rowid = batch[-1][0]
+
+    tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({
+        "version": SEMANTIC_VERSION, "dims": SEMANTIC_DIMS, "generation": generation,
+        "rows": rows, "last_rowid": last_rowid,
+    }))
+    os.replace(tmp, meta_path)
+    conn.commit()
+    return appended
+
+
+def semantic_valid_mask(np, conn, ids):
+    """Mask of vector rows whose message still belongs to a live file."""
+    files = conn.execute("SELECT id, base_rowid FROM files").fetchall()
+    if not files or not len(ids):
+        return np.zeros(len(ids), dtype=bool)
+    base = np.full(max(f[0] for f in files) + 1, np.iinfo(np.int64).max, dtype=np.int64)
+    for file_id, base_rowid in files:
+        base[file_id] = base_rowid
+    file_ids = ids[:, 1]
+    known = file_ids < len(base)
+    valid = np.zeros(len(ids), dtype=bool)
+    valid[known] = ids[known, 0] > base[file_ids[known]]
+    return valid
+
+
+def search_semantic(query, project_filter=None, recent_days=None, limit=10, recency_weight=0.2,
+                    half_life_days=30, semantic_weight=SEMANTIC_WEIGHT):
+    """Hybrid semantic + BM25 search over the JSONL index.
+
+    Returns None when NumPy or FTS5 is unavailable, so the caller can fall
+    back to keyword search.
+    """
+    np = import_numpy()
+    if np is None:
+        print("--semantic needs NumPy (pip install numpy); using keyword search", file=sys.stderr)
+        return None
+    if not CLAUDE_PROJECTS.is_dir() or not query.split():
+        return None
+    conn = open_index()
+    if conn is None:
+        return None
+
+    try:
+        update_index(conn)
+        update_vectors(np, conn)
+        vec_path, ids_path, meta_path = semantic_paths()
+        rows = json.loads(meta_path.read_text())["rows"]
+
+        # Per-file metadata, with project and recency filters applied once.
+        cutoff_ns = None
+        if recent_days:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=recent_days)
+            cutoff_ns = int(cutoff.timestamp() * 1e9)
+        files = {}
+        for file_id, sid, project, mtime_ns, first_prompt, count in conn.execute(
+                "SELECT id, session_id, project, mtime_ns, first_prompt, message_count FROM files"):
+            if project_filter and project_filter not in project:
+                continue
+            if cutoff_ns is not None and mtime_ns < cutoff_ns:
+                continue
+            files[file_id] = (sid, project, mtime_ns / 1e9, first_prompt, count)
+        if not files:
+            return []
+
+        # One matrix-vector product scores every chunk; the best chunk per
+        # file is its semantic score.
+        best = {}
+        if rows:
+            matrix = np.memmap(vec_path, dtype=np.float16, mode="r", shape=(rows, SEMANTIC_DIMS))
+            ids = np.array(np.memmap(ids_path, dtype=np.int64, mode="r", shape=(rows, 3)))
+            query_vec = hash_embed(np, [query])[0]
+            scores = np.empty(rows, dtype=np.float32)
+            for start in range(0, rows, SEMANTIC_BLOCK_ROWS):  # Widen per block for float32 BLAS
+                block = matrix[start:start + SEMANTIC_BLOCK_ROWS].astype(np.float32)
+                scores[start:start + len(block)] = block @ query_vec
+            keep = semantic_valid_mask(np, conn, ids) & np.isin(ids[:, 1], np.fromiter(files, dtype=np.int64))
+            scores[~keep] = -np.inf
+            # Top-k chunks, best first, so the first row seen per file is its best.
+            k = min(rows, max(limit * 50, 1000))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            top = top[np.isfinite(scores[top])]
+            for i in top:
+                file_id = int(ids[i, 1])
+                if file_id not in best:
+                    best[file_id] = (float(scores[i]), [])
+                chunks = best[file_id][1]
+                if len(chunks) < 3:
+                    chunks.append((int(ids[i, 0]), int(ids[i, 2])))
+
+        lexical = {row[0]: abs(row[6]) for row in
+                   index_session_ranks(conn, fts_query(query), project_filter, recent_days)}
+        top_lexical = max(lexical.values(), default=0) or 1.0
+
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+        sessions = []
+        for file_id in best.keys() | lexical.keys():
+            if file_id not in files:
+                continue
+            sid, project, mtime, first_prompt, count = files[file_id]
+            semantic = max(best.get(file_id, (0.0,))[0], 0.0)
+            lex = lexical.get(file_id, 0.0) / top_lexical
+            if not lex and semantic < SEMANTIC_MIN_SCORE:
+                continue
+            score = semantic_weight * semantic + (1 - semantic_weight) * lex
+            sessions.append({
+                "file_id": file_id,
+                "score": score,
+                "semantic_score": semantic,
+                "lexical_score": lex,
+                "blended_score": recency_blend(score, mtime, recency_weight, half_life_days, now_ts),
+                "session_id": sid,
+                "project": project,
+                "first_prompt": first_prompt,
+                "message_count": count,
+                "modified": mtime,
+            })
+        sessions = heapq.nsmallest(limit, sessions, key=lambda x: (-x["blended_score"], -x["modified"]))
+
+        # Snippets: the best-scoring chunks of each returned session.
+        words = query.lower().split()
+        wanted = [rowid for s in sessions for rowid, _ in best.get(s["file_id"], (0.0, []))[1]]
+        texts = dict(conn.execute(
+            f"SELECT rowid, text FROM messages WHERE rowid IN ({','.join('?' * len(wanted))})", wanted,
+        ).fetchall()) if wanted else {}
+        for session in sessions:
+            snippets = []
+            for rowid, n in best.get(session.pop("file_id"), (0.0, []))[1]:
+                if rowid not in texts:
+                    continue
+                chunk = texts[rowid][n * SEMANTIC_CHUNK_CHARS:(n + 1) * SEMANTIC_CHUNK_CHARS]
+                lower = chunk.lower()
+                snippet = next((s for s in (make_snippet(chunk, lower, w) for w in words) if s), None)
+                snippets.append(snippet or chunk[:200].strip() + ("..." if len(chunk) > 200 else ""))
+            session["snippets"] = snippets
+        return sessions
+
+    except (sqlite3.Error, OSError) as e:
+        print(f"Semantic index error: {e}", file=sys.stderr)
+        return None
+    finally:
+        conn.close()
+
+
+class QueryMatcher:
+    """A query prepared once for scoring many lowercased message texts.
+
+    A message scores one point per query word it contains, plus the word
+    count again when it contains the whole query as a phrase. Words are
+    checked with `in`: a compiled regex alternation measured 3-10x slower.
+    """
+
+    __slots__ = ("phrase", "words", "first_word", "max_score")
+
+    def __init__(self, query):
+        self.phrase = query.lower()
+        self.words = self.phrase.split()
+        self.first_word = self.words[0]
+        self.max_score = 2 * len(self.words)
+
+    def score(self, text_lower):
+        score = 0
+        for w in self.words:
+            if w in text_lower:
+                score += 1
+        if score and self.phrase in text_lower:
+            score += len(self.words)
+        return score
+
+
+def score_jsonl_file(path, project, mtime, matcher, recency_weight=0.2, half_life_days=30, now_ts=None):
+    """Score one transcript with a QueryMatcher; returns a result dict or None.
+
+    Messages are streamed, so memory is bounded by the largest message.
+    Snippets are cut for the first three matches only, and once the best
+    possible score is reached with three snippets in hand, the rest of the
+    file is only counted.
+    """
+    snippets = []
+    best_score = 0
+    first_prompt = None
+    count = 0
+
+    for msg in iter_jsonl_messages(path):
+        count += 1
+        if first_prompt is None and msg["role"] == "user":
+            first_prompt = msg["text"][:200]
+        if best_score == matcher.max_score and len(snippets) == 3:
+            continue
+
+        text_lower = msg["text"].lower()
+        score = matcher.score(text_lower)
+        if score == 0:
+            continue
+        if score > best_score:
+            best_score = score
+        if len(snippets) < 3:
+            snippet = make_snippet(msg["text"], text_lower, matcher.first_word)
+            if snippet is not None:
+                snippets.append(snippet)
+
+    if best_score == 0:
+        return None
+    return {
+        "score": best_score,
+        "blended_score": recency_blend(best_score, int(mtime), recency_weight, half_life_days, now_ts),
+        "session_id": Path(path).stem,
+        "project": project,
+        "first_prompt": first_prompt or "",
+        "message_count": count,
+        "snippets": snippets,
+        "modified": mtime,
+    }
+
+
+def push_top(heap, limit, result, seq):
+    """Keep the `limit` best results in a min-heap; ties go to the earlier file."""
+    item = (result["blended_score"], result["modified"], -seq, result)
+    if len(heap) < limit:
+        heapq.heappush(heap, item)
+    elif item[:3] > heap[0][:3]:
+        heapq.heapreplace(heap, item)
+
+
+def scan_shard(shard, query, limit, recency_weight, half_life_days, now_ts):
+    """Score a shard of (seq, path, project, mtime) files; returns its top-k heap.
+
+    Runs in a worker process for --jobs, so it returns at most `limit`
+    candidates however many sessions in the shard match. Newest files go
+    first: once the heap is full, a file whose best possible blended score
+    cannot beat the weakest kept result is dropped without being opened.
+    """
+    matcher = QueryMatcher(query)
+    heap = []
+    for seq, path, project, mtime in sorted(shard, key=lambda f: (-f[3], f[0])):
+        if len(heap) == limit:
+            bound = recency_blend(matcher.max_score, int(mtime), recency_weight, half_life_days, now_ts)
+            if (bound, mtime, -seq) <= heap[0][:3]:
+                continue
+        result = score_jsonl_file(path, project, mtime, matcher, recency_weight, half_life_days, now_ts)
+        if result is not None:
+            push_top(heap, limit, result, seq)
+    return heap
+
+
+def search_jsonl_full(query, project_filter=None, recent_days=None, limit=10, recency_weight=0.2, half_life_days=30, jobs=1):
+    """Deep search: scan actual JSONL conversation content.
+
+    With jobs > 1 the files are sharded across a process pool; each worker
+    keeps its own top-k and the parent merges them, so memory is bounded by
+    `limit` rather than by the number of matching sessions.
+    """
+    if not query.split() or limit <= 0:
+        return []
+    now = datetime.now(timezone.utc)
+    now_ts = int(now.timestamp())  # One clock for every file, so ranking is repeatable
+    cutoff = (now - timedelta(days=recent_days)).timestamp() if recent_days else None
+    files = []
 
     for project_dir in CLAUDE_PROJECTS.iterdir():
         if not project_dir.is_dir():
             continue
 
-        if project_filter:
-            proj_name = extract_project_name(project_dir.name)
-            if project_filter not in proj_name:
+        proj_name = extract_project_name(project_dir.name)
+        if project_filter and project_filter not in proj_name:
+            continue
+
+        for jsonl_file in project_dir.glob("*.jsonl"):
+            try:
+                st = jsonl_file.stat()
+            except OSError:
                 continue
+            if cutoff is not None and st.st_mtime < cutoff:
+                continue
+            files.append((len(files), str(jsonl_file), proj_name, st.st_mtime, st.st_size))
+
+    heap = []
+    jobs = min(jobs, len(files))
+    if jobs > 1:
+        # Deal files out largest-first so shards carry similar byte counts,
+        # and cut more shards than workers so a slow shard cannot stall the pool.
+        files.sort(key=lambda f: -f[4])
+        n_shards = min(len(files), jobs * 4)
+        shards = [[f[:4] for f in files[i::n_shards]] for i in range(n_shards)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(scan_shard, shard, query, limit, recency_weight, half_life_days, now_ts)
+                       for shard in shards]
+            for future in as_completed(futures):
+                for blended, modified, neg_seq, result in future.result():
+                    push_top(heap, limit, result, -neg_seq)
+    else:
+        heap = scan_shard([f[:4] for f in files], query, limit, recency_weight, half_life_days, now_ts)
+
+    return [item[3] for item in sorted(heap, key=lambda item: item[:3], reverse=True)]
+
+
+# ─── Session Reader ──────────────────────────────────────────────────────────
+#
+# --session resolves an id through a cached id -> path table, refreshed only
+# for project dirs whose mtime changed (adding a transcript bumps it). Pages
+# are read through a sidecar of message-line byte offsets per transcript,
+# built once and extended over appended bytes, so --offset/--limit decode
+# only the lines they print. --message finds its entry with a byte search
+# over the memory-mapped file, without decoding anything else.
+
+LINE_INDEX_MAGIC = b"RLI1"
+LINE_INDEX_HEADER = struct.Struct("<4sqqq")  # magic, inode, size scanned, reserved
 
+
+def find_session_path(session_id, cache_path=None):
+    """Resolve a session id to its transcript path via the lookup table, or None."""
+    cache_path = Path(cache_path or REMIND_SESSION_PATHS)
+    try:
+        cache = json.loads(cache_path.read_text())
+        dirs, paths = cache["dirs"], cache["paths"]
+    except (OSError, ValueError, KeyError, TypeError):
+        dirs, paths = {}, {}
+
+    path = paths.get(session_id)
+    if path and os.path.exists(path):
+        return Path(path)
+
+    # Miss: rescan only project dirs whose listing changed since last time.
+    fresh = {}
+    try:
+        project_dirs = [d for d in CLAUDE_PROJECTS.iterdir() if d.is_dir()]
+    except OSError:
+        project_dirs = []
+    changed = len(project_dirs) != len(dirs)
+    for project_dir in project_dirs:
+        try:
+            mtime_ns = project_dir.stat().st_mtime_ns
+        except OSError:
+            continue
+        fresh[project_dir.name] = mtime_ns
+        if dirs.get(project_dir.name) == mtime_ns:
+            continue
+        changed = True
+        prefix = str(project_dir) + os.sep
+        paths = {sid: p for sid, p in paths.items() if not p.startswith(prefix)}
         for jsonl_file in project_dir.glob("*.jsonl"):
-            if recent_days:
-                mtime = datetime.fromtimestamp(jsonl_file.stat().st_mtime, tz=timezone.utc)
-                cutoff = datetime.now(timezone.utc) - timedelta(days=recent_days)
-                if mtime < cutoff:
-                    continue
+            paths[jsonl_file.stem] = str(jsonl_file)
+
+    live = tuple(str(CLAUDE_PROJECTS / name) + os.sep for name in fresh)
+    paths = {sid: p for sid, p in paths.items() if p.startswith(live) and os.path.exists(p)}
+    if changed:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"dirs": fresh, "paths": paths}, separators=(",", ":")))
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+
+    path = paths.get(session_id)
+    return Path(path) if path else None
+
+
+def line_index_path(jsonl_path):
+    digest = hashlib.sha1(str(jsonl_path).encode("utf-8")).hexdigest()[:20]
+    return REMIND_LINE_INDEX_DIR / f"{digest}.bin"
+
+
+def message_line_offsets(jsonl_path):
+    """Byte offsets of the lines of `jsonl_path` that hold a message.
+
+    Cached in a sidecar keyed by path; a grown file is scanned from where
+    the last scan stopped, a shrunk or replaced one from the start.
+    """
+    st = os.stat(jsonl_path)
+    sidecar = line_index_path(jsonl_path)
+    offsets = array("q")
+    scanned = 0
+    try:
+        with open(sidecar, "rb") as f:
+            magic, inode, scanned, _ = LINE_INDEX_HEADER.unpack(f.read(LINE_INDEX_HEADER.size))
+            if magic == LINE_INDEX_MAGIC and inode == st.st_ino and scanned <= st.st_size:
+                offsets.frombytes(f.read())
+            else:
+                scanned = 0
+    except (OSError, struct.error, ValueError):
+        offsets, scanned = array("q"), 0
+
+    if scanned == st.st_size:
+        return offsets
+
+    position = scanned
+    with open(jsonl_path, "rb") as f:
+        f.seek(scanned)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Still being written
+            obj = decode_message_line(line)
+            if obj is not None and message_from_entry(obj) is not None:
+                offsets.append(position)
+            position += len(line)
 
-            session_id = jsonl_file.stem
-            messages = extract_messages_from_jsonl(str(jsonl_file))
-            if not messages:
-                continue
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(LINE_INDEX_HEADER.pack(LINE_INDEX_MAGIC, st.st_ino, position, 0))
+            offsets.tofile(f)
+        os.replace(tmp, sidecar)
+    except OSError:
+        pass
+    return offsets
 
-            matching_snippets = []
-            best_score = 0
 
-            for msg in messages:
-                text_lower = msg["text"].lower()
-                score = sum(1 for w in query_words if w in text_lower)
-                if score == 0:
-                    continue
+def read_message_at(mm, offset):
+    """Decode the message whose JSONL line starts at byte `offset` of an mmap."""
+    end = mm.find(b"\n", offset)
+    obj = decode_message_line(mm[offset:end if end >= 0 else len(mm)])
+    message = message_from_entry(obj) if obj is not None else None
+    if message is not None:
+        message["uuid"] = obj.get("uuid", "")
+    return message
 
-                if query_lower in text_lower:
-                    score += len(query_words)
-
-                if score > best_score:
-                    best_score = score
-
-                idx = text_lower.find(query_words[0])
-                if idx >= 0:
-                    start = max(0, idx - 80)
-                    end = min(len(msg["text"]), idx + len(query_words[0]) + 120)
-                    snippet = msg["text"][start:end].strip()
-                    if start > 0:
-                        snippet = "..." + snippet
-                    if end < len(msg["text"]):
-                        snippet = snippet + "..."
-                    matching_snippets.append({
-                        "role": msg["role"],
-                        "snippet": snippet,
-                    })
-
-            if best_score > 0:
-                first_user = next((m for m in messages if m["role"] == "user"), None)
-                mtime_ts = int(jsonl_file.stat().st_mtime)
-                now_ts = int(datetime.now(timezone.utc).timestamp())
-                age_days = max((now_ts - mtime_ts) / 86400, 0)
-                recency_boost = math.exp(-0.693 * age_days / half_life_days) if half_life_days > 0 else 0
-                blended = best_score * (1 + recency_weight * recency_boost)
-                results.append({
-                    "score": best_score,
-                    "blended_score": blended,
-                    "session_id": session_id,
-                    "project": extract_project_name(project_dir.name),
-                    "first_prompt": (first_user["text"][:200] if first_user else ""),
-                    "message_count": len(messages),
-                    "snippets": [s["snippet"] for s in matching_snippets[:3]],
-                    "modified": jsonl_file.stat().st_mtime,
-                })
-
-    results.sort(key=lambda x: (-x["blended_score"], -x.get("modified", 0)))
-    return results[:limit]
-
-
-def read_session_jsonl(session_id):
-    """Find and read a session by ID from JSONL files."""
-    for project_dir in CLAUDE_PROJECTS.iterdir():
-        if not project_dir.is_dir():
+
+def find_entry_offset(mm, message_id):
+    """Byte offset of the line whose entry uuid is `message_id`, or -1."""
+    for needle in (f'"uuid":"{message_id}"', f'"uuid": "{message_id}"'):
+        at = mm.find(needle.encode("utf-8"))
+        if at >= 0:
+            return mm.rfind(b"\n", 0, at) + 1
+    return -1
+
+
+def read_session_jsonl(session_id, offset=0, limit=None, message_id=None, context=2):
+    """Read a page of a session's messages from its JSONL transcript.
+
+    Returns (messages, total) with each message's position in "index", or
+    None when the session (or `message_id` within it) is not found. With
+    `message_id`, the page is that message plus `context` either side.
+    """
+    path = find_session_path(session_id)
+    if path is None:
+        return None
+    try:
+        offsets = message_line_offsets(path)
+        if not offsets:
+            return [], 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if message_id:
+                at = find_entry_offset(mm, message_id)
+                if at < 0:
+                    return None
+                # The entry itself may hold no text (a tool result); anchor on
+                # the last message at or before it.
+                anchor = max(bisect.bisect_right(offsets, at) - 1, 0)
+                start, stop = max(anchor - context, 0), anchor + context + 1
+            else:
+                start = max(offset, 0)
+                stop = len(offsets) if limit is None else start + max(limit, 0)
+            messages = []
+            for index in range(start, min(stop, len(offsets))):
+                message = read_message_at(mm, offsets[index])
+                if message is not None:
+                    message["index"] = index
+                    messages.append(message)
+        return messages, len(offsets)
+    except (OSError, ValueError):
+        return None
+
+
+# ─── Result Cache ────────────────────────────────────────────────────────────
+#
+# Agents tend to repeat or refine a query within minutes, so finished result
+# lists are kept in a small LRU file keyed by the normalized query, filters
+# and ranking parameters. Each entry is stamped with a fingerprint of the
+# corpus its backend read; a lookup recomputes that fingerprint (a couple of
+# stats for Scribe, one stat per transcript for the JSONL backends) and drops
+# the entry if it moved. Recency scores and --recent cutoffs drift with the
+# clock, so entries also expire after RESULT_CACHE_TTL.
+
+RESULT_CACHE_VERSION = 1
+RESULT_CACHE_ENTRIES = 64
+RESULT_CACHE_TTL = 15 * 60
+RESULT_SOURCES = {
+    "semantic": "[Semantic + FTS5 hybrid index]",
+    "scribe": "[Scribe FTS5 index]",
+    "index": "[JSONL FTS5 index]",
+    "scan": "[JSONL direct search]",
+}
+
+
+def scribe_fingerprint():
+    """Scribe DB stamp: mtime and size of the database and its WAL.
+
+    PRAGMA data_version only compares commits within one connection, so
+    it cannot stamp an entry read back by a later process.
+    """
+    stamps = []
+    for path in (SCRIBE_DB, SCRIBE_DB.with_name(SCRIBE_DB.name + "-wal")):
+        try:
+            st = os.stat(path)
+            stamps.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            stamps.append(None)
+    return stamps
+
+
+def jsonl_fingerprint():
+    """JSONL corpus stamp: transcript count, total size and newest mtime.
+
+    Whether a Scribe DB exists is included too, since its arrival changes
+    which backend answers.
+    """
+    count = total_size = newest = 0
+    try:
+        project_dirs = [d.path for d in os.scandir(CLAUDE_PROJECTS) if d.is_dir()]
+    except OSError:
+        project_dirs = []
+    for project_dir in project_dirs:
+        try:
+            entries = list(os.scandir(project_dir))
+        except OSError:
             continue
-        jsonl_file = project_dir / f"{session_id}.jsonl"
-        if jsonl_file.exists():
-            return extract_messages_from_jsonl(str(jsonl_file))
-    return None
+        for entry in entries:
+            if not entry.name.endswith(".jsonl"):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            count += 1
+            total_size += st.st_size
+            newest = max(newest, st.st_mtime_ns)
+    return [count, total_size, newest, SCRIBE_DB.exists()]
+
+
+def corpus_fingerprint(source):
+    return scribe_fingerprint() if source == "scribe" else jsonl_fingerprint()
+
+
+def result_cache_key(query, **params):
+    """Cache key: the query with case and spacing normalized, plus every
+    parameter that can change the result list."""
+    return json.dumps([" ".join(query.lower().split()), sorted(params.items())], separators=(",", ":"))
+
+
+def read_result_cache(cache_path):
+    try:
+        cache = json.loads(Path(cache_path).read_text())
+        if cache.get("version") == RESULT_CACHE_VERSION and isinstance(cache.get("entries"), dict):
+            return cache["entries"]
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def write_result_cache(cache_path, entries):
+    cache_path = Path(cache_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": RESULT_CACHE_VERSION, "entries": entries},
+                                  separators=(",", ":"), default=str))
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+
+
+def cached_results(key, cache_path=None):
+    """Return (source, results) for a fresh cache entry, or None.
+
+    A hit moves the entry to the most-recently-used end; a stale one is
+    dropped.
+    """
+    cache_path = cache_path or REMIND_RESULT_CACHE
+    entries = read_result_cache(cache_path)
+    entry = entries.pop(key, None)
+    if entry is None:
+        return None
+    try:
+        fresh = (0 <= datetime.now(timezone.utc).timestamp() - entry["stored"] < RESULT_CACHE_TTL
+                 and entry["fingerprint"] == corpus_fingerprint(entry["source"]))
+        if fresh:
+            entries[key] = entry
+    except (KeyError, TypeError):
+        fresh = False
+    write_result_cache(cache_path, entries)
+    return (entry["source"], entry["results"]) if fresh else None
+
+
+def store_results(key, source, results, cache_path=None):
+    """Record a result list, evicting the least recently used entries."""
+    cache_path = cache_path or REMIND_RESULT_CACHE
+    fingerprint = corpus_fingerprint(source)
+    now_ts = datetime.now(timezone.utc).timestamp()
+    entries = read_result_cache(cache_path)
+    # Entries stamped from this corpus under an older fingerprint, or past
+    # their TTL, can never hit again.
+    for other, entry in list(entries.items()):
+        try:
+            same_corpus = (entry["source"] == "scribe") == (source == "scribe")
+            if (same_corpus and entry["fingerprint"] != fingerprint) or now_ts - entry["stored"] >= RESULT_CACHE_TTL:
+                del entries[other]
+        except (KeyError, TypeError):
+            del entries[other]
+    entries.pop(key, None)
+    entries[key] = {"source": source, "fingerprint": fingerprint, "stored": now_ts, "results": results}
+    for other in list(entries)[:-RESULT_CACHE_ENTRIES]:
+        del entries[other]
+    write_result_cache(cache_path, entries)
 
 
 # ─── Output Formatting ───────────────────────────────────────────────────────
@@ -439,22 +1608,32 @@ def format_results(results, source="scribe"):
         print(f"   Session:  {session_id}")
 
         snippets = r.get("snippets", [])
+        context = r.get("context", [])
         if snippets:
             print(f"   Matches:")
-            for s in snippets[:3]:
+            for j, s in enumerate(snippets[:3]):
                 snippet = s if isinstance(s, str) else s.get("snippet", "")
                 snippet = snippet.replace("\n", " ")[:200]
                 print(f"     > {snippet}")
+                for c in (context[j] if j < len(context) else []):
+                    if c["position"] != 0:
+                        text = c["text"].replace("\n", " ")[:160]
+                        print(f"       {c['position']:+d} [{c['role']}] {text}")
         print()
 
 
-def format_session(messages):
-    """Format a full session for display."""
+def format_session(page):
+    """Format a page of a session for display."""
+    messages, total = page or ([], 0)
     if not messages:
-        print("Session not found or empty.")
+        print("Session not found or empty." if not total else f"Session: {total} messages, none in range.")
         return
 
-    print(f"Session: {len(messages)} messages\n")
+    first, last = messages[0]["index"], messages[-1]["index"]
+    if len(messages) == total:
+        print(f"Session: {total} messages\n")
+    else:
+        print(f"Session: {total} messages, showing {first + 1}-{last + 1}\n")
     for msg in messages:
         role = msg["role"].upper()
         text = msg["text"]
@@ -462,7 +1641,7 @@ def format_session(messages):
         if len(text) > 500:
             text = text[:500] + f"... [{len(text)} chars total]"
         text = text.replace("\n", "\n   ")
-        print(f"[{role}] {text}")
+        print(f"{msg['index'] + 1:>4} [{role}] {text}")
         print()
 
 
@@ -473,37 +1652,115 @@ def main():
     parser = argparse.ArgumentParser(description="Search Claude Code conversation history")
     parser.add_argument("query", nargs="?", help="Search query (words or phrase)")
     parser.add_argument("--project", help="Filter by project path (substring match)")
-    parser.add_argument("--limit", type=int, default=10, help="Max results (default: 10)")
+    parser.add_argument("--limit", type=int, help="Max results (default: 10; with --session, all messages)")
+    parser.add_argument("--offset", type=int, default=0, help="With --session, skip the first N messages")
     parser.add_argument("--full", action="store_true", help="Force JSONL full-text search (skip Scribe)")
+    parser.add_argument("--quick", action="store_true", help="Search only session summaries and first prompts")
+    parser.add_argument("--semantic", action="store_true", help="Hybrid fuzzy + keyword search (needs NumPy)")
+    parser.add_argument("--semantic-weight", type=float, default=SEMANTIC_WEIGHT,
+                        help=f"Semantic share of the hybrid score (default: {SEMANTIC_WEIGHT})")
+    parser.add_argument("--no-index", action="store_true", help="Scan JSONL files directly instead of the JSONL index"
+                        " (matches substrings; the index matches word prefixes only)")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the direct JSONL scan (0 = all cores)")
     parser.add_argument("--recent", type=int, help="Only search sessions from last N days")
-    parser.add_argument("--context", type=int, default=2, help="Surrounding messages to show")
+    parser.add_argument("--context", type=int, default=2,
+                        help="Surrounding messages to show per match (Scribe only) or around --message")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--session", help="Read a specific session by ID")
+    parser.add_argument("--message", help="With --session, show only this message uuid and its --context")
     parser.add_argument("--recency-weight", type=float, default=0.2, help="Recency weight factor (default: 0.2)")
     parser.add_argument("--half-life", type=int, default=30, help="Recency half-life in days (default: 30)")
     parser.add_argument("--no-recency", action="store_true", help="Disable recency weighting")
+    parser.add_argument("--no-cache", action="store_true", help="Skip the result cache for this query")
     args = parser.parse_args()
 
     # Session read mode
     if args.session:
-        messages = scribe_read_session(args.session) or read_session_jsonl(args.session)
+        page = None
+        if not args.message:  # Scribe does not keep JSONL entry uuids
+            page = scribe_read_session(args.session, offset=args.offset, limit=args.limit)
+        if page is None:
+            page = read_session_jsonl(
+                args.session,
+                offset=args.offset,
+                limit=args.limit,
+                message_id=args.message,
+                context=max(args.context, 0),
+            )
         if args.json:
-            print(json.dumps(messages or [], indent=2, default=str))
+            print(json.dumps(page[0] if page else [], indent=2, default=str))
         else:
-            format_session(messages)
+            format_session(page)
         return
 
     if not args.query:
         parser.error("query is required (unless using --session)")
+    if args.limit is None:
+        args.limit = 10
 
     # Search mode
     results = None
+    source = None
     rw = 0.0 if args.no_recency else args.recency_weight
     hl = args.half_life
 
-    if not args.full:
+    if args.quick:
+        results = search_indexes(
+            args.query,
+            project_filter=args.project,
+            recent_days=args.recent,
+            limit=args.limit,
+        )
+        if not args.json:
+            print("[Session index metadata]\n")
+        cache_key = None
+    elif args.no_cache:
+        cache_key = None
+    else:
+        cache_key = result_cache_key(
+            args.query,
+            project=args.project,
+            recent=args.recent,
+            limit=args.limit,
+            context=args.context,
+            recency_weight=rw,
+            half_life=hl,
+            semantic=args.semantic and args.semantic_weight,
+            full=args.full,
+            no_index=args.no_index,
+        )
+        cached = cached_results(cache_key)
+        if cached is not None:
+            source, results = cached
+            cache_key = None
+
+    if results is None and args.semantic:
+        results = search_semantic(
+            args.query,
+            project_filter=args.project,
+            recent_days=args.recent,
+            limit=args.limit,
+            recency_weight=rw,
+            half_life_days=hl,
+            semantic_weight=args.semantic_weight,
+        )
+        source = "semantic"
+
+    if results is None and not args.full:
         # Try Scribe DB first
         results = scribe_search(
+            args.query,
+            project_filter=args.project,
+            recent_days=args.recent,
+            limit=args.limit,
+            context_messages=args.context,
+            recency_weight=rw,
+            half_life_days=hl,
+        )
+        source = "scribe"
+
+    if results is None and not args.no_index:
+        results = search_jsonl_index(
             args.query,
             project_filter=args.project,
             recent_days=args.recent,
@@ -511,14 +1768,10 @@ def main():
             recency_weight=rw,
             half_life_days=hl,
         )
-        if results is not None:
-            if not args.json:
-                print("[Scribe FTS5 index]\n")
+        source = "index"
 
     if results is None:
         # Fall back to JSONL search
-        if not args.json:
-            print("[JSONL direct search]\n")
         results = search_jsonl_full(
             args.query,
             project_filter=args.project,
@@ -526,7 +1779,14 @@ def main():
             limit=args.limit,
             recency_weight=rw,
             half_life_days=hl,
+            jobs=args.jobs or os.cpu_count() or 1,
         )
+        source = "scan"
+
+    if cache_key is not None:
+        store_results(cache_key, source, results)
+    if source and not args.json:
+        print(f"{RESULT_SOURCES[source]}\n")
 
     if args.json:
         print(json.dumps(results, indent=2, default=str))
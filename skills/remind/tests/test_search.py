@@ -0,0 +1,373 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+import search  # noqa: E402
+
+
+class RemindTestCase(unittest.TestCase):
+    """Points every path search.py touches at a temporary home."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.home = Path(tmp.name)
+        self.projects = self.home / ".claude" / "projects"
+        self.projects.mkdir(parents=True)
+        remind = self.home / ".claude" / "remind"
+        patcher = mock.patch.multiple(
+            search,
+            CLAUDE_PROJECTS=self.projects,
+            SCRIBE_DB=self.home / ".scribe" / "scribe.db",
+            REMIND_INDEX=remind / "index.db",
+            REMIND_SESSIONS_CACHE=remind / "sessions-index.json",
+            REMIND_SESSION_PATHS=remind / "session-paths.json",
+            REMIND_LINE_INDEX_DIR=remind / "lines",
+            REMIND_RESULT_CACHE=remind / "results.json",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def session_path(self, session_id, project="-Users-me-app"):
+        return self.projects / project / f"{session_id}.jsonl"
+
+    def write_session(self, session_id, texts, project="-Users-me-app", mode="w", start=0):
+        """Write alternating user/assistant messages with uuids m-<n>."""
+        path = self.session_path(session_id, project)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, mode) as f:
+            for n, text in enumerate(texts, start):
+                role = "user" if n % 2 == 0 else "assistant"
+                f.write(json.dumps({
+                    "type": role,
+                    "uuid": f"m-{n}",
+                    "timestamp": "2026-01-01T00:00:00Z",
+                    "message": {"role": role, "content": text},
+                }) + "\n")
+        return path
+
+    def index_search(self, query):
+        results = search.search_jsonl_index(query) or []
+        return [r["session_id"] for r in results]
+
+
+class SessionsIndexTests(RemindTestCase):
+    def write_index(self, project, entries):
+        path = self.projects / project / "sessions-index.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"entries": entries}))
+        return path
+
+    def entry(self, session_id, summary, modified="2026-01-01T00:00:00Z", project_path="/Users/me/app"):
+        return {"sessionId": session_id, "summary": summary, "firstPrompt": "", "modified": modified,
+                "projectPath": project_path, "messageCount": 4}
+
+    def quick(self, query, **kwargs):
+        return [r["session_id"] for r in search.search_indexes(query, **kwargs)]
+
+    def test_exact_phrase_outranks_scattered_words(self):
+        self.write_index("-Users-me-app", [
+            self.entry("scattered", "cache layer, and later a redis migration"),
+            self.entry("phrase", "redis cache tuning"),
+            self.entry("neither", "unrelated"),
+        ])
+        self.assertEqual(["phrase", "scattered"], self.quick("redis cache"))
+
+    def test_project_and_recent_filters(self):
+        self.write_index("-Users-me-app", [self.entry("old", "deploy notes", modified="2020-01-01T00:00:00Z")])
+        self.write_index("-Users-me-web", [self.entry("web", "deploy notes", project_path="/Users/me/web",
+                                                      modified=search.datetime.now(search.timezone.utc).isoformat())])
+        self.assertEqual(["web"], self.quick("deploy", project_filter="/web"))
+        self.assertEqual(["web"], self.quick("deploy", recent_days=7))
+
+    def test_rewritten_and_removed_indexes_refresh_the_cache(self):
+        app = self.write_index("-Users-me-app", [self.entry("a1", "first summary")])
+        self.write_index("-Users-me-web", [self.entry("w1", "web summary")])
+        self.assertEqual({"a1", "w1"}, set(self.quick("summary")))
+        self.write_index("-Users-me-app", [self.entry("a1", "first summary"), self.entry("a2", "second summary")])
+        self.assertEqual({"a1", "a2", "w1"}, set(self.quick("summary")))
+        app.unlink()
+        self.assertEqual(["w1"], self.quick("summary"))
+
+    def test_malformed_index_is_skipped(self):
+        (self.projects / "-Users-me-bad").mkdir()
+        (self.projects / "-Users-me-bad" / "sessions-index.json").write_text("{not json")
+        self.write_index("-Users-me-app", [self.entry("a1", "good summary")])
+        self.assertEqual(["a1"], self.quick("summary"))
+
+
+class JsonlIndexTests(RemindTestCase):
+    def test_append_parses_only_new_messages(self):
+        path = self.write_session("s1", ["alpha planning notes", "alpha reply here"])
+        self.assertEqual(["s1"], self.index_search("alpha"))
+        self.assertEqual([], self.index_search("bravo"))
+
+        self.write_session("s1", ["bravo follow-up question"], mode="a", start=2)
+        self.assertEqual(["s1"], self.index_search("bravo"))
+        conn = search.open_index()
+        self.addCleanup(conn.close)
+        self.assertEqual(0, search.update_index(conn))  # Nothing new since the last search
+        offset, count = conn.execute("SELECT offset, message_count FROM files").fetchone()
+        self.assertEqual(path.stat().st_size, offset)
+        self.assertEqual(3, count)
+        self.assertEqual(3, conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0])
+
+    def test_partial_trailing_line_waits_for_its_newline(self):
+        path = self.write_session("s1", ["alpha planning notes"])
+        with open(path, "a") as f:
+            f.write('{"type": "user", "message": {"content": "bravo half written')
+        self.assertEqual([], self.index_search("bravo"))
+        with open(path, "a") as f:
+            f.write('"}}\n')
+        self.assertEqual(["s1"], self.index_search("bravo"))
+
+    def test_shrunk_file_is_reindexed_from_scratch(self):
+        self.write_session("s1", ["alpha planning notes", "alpha reply here", "alpha again later"])
+        self.assertEqual(["s1"], self.index_search("alpha"))
+        self.write_session("s1", ["charlie rewritten"])
+        self.assertEqual([], self.index_search("alpha"))
+        self.assertEqual(["s1"], self.index_search("charlie"))
+
+    def test_deleted_file_leaves_the_index(self):
+        path = self.write_session("s1", ["alpha planning notes"])
+        self.write_session("s2", ["alpha elsewhere too"], project="-Users-me-other")
+        self.assertEqual({"s1", "s2"}, set(self.index_search("alpha")))
+        path.unlink()
+        self.assertEqual(["s2"], self.index_search("alpha"))
+        conn = search.open_index()
+        self.addCleanup(conn.close)
+        self.assertEqual(1, conn.execute("SELECT COUNT(*) FROM files").fetchone()[0])
+
+    def test_index_matches_word_prefixes_not_infixes(self):
+        self.write_session("s1", ["configure oauth tokens", "authentication flow done"])
+        self.write_session("s2", ["only oauth mentioned here"])
+        self.assertEqual(["s1"], self.index_search("auth"))
+        scanned = search.search_jsonl_full("auth", recency_weight=0.0)
+        self.assertEqual({"s1", "s2"}, {r["session_id"] for r in scanned})
+
+
+@unittest.skipIf(search.import_numpy() is None, "semantic search needs NumPy")
+class SemanticIndexTests(RemindTestCase):
+    def semantic_search(self, query):
+        results = search.search_semantic(query, recency_weight=0.0) or []
+        return [r["session_id"] for r in results]
+
+    def test_reused_file_id_does_not_inherit_deleted_vectors(self):
+        # Enough live vectors that one deletion stays under the compaction
+        # threshold and the stale rows are still on disk.
+        for n in range(3):
+            self.write_session(f"keep{n}", [f"ordinary note {i} about lunch" for i in range(4)])
+        self.semantic_search("lunch")
+        gone = self.write_session("gone", ["zebra xylophone rehearsal"], project="-Users-me-zoo")
+        self.assertEqual(["gone"], self.semantic_search("zebra xylophone"))
+        conn = search.open_index()
+        self.addCleanup(conn.close)
+        gone_id = conn.execute("SELECT id FROM files WHERE session_id = 'gone'").fetchone()[0]
+
+        gone.unlink()
+        self.semantic_search("lunch")
+        self.write_session("fresh", ["gardening tomatoes in spring"], project="-Users-me-zoo")
+        self.assertNotIn("fresh", self.semantic_search("zebra xylophone"))
+        fresh_id = conn.execute("SELECT id FROM files WHERE session_id = 'fresh'").fetchone()[0]
+        self.assertEqual(gone_id, fresh_id)  # SQLite did hand the id out again
+
+    def write_deploy_sessions(self):
+        # "fuzzy" shares no indexed word prefix with the query ("redeployed"
+        # is not deploy*, "railwy" is not railway*), only character n-grams.
+        self.write_session("keyword", ["deploy railway notes", "more deploy notes"])
+        self.write_session("fuzzy", ["Redeployed on Railwy after the fix"], project="-Users-me-other")
+        self.write_session("garden", ["gardening tomatoes in spring"], project="-Users-me-home")
+
+    def ranked(self, query, **kwargs):
+        results = search.search_semantic(query, recency_weight=0.0, **kwargs)
+        return {r["session_id"]: r for r in results}, [r["session_id"] for r in results]
+
+    def test_fuzzy_match_without_a_keyword_hit(self):
+        self.write_deploy_sessions()
+        self.assertEqual(["keyword"], self.index_search("deploy railway"))
+        by_id, order = self.ranked("deploy railway")
+        self.assertEqual(["keyword", "fuzzy"], order)
+        self.assertEqual(0.0, by_id["fuzzy"]["lexical_score"])
+        self.assertGreaterEqual(by_id["fuzzy"]["semantic_score"], search.SEMANTIC_MIN_SCORE)
+        self.assertIn("Railwy", by_id["fuzzy"]["snippets"][0])
+
+    def test_blend_weighs_semantic_against_normalized_bm25(self):
+        self.write_deploy_sessions()
+        by_id, _ = self.ranked("deploy railway")
+        keyword = by_id["keyword"]
+        self.assertEqual(1.0, keyword["lexical_score"])  # Best BM25 hit normalizes to 1
+        self.assertAlmostEqual(search.SEMANTIC_WEIGHT * keyword["semantic_score"]
+                               + (1 - search.SEMANTIC_WEIGHT), keyword["score"], places=5)
+
+        by_id, _ = self.ranked("deploy railway", semantic_weight=1.0)
+        for result in by_id.values():
+            self.assertAlmostEqual(result["semantic_score"], result["score"], places=5)
+        by_id, order = self.ranked("deploy railway", semantic_weight=0.0)
+        self.assertEqual("keyword", order[0])
+        self.assertEqual(0.0, by_id["fuzzy"]["score"])
+
+    def test_min_score_drops_unrelated_sessions_without_keyword_hits(self):
+        self.write_deploy_sessions()
+        _, order = self.ranked("deploy railway")
+        self.assertNotIn("garden", order)
+        with mock.patch.object(search, "SEMANTIC_MIN_SCORE", 0.0):
+            by_id, order = self.ranked("deploy railway")
+        self.assertIn("garden", order)
+        self.assertLess(by_id["garden"]["semantic_score"], search.SEMANTIC_MIN_SCORE)
+
+    def test_append_embeds_only_new_rows(self):
+        np = search.import_numpy()
+        self.write_session("s1", ["alpha planning notes", "x" * (search.SEMANTIC_CHUNK_CHARS + 10)])
+        conn = search.open_index()
+        self.addCleanup(conn.close)
+        _, _, meta_path = search.semantic_paths()
+        search.update_index(conn)
+        self.assertEqual(3, search.update_vectors(np, conn))  # The long message is two chunks
+        self.assertEqual(0, search.update_vectors(np, conn))
+
+        self.write_session("s1", ["bravo follow-up"], mode="a", start=2)
+        search.update_index(conn)
+        self.assertEqual(1, search.update_vectors(np, conn))
+        meta = json.loads(meta_path.read_text())
+        self.assertEqual(4, meta["rows"])
+        self.assertEqual(conn.execute("SELECT MAX(rowid) FROM messages").fetchone()[0], meta["last_rowid"])
+
+
+class SessionReadTests(RemindTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_session("s1", [f"message number {n}" for n in range(10)])
+
+    def read(self, **kwargs):
+        messages, total = search.read_session_jsonl("s1", **kwargs)
+        return [m["index"] for m in messages], total
+
+    def test_offset_and_limit_page_through_messages(self):
+        self.assertEqual(([3, 4, 5], 10), self.read(offset=3, limit=3))
+        self.assertEqual(([8, 9], 10), self.read(offset=8, limit=5))
+        self.assertEqual(([], 10), self.read(offset=12, limit=5))
+        self.assertEqual((list(range(10)), 10), self.read())
+        messages, _ = search.read_session_jsonl("s1", offset=4, limit=1)
+        self.assertEqual("message number 4", messages[0]["text"])
+        self.assertEqual("m-4", messages[0]["uuid"])
+
+    def test_message_id_centres_a_window_of_context(self):
+        self.assertEqual(([3, 4, 5, 6, 7], 10), self.read(message_id="m-5"))
+        self.assertEqual(([0, 1], 10), self.read(message_id="m-0", context=1))
+        self.assertEqual(([9], 10), self.read(message_id="m-9", context=0))
+        self.assertIsNone(search.read_session_jsonl("s1", message_id="m-missing"))
+
+    def test_unknown_session_is_none(self):
+        self.assertIsNone(search.read_session_jsonl("nope"))
+
+    def test_appended_messages_extend_the_line_index(self):
+        self.read()
+        self.write_session("s1", ["late arrival"], mode="a", start=10)
+        self.assertEqual(([9, 10], 11), self.read(offset=9))
+        self.assertEqual(([10], 11), self.read(message_id="m-10", context=0))
+
+    def test_rewritten_file_rescans_the_line_index(self):
+        self.read()
+        self.write_session("s1", ["short now"])
+        messages, total = search.read_session_jsonl("s1")
+        self.assertEqual(1, total)
+        self.assertEqual("short now", messages[0]["text"])
+
+    def test_cli_pages_with_offset_limit_and_message(self):
+        def run(*argv):
+            out = io.StringIO()
+            with mock.patch.object(sys, "argv", ["search.py", "--session", "s1", "--json", *argv]), \
+                    redirect_stdout(out):
+                search.main()
+            return [m["index"] for m in json.loads(out.getvalue())]
+
+        self.assertEqual([2, 3], run("--offset", "2", "--limit", "2"))
+        self.assertEqual([6, 7, 8], run("--message", "m-7", "--context", "1"))
+
+    def test_new_session_found_after_lookup_table_is_built(self):
+        self.assertIsNotNone(search.find_session_path("s1"))
+        path = self.write_session("s2", ["second session"], project="-Users-me-other")
+        self.assertEqual(path, search.find_session_path("s2"))
+
+
+class ResultCacheTests(RemindTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.write_session("s1", ["alpha planning notes"])
+        self.key = search.result_cache_key("Alpha  Plan", limit=10, project=None)
+        self.results = [{"session_id": "s1", "score": 1.5}]
+
+    def test_hit_after_store(self):
+        search.store_results(self.key, "index", self.results)
+        self.assertEqual(("index", self.results), search.cached_results(self.key))
+
+    def test_key_normalizes_query_but_not_parameters(self):
+        search.store_results(self.key, "index", self.results)
+        self.assertIsNotNone(search.cached_results(search.result_cache_key("alpha plan", project=None, limit=10)))
+        self.assertIsNone(search.cached_results(search.result_cache_key("alpha plan", limit=5, project=None)))
+
+    def test_append_to_a_transcript_invalidates(self):
+        search.store_results(self.key, "index", self.results)
+        self.write_session("s1", ["alpha reply"], mode="a", start=1)
+        self.assertIsNone(search.cached_results(self.key))
+        self.assertEqual({}, search.read_result_cache(search.REMIND_RESULT_CACHE))
+
+    def test_new_transcript_invalidates(self):
+        search.store_results(self.key, "scan", self.results)
+        self.write_session("s2", ["brand new"], project="-Users-me-other")
+        self.assertIsNone(search.cached_results(self.key))
+
+    def test_entries_expire_after_ttl(self):
+        search.store_results(self.key, "index", self.results)
+        later = search.datetime.now(search.timezone.utc).timestamp() + search.RESULT_CACHE_TTL
+        with mock.patch.object(search, "datetime") as clock:
+            clock.now.return_value.timestamp.return_value = later
+            self.assertIsNone(search.cached_results(self.key))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        keys = [search.result_cache_key(f"query {n}") for n in range(search.RESULT_CACHE_ENTRIES + 1)]
+        for key in keys[:-1]:
+            search.store_results(key, "index", [])
+        self.assertIsNotNone(search.cached_results(keys[0]))  # Now most recently used
+        search.store_results(keys[-1], "index", [])
+        self.assertIsNotNone(search.cached_results(keys[0]))
+        self.assertIsNone(search.cached_results(keys[1]))
+
+
+class DirectScanTests(RemindTestCase):
+    def setUp(self):
+        super().setUp()
+        # Distinct hit counts give every session a distinct score, so ties
+        # cannot reorder results between shards.
+        for n in range(1, 13):
+            texts = [f"deploy step {i} of the railway rollout" for i in range(n)] + ["unrelated chatter"]
+            path = self.write_session(f"s{n:02d}", texts, project=f"-Users-me-p{n % 3}")
+            os.utime(path, (1_700_000_000 + n * 86400,) * 2)
+
+    def test_jobs_match_the_serial_scan(self):
+        # No recency term: two runs a clock second apart would score differently.
+        for limit in (1, 5, 20):
+            serial = search.search_jsonl_full("railway deploy", limit=limit, recency_weight=0.0, jobs=1)
+            for jobs in (2, 4):
+                with self.subTest(limit=limit, jobs=jobs):
+                    parallel = search.search_jsonl_full("railway deploy", limit=limit, recency_weight=0.0, jobs=jobs)
+                    self.assertEqual(serial, parallel)
+        self.assertEqual(12, len(serial))
+
+    def test_filters_apply_in_workers(self):
+        results = search.search_jsonl_full("railway", project_filter="p1", jobs=3)
+        self.assertEqual({"s01", "s04", "s07", "s10"}, {r["session_id"] for r in results})
+
+
+if __name__ == "__main__":
+    unittest.main()